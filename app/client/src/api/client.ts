@@ -1,4 +1,5 @@
 import axios from 'axios'
+import { Task, TaskBatchOperation } from '../types'
 
 const apiClient = axios.create({
   baseURL: '/api',
@@ -33,11 +34,29 @@ apiClient.interceptors.response.use(
   }
 )
 
+type TaskListParams = { status?: string; assignee?: string; search?: string; limit?: number; cursor?: string; fields?: string }
+
+// Largest page the server accepts (MAX_PAGE_SIZE in core/routers/tasks.py)
+const MAX_TASK_PAGE_SIZE = 500
+
 // Tasks API
 export const tasksAPI = {
-  list: (params?: { status?: string; assignee?: string; search?: string }) =>
+  // Paginated: pass the X-Next-Cursor response header back as `cursor` for the next page
+  list: (params?: TaskListParams) =>
     apiClient.get('/tasks', { params }),
 
+  // Every matching task, following X-Next-Cursor until the last page
+  listAll: async (params?: Omit<TaskListParams, 'cursor' | 'limit'>) => {
+    const tasks: Task[] = []
+    let cursor: string | undefined
+    do {
+      const res = await apiClient.get('/tasks', { params: { ...params, limit: MAX_TASK_PAGE_SIZE, cursor } })
+      tasks.push(...res.data)
+      cursor = res.headers['x-next-cursor']
+    } while (cursor)
+    return tasks
+  },
+
   get: (id: string) =>
     apiClient.get(`/tasks/${id}`),
 
@@ -50,11 +69,14 @@ export const tasksAPI = {
   delete: (id: string) =>
     apiClient.delete(`/tasks/${id}`),
 
-  move: (id: string, status: string, position?: number) =>
-    apiClient.patch(`/tasks/${id}/move`, { status, position }),
+  move: (id: string, status: string, neighbours?: { after_task_id?: string; before_task_id?: string }) =>
+    apiClient.patch(`/tasks/${id}/move`, { status, ...neighbours }),
 
   assign: (id: string, assigneeId: string) =>
     apiClient.post(`/tasks/${id}/assign`, { assignee_id: assigneeId }),
+
+  batch: (operations: TaskBatchOperation[]) =>
+    apiClient.post('/tasks/batch', { operations }),
 }
 
 // Time Tracking API
@@ -71,7 +93,7 @@ export const timeAPI = {
   createEntry: (data: any) =>
     apiClient.post('/time/entries', data),
 
-  getSummary: (params?: { start_date?: string; end_date?: string }) =>
+  getSummary: (params?: { start_date?: string; end_date?: string; granularity?: 'day' | 'week' | 'month'; include_entries?: boolean }) =>
     apiClient.get('/time/summary', { params }),
 }
 
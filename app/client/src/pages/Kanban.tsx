@@ -18,7 +18,7 @@ export default function Kanban() {
 
   const { data: tasks = [] } = useQuery({
     queryKey: ['tasks'],
-    queryFn: () => tasksAPI.list().then(res => res.data),
+    queryFn: () => tasksAPI.listAll(),
   })
 
   const createTaskMutation = useMutation({
@@ -17,11 +17,27 @@ export interface Task {
   created_by: string
   labels?: string[]
   position?: number
+  rank?: string
   created_at: string
   updated_at: string
   assignee?: User
 }
 
+export type TaskBatchOperation =
+  | { op: 'create'; data: Partial<Task> & { title: string } }
+  | { op: 'update'; task_id: string; data: Partial<Task> }
+  | { op: 'move'; task_id: string; data: { status: Task['status']; after_task_id?: string; before_task_id?: string } }
+  | { op: 'assign'; task_id: string; assignee_id: string }
+  | { op: 'delete'; task_id: string }
+
+export interface TaskBatchResult {
+  index: number
+  op: TaskBatchOperation['op']
+  status_code: number
+  task?: Task
+  detail?: string
+}
+
 export interface TimeEntry {
   id: string
   task_id?: string
@@ -36,9 +52,10 @@ export interface TimeEntry {
 
 export interface TimeSummary {
   total_duration: number  // in seconds
-  entries: TimeEntry[]
+  entries: TimeEntry[] | null  // only with include_entries
+  granularity: 'day' | 'week' | 'month'
   by_task: Record<string, number>
-  by_date: Record<string, number>
+  by_date: Record<string, number>  // keyed by the first day of each period
 }
 
 export interface Sprint {
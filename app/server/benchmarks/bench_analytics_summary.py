@@ -0,0 +1,84 @@
+"""
+Analytics summary benchmark: latency and memory as time entries grow
+
+Seeds the time_entries table in steps up to --entries (1M by default) and
+times GET /api/analytics/summary at each size, recording the Python heap
+peak with tracemalloc. With the aggregation done in SQL, the peak should stay
+flat and latency should track the database's own scan cost. The response
+cache is cleared before every request, so each one is computed.
+
+Usage:
+    python benchmarks/bench_analytics_summary.py [--entries 1000000] [--steps 4] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from common import (
+    make_session_factory,
+    seed_tasks,
+    seed_time_entries,
+    temp_database,
+)
+
+import httpx
+
+from core.cache import response_cache
+from core.database import get_db, get_read_db
+from server import app
+
+
+async def measure(client: httpx.AsyncClient, repeat: int) -> tuple:
+    """Return (median latency in ms, peak traced memory in MB) over `repeat` calls"""
+    latencies = []
+    tracemalloc.start()
+    for _ in range(repeat):
+        await response_cache.clear()
+        start = time.perf_counter()
+        response = await client.get("/api/analytics/summary")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(latencies) * 1000, peak / 1024 / 1024
+
+
+async def main(args) -> None:
+    with temp_database() as (sync_url, async_url):
+        task_ids = seed_tasks(sync_url, args.tasks)
+        engine, SessionFactory = make_session_factory(async_url)
+
+        async def bench_get_db():
+            async with SessionFactory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = bench_get_db
+        app.dependency_overrides[get_read_db] = bench_get_db
+        transport = httpx.ASGITransport(app=app)
+        step = args.entries // args.steps
+        seeded = 0
+
+        print(f"{'entries':>10} {'latency (ms)':>14} {'peak mem (MB)':>15}")
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for _ in range(args.steps):
+                    seed_time_entries(sync_url, step, task_ids)
+                    seeded += step
+                    latency, peak = await measure(client, args.repeat)
+                    print(f"{seeded:>10,} {latency:>14.1f} {peak:>15.2f}")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    parser.add_argument("--steps", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
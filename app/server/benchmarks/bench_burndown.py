@@ -0,0 +1,111 @@
+"""
+Burndown and cycle time benchmark over a large sprint
+
+Seeds one two-week sprint of --tasks tasks (5k by default), each with a
+status history of creation, work and completion spread over the sprint,
+then times GET /api/analytics/burndown/{id} and GET /api/analytics/summary
+(whose average cycle time reads the same history). Both replay the history
+with grouped and windowed SQL, so the Python side only sees one row per day.
+Each endpoint is timed computed (response cache cleared first) and served
+from the response cache.
+
+Usage:
+    python benchmarks/bench_burndown.py [--tasks 5000] [--repeat 10]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from common import make_session_factory, new_id, seed_tasks, temp_database
+
+import httpx
+from sqlalchemy import create_engine, insert
+
+from core.cache import response_cache
+from core.database import get_db, get_read_db
+from core.models import Sprint, SprintTask, TaskStatusEvent
+from server import app
+
+STATUS_FLOW = ["todo", "in_progress", "in_review", "done"]
+
+
+def seed_sprint(sync_url: str, task_ids: list, start: datetime, days: int) -> str:
+    """Create a sprint holding every task, with a status history ending at a random stage"""
+    rng = random.Random(len(task_ids))
+    sprint_id = new_id()
+    sprint_tasks, events = [], []
+
+    for task_id in task_ids:
+        sprint_tasks.append({"sprint_id": sprint_id, "task_id": task_id, "story_points": rng.choice([1, 2, 3, 5, 8])})
+        changed_at = start - timedelta(days=1)
+        previous = None
+        for status in STATUS_FLOW[:rng.randint(1, len(STATUS_FLOW))]:
+            events.append({
+                "task_id": task_id, "from_status": previous, "to_status": status, "changed_at": changed_at,
+            })
+            previous = status
+            changed_at += timedelta(hours=rng.randint(1, days * 24 // len(STATUS_FLOW)))
+
+    engine = create_engine(sync_url)
+    with engine.begin() as conn:
+        conn.execute(insert(Sprint), [{
+            "id": sprint_id, "name": "Benchmark sprint", "status": "active",
+            "start_date": start, "end_date": start + timedelta(days=days - 1),
+        }])
+        conn.execute(insert(SprintTask), sprint_tasks)
+        conn.execute(insert(TaskStatusEvent), events)
+    engine.dispose()
+    print(f"Seeded {len(task_ids):,} sprint tasks with {len(events):,} status events")
+    return sprint_id
+
+
+async def median_ms(client: httpx.AsyncClient, url: str, repeat: int, cached: bool) -> float:
+    latencies = []
+    for _ in range(repeat):
+        if not cached:
+            await response_cache.clear()
+        start = time.perf_counter()
+        response = await client.get(url)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+async def main(args) -> None:
+    with temp_database() as (sync_url, async_url):
+        task_ids = seed_tasks(sync_url, args.tasks)
+        sprint_id = seed_sprint(sync_url, task_ids, datetime(2024, 3, 4), args.days)
+        engine, SessionFactory = make_session_factory(async_url)
+
+        async def bench_get_db():
+            async with SessionFactory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = bench_get_db
+        app.dependency_overrides[get_read_db] = bench_get_db
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for label, url in (
+                    ("burndown", f"/api/analytics/burndown/{sprint_id}"),
+                    ("summary (cycle time)", "/api/analytics/summary"),
+                ):
+                    computed = await median_ms(client, url, args.repeat, cached=False)
+                    cached = await median_ms(client, url, args.repeat, cached=True)
+                    print(f"{label:<22} {computed:>8.1f} ms computed {cached:>8.2f} ms cached")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--days", type=int, default=14, help="Sprint length in days")
+    parser.add_argument("--repeat", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
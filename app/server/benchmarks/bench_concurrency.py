@@ -0,0 +1,146 @@
+"""
+Concurrency benchmark: request throughput under mixed load
+
+Compares the async session layer against the previous blocking pattern
+(a synchronous Session used inside `async def` handlers). The load mixes a
+heavy analytics query with cheap task lookups and health checks; with the
+blocking pattern the cheap requests queue behind every heavy one.
+
+Usage:
+    python benchmarks/bench_concurrency.py [--tasks 2000] [--entries 200000] [--requests 400]
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import (
+    make_session_factory,
+    percentile,
+    seed_tasks,
+    seed_time_entries,
+    temp_database,
+    timed,
+)
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from core.database import get_db, get_read_db
+from core.models import Task, TimeEntry
+from server import app
+
+
+def build_blocking_app(sync_url: str) -> FastAPI:
+    """Rebuild the endpoints under test using a blocking Session, as before the async port"""
+    # NullPool: a bounded pool deadlocks here, since the blocked loop never lets sessions return connections
+    engine = create_engine(sync_url, connect_args={"check_same_thread": False}, poolclass=NullPool)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    blocking_app = FastAPI()
+
+    def get_sync_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @blocking_app.get("/api/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    @blocking_app.get("/api/tasks/{task_id}")
+    async def get_task(task_id: str, db: Session = Depends(get_sync_db)):
+        task = db.query(Task).filter(Task.id == task_id).first()
+        if not task:
+            raise HTTPException(status_code=404)
+        return {"id": task.id, "title": task.title}
+
+    @blocking_app.get("/api/analytics/summary")
+    async def get_analytics_summary(db: Session = Depends(get_sync_db)):
+        entries = db.query(TimeEntry).filter(TimeEntry.duration.isnot(None)).all()
+        return {
+            "total_tasks": db.query(Task).count(),
+            "total_time_logged": sum(entry.duration or 0 for entry in entries),
+        }
+
+    return blocking_app
+
+
+async def run_mixed_load(target_app, task_ids: list, total_requests: int, heavy_every: int) -> dict:
+    """Fire a burst of mixed requests concurrently and collect latencies per request kind"""
+    transport = httpx.ASGITransport(app=target_app)
+    latencies = {"heavy": [], "light": []}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            if i % heavy_every == 0:
+                kind, url = "heavy", "/api/analytics/summary"
+            elif i % 2:
+                kind, url = "light", f"/api/tasks/{task_ids[i % len(task_ids)]}"
+            else:
+                kind, url = "light", "/api/health"
+            start = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies[kind].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total_requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "elapsed": elapsed,
+        "throughput": total_requests / elapsed,
+        "light_p50_ms": percentile(latencies["light"], 50) * 1000,
+        "light_p95_ms": percentile(latencies["light"], 95) * 1000,
+        "heavy_p50_ms": percentile(latencies["heavy"], 50) * 1000,
+    }
+
+
+def report(label: str, stats: dict) -> None:
+    print(
+        f"{label:<10} {stats['throughput']:>8.1f} req/s   "
+        f"light p50 {stats['light_p50_ms']:>8.1f} ms   light p95 {stats['light_p95_ms']:>8.1f} ms   "
+        f"heavy p50 {stats['heavy_p50_ms']:>8.1f} ms"
+    )
+
+
+async def main(args) -> None:
+    with temp_database() as (sync_url, async_url):
+        with timed("Seeding"):
+            task_ids = seed_tasks(sync_url, args.tasks)
+            seed_time_entries(sync_url, args.entries, task_ids)
+
+        blocking = await run_mixed_load(build_blocking_app(sync_url), task_ids, args.requests, args.heavy_every)
+
+        engine, SessionFactory = make_session_factory(async_url)
+
+        async def bench_get_db():
+            async with SessionFactory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = bench_get_db
+        app.dependency_overrides[get_read_db] = bench_get_db
+        try:
+            concurrent = await run_mixed_load(app, task_ids, args.requests, args.heavy_every)
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            await engine.dispose()
+
+    print(f"\n{args.requests} requests, 1 heavy per {args.heavy_every}")
+    report("blocking", blocking)
+    report("async", concurrent)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2_000)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--heavy-every", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+"""
+SQLite write concurrency benchmark: engine profiles under 100 concurrent writers
+
+Runs --writers concurrent clients, each logging --writes time entries through
+POST /api/time/entries (an insert plus a rollup upsert per request), while
+--readers clients keep listing tasks. It runs once per engine profile:
+
+- previous: the engine as it was configured before the Settings profiles:
+  NullPool, rollback journal, synchronous=FULL
+- tuned: core.database.create_database_engine with the default Settings:
+  pooled connections, WAL, synchronous=NORMAL and a busy timeout
+
+and reports write throughput, write and read latency percentiles, and the
+requests that failed (e.g. with "database is locked").
+
+Usage:
+    python benchmarks/bench_db_writers.py [--writers 100] [--writes 20] [--readers 10]
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import percentile, seed_tasks, temp_database
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.config import settings
+from core.database import create_database_engine, get_db, get_read_db
+from server import app
+
+
+def previous_engine(async_url: str):
+    return create_async_engine(async_url)
+
+
+def tuned_engine(async_url: str):
+    return create_database_engine(async_url, settings.model_copy(update={"DB_ECHO": False}))
+
+
+PROFILES = {"previous": previous_engine, "tuned": tuned_engine}
+
+
+async def run_load(engine, writers: int, writes: int, readers: int) -> dict:
+    SessionFactory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def bench_get_db():
+        async with SessionFactory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = bench_get_db
+    app.dependency_overrides[get_read_db] = bench_get_db
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    write_latencies, read_latencies = [], []
+    failures = 0
+    writing = True
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def writer(w: int):
+            nonlocal failures
+            for i in range(writes):
+                start = time.perf_counter()
+                response = await client.post("/api/time/entries", json={
+                    "start_time": f"2024-03-{1 + (w + i) % 28:02d}T09:00:00", "duration": 60 + w
+                })
+                write_latencies.append(time.perf_counter() - start)
+                failures += response.status_code >= 400
+
+        async def reader():
+            nonlocal failures
+            while writing:
+                start = time.perf_counter()
+                response = await client.get("/api/tasks/", params={"limit": 50})
+                read_latencies.append(time.perf_counter() - start)
+                failures += response.status_code >= 400
+
+        reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(w) for w in range(writers)))
+        elapsed = time.perf_counter() - started
+        writing = False
+        await asyncio.gather(*reader_tasks)
+
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
+    return {
+        "writes/s": len(write_latencies) / elapsed,
+        "write p50 ms": percentile(write_latencies, 50) * 1000,
+        "write p99 ms": percentile(write_latencies, 99) * 1000,
+        "read p50 ms": percentile(read_latencies, 50) * 1000,
+        "read p99 ms": percentile(read_latencies, 99) * 1000,
+        "reads": len(read_latencies),
+        "failed": failures,
+    }
+
+
+async def main(args) -> None:
+    results = {}
+    for name, build in PROFILES.items():
+        with temp_database(f"{name}.db") as (sync_url, async_url):
+            seed_tasks(sync_url, args.tasks)
+            engine = build(async_url)
+            results[name] = await run_load(engine, args.writers, args.writes, args.readers)
+            await engine.dispose()
+
+    print(f"{args.writers} writers x {args.writes} time entries, {args.readers} readers listing tasks\n")
+    print(f"{'':<14}" + "".join(f"{name:>12}" for name in results))
+    for metric in next(iter(results.values())):
+        print(f"{metric:<14}" + "".join(f"{result[metric]:>12,.1f}" for result in results.values()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=100)
+    parser.add_argument("--writes", type=int, default=20, help="Time entries logged by each writer")
+    parser.add_argument("--readers", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks seeded for the readers to list")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""
+Streaming export benchmark: throughput and memory of GET /api/time/export
+
+Seeds the time_entries table in steps up to --entries (400k by default) and
+streams the whole table through the export endpoint at each size, in both
+formats, recording rows per second and the Python heap peak with
+tracemalloc. The body is counted and discarded as it arrives, as a client
+writing to disk would, so the peak is the server's own: it should stay flat
+as the table grows. Rows per second are measured under tracemalloc, which
+slows allocation-heavy code severalfold; compare them with each other only.
+
+Usage:
+    python benchmarks/bench_export.py [--entries 400000] [--steps 4]
+    python benchmarks/bench_export.py --entries 2000000   # payroll-sized export
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from common import make_session_factory, seed_tasks, seed_time_entries, temp_database
+
+from core.database import get_db
+from server import app
+
+
+async def stream_export(query_string: bytes) -> int:
+    """Call the export endpoint over raw ASGI and return the number of lines received"""
+    lines = 0
+    requested, done = False, asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal lines
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"Export failed with status {message['status']}")
+        if message["type"] == "http.response.body":
+            lines += message.get("body", b"").count(b"\n")
+            if not message.get("more_body", False):
+                done.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/time/export", "raw_path": b"/api/time/export",
+        "query_string": query_string, "root_path": "", "headers": [],
+        "server": ("bench", 80), "client": ("bench", 1234),
+    }
+    await app(scope, receive, send)
+    return lines
+
+
+async def main(args) -> None:
+    with temp_database() as (sync_url, async_url):
+        task_ids = seed_tasks(sync_url, args.tasks)
+        engine, SessionFactory = make_session_factory(async_url)
+
+        async def bench_get_db():
+            async with SessionFactory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = bench_get_db
+        step = args.entries // args.steps
+        seeded = 0
+
+        print(f"{'entries':>10} {'format':>7} {'rows/s':>10} {'peak mem (MB)':>15}")
+        try:
+            for _ in range(args.steps):
+                seed_time_entries(sync_url, step, task_ids)
+                seeded += step
+                for export_format in ("ndjson", "csv"):
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    lines = await stream_export(f"format={export_format}".encode())
+                    elapsed = time.perf_counter() - start
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    rows = lines - (export_format == "csv")  # CSV starts with a header line
+                    assert rows == seeded, (rows, seeded)
+                    print(f"{seeded:>10,} {export_format:>7} {rows / elapsed:>10,.0f} {peak / 1024 / 1024:>15.2f}")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=400_000)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    parser.add_argument("--steps", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
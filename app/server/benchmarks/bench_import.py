@@ -0,0 +1,104 @@
+"""
+Bulk import benchmark: NDJSON import vs one POST per row
+
+Generates --tasks tasks and --entries time entries as NDJSON and streams
+them to POST /api/tasks/import and /api/time/import, printing the rows per
+second each import reports. For comparison, --single rows of each are
+created through the one-row endpoints (POST /api/tasks/, /api/time/entries).
+
+Usage:
+    python benchmarks/bench_import.py [--tasks 200000] [--entries 500000] [--single 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from common import make_session_factory, sample_words, temp_database
+
+import httpx
+
+from core.database import get_db
+from server import app
+
+STATUSES = ["backlog", "todo", "in_progress", "in_review", "done"]
+
+
+def task_rows(count: int):
+    rng = random.Random(count)
+    for i in range(count):
+        yield {
+            "title": " ".join(sample_words(rng, 4)).capitalize(),
+            "description": " ".join(sample_words(rng, 12)),
+            "status": STATUSES[i % len(STATUSES)],
+        }
+
+
+def entry_rows(count: int):
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        yield {
+            "start_time": (start + timedelta(minutes=(i * 17) % (365 * 24 * 60))).isoformat(),
+            "duration": 60 + i % 3600,
+        }
+
+
+async def ndjson(rows, batch: int = 5_000):
+    """Encode rows as an NDJSON request body, a batch of lines at a time"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row))
+        if len(lines) == batch:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def single_rate(client: httpx.AsyncClient, url: str, rows) -> float:
+    rows = list(rows)
+    start = time.perf_counter()
+    for row in rows:
+        (await client.post(url, json=row)).raise_for_status()
+    return len(rows) / (time.perf_counter() - start)
+
+
+async def main(args) -> None:
+    with temp_database() as (sync_url, async_url):
+        engine, SessionFactory = make_session_factory(async_url)
+
+        async def bench_get_db():
+            async with SessionFactory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = bench_get_db
+        transport = httpx.ASGITransport(app=app)
+        print(f"{'import':<14} {'rows':>10} {'rejected':>9} {'bulk rows/s':>12} {'single rows/s':>14}")
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                for label, url, single_url, rows, count in (
+                    ("tasks", "/api/tasks/import", "/api/tasks/", task_rows, args.tasks),
+                    ("time entries", "/api/time/import", "/api/time/entries", entry_rows, args.entries),
+                ):
+                    response = await client.post(url, content=ndjson(rows(count)))
+                    response.raise_for_status()
+                    report = response.json()
+                    single = await single_rate(client, single_url, rows(args.single))
+                    print(
+                        f"{label:<14} {report['imported']:>10,} {report['rejected']:>9,} "
+                        f"{report['rows_per_second']:>12,.0f} {single:>14,.0f}"
+                    )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--single", type=int, default=1_000, help="Rows created one request at a time")
+    asyncio.run(main(parser.parse_args()))
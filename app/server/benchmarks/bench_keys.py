@@ -0,0 +1,147 @@
+"""
+Primary key layout benchmark: text UUIDs vs binary UUIDv4 vs binary UUIDv7
+
+Builds the schema three times, at migration 0007 (36-character text keys) and
+at head (16-byte keys) with random and time-ordered UUIDs, seeds --tasks
+tasks and --entries time entries into each, and reports:
+
+- the on-disk size of the tasks and time_entries tables and their indexes
+  (from SQLite's dbstat table)
+- how long the inserts took, which random keys slow down once the key
+  indexes no longer fit in the page cache
+- the latency of the joins behind the time summary and the task lists:
+  entries joined to their task, and tasks joined to their assignee
+
+Usage:
+    python benchmarks/bench_keys.py [--tasks 50000] [--entries 500000] [--repeat 5]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from common import PLACEHOLDER_USER_ID
+
+from alembic import command
+from sqlalchemy import create_engine
+
+from core.ids import uuid7
+from core.migrations import get_alembic_config
+
+LAYOUTS = [
+    # (label, revision, key generator, key encoder)
+    ("text uuid4", "0007", uuid.uuid4, str),
+    ("binary uuid4", "head", uuid.uuid4, lambda key: key.bytes),
+    ("binary uuid7", "head", uuid7, lambda key: key.bytes),
+]
+
+BATCH_SIZE = 20_000
+
+JOINS = {
+    "entries -> task": """
+        SELECT tasks.title, SUM(time_entries.duration)
+        FROM time_entries JOIN tasks ON tasks.id = time_entries.task_id
+        GROUP BY time_entries.task_id
+    """,
+    "tasks -> assignee": """
+        SELECT tasks.title, users.username
+        FROM tasks JOIN users ON users.id = tasks.assignee_id
+        WHERE tasks.status = 'todo'
+    """,
+}
+
+
+def seed(conn, new_key, encode, tasks: int, entries: int, users: int = 50) -> float:
+    """Insert users, tasks and time entries in key order of creation; returns the seconds taken"""
+    rng = random.Random(tasks)
+    now = datetime.utcnow()
+    user_ids = [encode(new_key()) for _ in range(users)]
+    owner = encode(uuid.UUID(PLACEHOLDER_USER_ID))
+
+    start = time.perf_counter()
+    conn.exec_driver_sql(
+        "INSERT INTO users (id, username) VALUES (?, ?)",
+        [(owner, "owner")] + [(user_id, f"user{i}") for i, user_id in enumerate(user_ids)]
+    )
+    task_ids = []
+    for offset in range(0, tasks, BATCH_SIZE):
+        rows = []
+        for i in range(offset, min(offset + BATCH_SIZE, tasks)):
+            task_id = encode(new_key())
+            task_ids.append(task_id)
+            rows.append((task_id, f"Task {i}", ("todo", "done")[i % 2], rng.choice(user_ids), owner, f"{i:08d}"))
+        conn.exec_driver_sql(
+            "INSERT INTO tasks (id, title, status, assignee_id, created_by, rank) VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+    for offset in range(0, entries, BATCH_SIZE):
+        rows = []
+        for i in range(offset, min(offset + BATCH_SIZE, entries)):
+            started = now - timedelta(minutes=i)
+            rows.append((encode(new_key()), rng.choice(task_ids), owner, started, 60 + i % 3600))
+        conn.exec_driver_sql(
+            "INSERT INTO time_entries (id, task_id, user_id, start_time, duration, is_running) "
+            "VALUES (?, ?, ?, ?, ?, 0)",
+            rows
+        )
+    return time.perf_counter() - start
+
+
+def object_sizes(conn) -> dict:
+    """Bytes on disk of every table and index of tasks and time_entries"""
+    rows = conn.exec_driver_sql(
+        "SELECT dbstat.name, SUM(dbstat.pgsize) FROM dbstat "
+        "JOIN sqlite_master ON sqlite_master.name = dbstat.name "
+        "WHERE sqlite_master.tbl_name IN ('tasks', 'time_entries') GROUP BY dbstat.name"
+    ).all()
+    return dict(rows)
+
+
+def time_query(conn, sql: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.exec_driver_sql(sql).all()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main(args) -> None:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, revision, new_key, encode in LAYOUTS:
+            engine = create_engine(f"sqlite:///{Path(tmp) / (label.replace(' ', '_') + '.db')}")
+            with engine.begin() as conn:
+                command.upgrade(get_alembic_config(conn), revision)
+            with engine.begin() as conn:
+                seconds = seed(conn, new_key, encode, args.tasks, args.entries)
+            with engine.connect() as conn:
+                conn.exec_driver_sql("ANALYZE")
+                joins = {name: time_query(conn, sql, args.repeat) for name, sql in JOINS.items()}
+                results.append((label, seconds, object_sizes(conn), joins))
+            engine.dispose()
+
+    print(f"{args.tasks:,} tasks, {args.entries:,} time entries\n")
+    names = sorted(results[0][2])
+    print(f"{'size (MB)':<40}" + "".join(f"{label:>15}" for label, *_ in results))
+    for name in names:
+        print(f"{name:<40}" + "".join(f"{sizes.get(name, 0) / 1e6:>15.1f}" for _, _, sizes, _ in results))
+    print(f"{'total':<40}" + "".join(f"{sum(sizes.values()) / 1e6:>15.1f}" for _, _, sizes, _ in results))
+
+    print(f"\n{'time':<40}" + "".join(f"{label:>15}" for label, *_ in results))
+    print(f"{'inserts (s)':<40}" + "".join(f"{seconds:>15.2f}" for _, seconds, _, _ in results))
+    for name in JOINS:
+        print(f"{name + ' join (ms, median)':<40}" + "".join(f"{joins[name]:>15.1f}" for *_, joins in results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per join; the median is reported")
+    main(parser.parse_args())
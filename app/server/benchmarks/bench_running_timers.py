@@ -0,0 +1,110 @@
+"""
+Running timer lookup benchmark: time_entries query vs the timer registry
+
+Seeds --entries completed time entries spread over --users users, half of
+whom also have a running timer, then times the two lookups behind the
+"currently running" views and the /ws timer events:
+
+- every running timer (the board)
+- one user's running timer (their own dashboard, timer:start)
+
+each answered by querying time_entries on is_running, as the router used to,
+and by the in-memory timer registry loaded from it.
+
+Usage:
+    python benchmarks/bench_running_timers.py [--users 1000] [--entries 200000] [--lookups 2000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from common import make_session_factory, new_id, percentile, temp_database
+
+from sqlalchemy import create_engine, insert, select
+
+from core.models import TimeEntry
+from core.timers import MemoryTimerRegistry, running_timers
+
+
+def seed(sync_url: str, users: int, entries: int, batch_size: int = 20_000) -> list:
+    """Spread `entries` completed entries over `users` users and start a timer for every other one"""
+    rng = random.Random(entries)
+    now = datetime.utcnow()
+    user_ids = [new_id() for _ in range(users)]
+
+    engine = create_engine(sync_url)
+    with engine.begin() as conn:
+        for offset in range(0, entries, batch_size):
+            rows = []
+            for i in range(offset, min(offset + batch_size, entries)):
+                start = now - timedelta(minutes=i)
+                rows.append({
+                    "id": new_id(), "user_id": rng.choice(user_ids), "start_time": start,
+                    "end_time": start + timedelta(seconds=60), "duration": 60, "is_running": False,
+                })
+            conn.execute(insert(TimeEntry), rows)
+        conn.execute(insert(TimeEntry), [
+            {"id": new_id(), "user_id": user_id, "start_time": now - timedelta(minutes=i), "is_running": True}
+            for i, user_id in enumerate(user_ids[::2])
+        ])
+    engine.dispose()
+    return user_ids
+
+
+async def measure(lookup, repeat: int) -> tuple:
+    """(p50, p99) microseconds of `lookup()` over `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await lookup()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50) * 1e6, percentile(samples, 99) * 1e6
+
+
+async def main(args) -> None:
+    rng = random.Random(args.users)
+    with temp_database("timers.db") as (sync_url, async_url):
+        user_ids = seed(sync_url, args.users, args.entries)
+        engine, SessionFactory = make_session_factory(async_url)
+
+        registry = MemoryTimerRegistry()
+        async with engine.connect() as conn:
+            await registry.load(await running_timers(conn))
+
+        async def query_all():
+            async with SessionFactory() as db:
+                return await running_timers(db)
+
+        async def query_user():
+            async with SessionFactory() as db:
+                result = await db.execute(select(TimeEntry).where(
+                    TimeEntry.user_id == rng.choice(user_ids), TimeEntry.is_running.is_(True)
+                ))
+                return result.scalars().first()
+
+        async def registry_user():
+            return await registry.get(rng.choice(user_ids))
+
+        results = {
+            "all running (query)": await measure(query_all, args.lookups),
+            "all running (registry)": await measure(registry.all, args.lookups),
+            "one user (query)": await measure(query_user, args.lookups),
+            "one user (registry)": await measure(registry_user, args.lookups),
+        }
+        await engine.dispose()
+
+    print(f"{args.users:,} users, {len(await registry.all()):,} running timers, {args.entries:,} time entries\n")
+    print(f"{'lookup':<26}{'p50 us':>12}{'p99 us':>12}")
+    for name, (p50, p99) in results.items():
+        print(f"{name:<26}{p50:>12,.1f}{p99:>12,.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--entries", type=int, default=200_000, help="Completed time entries across all users")
+    parser.add_argument("--lookups", type=int, default=2000, help="Timed calls per lookup")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,142 @@
+"""
+Response serialization benchmark: response_model validation vs the orjson fast path
+
+Seeds --tasks tasks (with assignees) and --entries time entries, loads them
+once through the ORM, then times turning them into JSON both ways:
+
+- validated: TaskResponse/TimeEntryResponse.model_validate per row,
+  jsonable_encoder and json.dumps, which is what FastAPI does for a
+  response_model endpoint
+- fast: the prebuilt core.serialization serializers and orjson.dumps
+
+It then times the full GET /api/tasks/ and GET /api/time/entries requests
+with FAST_JSON_RESPONSES off and on.
+
+Usage:
+    python benchmarks/bench_serialization.py [--tasks 5000] [--entries 5000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from common import make_session_factory, new_id, seed_tasks, seed_time_entries, temp_database
+
+import httpx
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import bindparam, create_engine, insert, select, update
+from sqlalchemy.orm import selectinload
+
+from core.config import settings
+from core.database import get_db, get_read_db
+from core.models import Task, TimeEntry, User
+from core.routers.tasks import MAX_PAGE_SIZE
+from core.routers.time_tracking import ENTRY_LOAD_OPTIONS
+from core.schemas import TaskResponse, TimeEntryResponse
+from core.serialization import serialize_task, serialize_time_entry
+from server import app
+
+
+def seed_assignees(sync_url: str, task_ids: list, count: int) -> None:
+    """Create `count` users and assign them to the tasks round-robin"""
+    user_ids = [new_id() for _ in range(count)]
+    engine = create_engine(sync_url)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": user_id, "username": f"user{i}", "email": f"user{i}@example.com"}
+            for i, user_id in enumerate(user_ids)
+        ])
+        conn.execute(
+            update(Task).where(Task.id == bindparam("task_id")).values(assignee_id=bindparam("user_id")),
+            [{"task_id": task_id, "user_id": user_ids[i % count]} for i, task_id in enumerate(task_ids)]
+        )
+    engine.dispose()
+
+
+def median_ms(fn, repeat: int) -> float:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def validated(schema, rows) -> bytes:
+    content = jsonable_encoder([schema.model_validate(row) for row in rows])
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fast(serializer, rows) -> bytes:
+    return orjson.dumps(serializer.many(rows))
+
+
+async def request_ms(client: httpx.AsyncClient, url: str, params: dict, repeat: int) -> float:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+async def main(args) -> None:
+    with temp_database() as (sync_url, async_url):
+        task_ids = seed_tasks(sync_url, args.tasks)
+        seed_assignees(sync_url, task_ids, args.users)
+        seed_time_entries(sync_url, args.entries, task_ids)
+        engine, SessionFactory = make_session_factory(async_url)
+
+        async with SessionFactory() as db:
+            result = await db.execute(select(Task).options(selectinload(Task.assignee)))
+            tasks = result.scalars().all()
+            result = await db.execute(select(TimeEntry).options(*ENTRY_LOAD_OPTIONS))
+            entries = result.scalars().all()
+
+        print(f"{'serializing':<28} {'validated (ms)':>15} {'fast (ms)':>10} {'speedup':>8}")
+        for label, schema, serializer, rows in (
+            (f"{len(tasks):,} tasks", TaskResponse, serialize_task, tasks),
+            (f"{len(entries):,} time entries", TimeEntryResponse, serialize_time_entry, entries),
+        ):
+            assert json.loads(validated(schema, rows)) == json.loads(fast(serializer, rows))
+            slow_ms = median_ms(lambda: validated(schema, rows), args.repeat)
+            fast_ms = median_ms(lambda: fast(serializer, rows), args.repeat)
+            print(f"{label:<28} {slow_ms:>15.1f} {fast_ms:>10.1f} {slow_ms / fast_ms:>7.1f}x")
+
+        async def bench_get_db():
+            async with SessionFactory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = bench_get_db
+        app.dependency_overrides[get_read_db] = bench_get_db
+        transport = httpx.ASGITransport(app=app)
+        print(f"\n{'request':<28} {'validated (ms)':>15} {'fast (ms)':>10} {'speedup':>8}")
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for label, url, params in (
+                    (f"GET /api/tasks/ ({MAX_PAGE_SIZE})", "/api/tasks/", {"limit": MAX_PAGE_SIZE}),
+                    (f"GET /api/time/entries ({len(entries):,})", "/api/time/entries", {}),
+                ):
+                    timings = []
+                    for enabled in (False, True):
+                        settings.FAST_JSON_RESPONSES = enabled
+                        timings.append(await request_ms(client, url, params, args.repeat))
+                    print(f"{label:<28} {timings[0]:>15.1f} {timings[1]:>10.1f} {timings[0] / timings[1]:>7.1f}x")
+        finally:
+            settings.FAST_JSON_RESPONSES = False
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
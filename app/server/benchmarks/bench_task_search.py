@@ -0,0 +1,82 @@
+"""
+Task search benchmark: full-text index latency at scale
+
+Seeds --tasks tasks (500k by default) with Zipf-distributed text, then times
+search-box style queries (short prefixes, whole words, multi-word, rare and
+no-match terms) both at the SQL level and through GET /api/tasks?search=.
+The target is sub-10ms per query.
+
+Usage:
+    python benchmarks/bench_task_search.py [--tasks 500000] [--repeat 20] [--limit 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import make_session_factory, percentile, seed_tasks, temp_database, timed
+
+import httpx
+from sqlalchemy import select
+
+from core.database import get_db, get_read_db
+from core.models import Task
+from core.search import apply_search
+from server import app
+
+# From the most frequent vocabulary word down to no match at all (see common.VOCABULARY)
+QUERIES = ["lo", "log", "login", "dash", "veloc", "websock cache", "kaen", "karomi", "zzzz"]
+
+
+async def main(args) -> None:
+    with temp_database() as (sync_url, async_url):
+        with timed(f"Seeding {args.tasks:,} tasks"):
+            seed_tasks(sync_url, args.tasks)
+
+        engine, SessionFactory = make_session_factory(async_url)
+
+        async def bench_get_db():
+            async with SessionFactory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = bench_get_db
+        app.dependency_overrides[get_read_db] = bench_get_db
+        transport = httpx.ASGITransport(app=app)
+
+        print(f"\n{'query':<18} {'hits':>5} {'sql p50':>9} {'sql p95':>9} {'api p50':>9} {'api p95':>9}   (ms)")
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for term in QUERIES:
+                    sql_times, api_times = [], []
+                    hits = 0
+                    async with SessionFactory() as db:
+                        for _ in range(args.repeat):
+                            query, rank = apply_search(select(Task.id), Task.__table__, "sqlite", term)
+                            start = time.perf_counter()
+                            rows = (await db.execute(query.order_by(rank).limit(args.limit))).all()
+                            sql_times.append(time.perf_counter() - start)
+                            hits = len(rows)
+                    for _ in range(args.repeat):
+                        start = time.perf_counter()
+                        response = await client.get(
+                            "/api/tasks/", params={"search": term, "limit": args.limit}
+                        )
+                        response.raise_for_status()
+                        api_times.append(time.perf_counter() - start)
+                    print(
+                        f"{term:<18} {hits:>5} "
+                        f"{percentile(sql_times, 50) * 1000:>9.2f} {percentile(sql_times, 95) * 1000:>9.2f} "
+                        f"{percentile(api_times, 50) * 1000:>9.2f} {percentile(api_times, 95) * 1000:>9.2f}"
+                    )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
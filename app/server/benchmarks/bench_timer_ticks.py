@@ -0,0 +1,123 @@
+"""
+Live timer benchmark: dashboards polling /api/time/entries vs server timer ticks
+
+Keeping --dashboards open dashboards' running timers current used to take a
+poll of GET /api/time/entries per dashboard (each one then ran its own
+clock). With core.ticker the server sends each connection one timer:tick
+frame per interval instead. This reports the cost of one refresh of every
+dashboard both ways:
+
+- polling: --dashboards concurrent GET /api/time/entries against a database
+  of --entries time entries
+- ticks: one TimerTicker.tick() over --timers running timers, until every
+  simulated client has received its frame; most dashboards watch the board,
+  the rest a single user
+
+Usage:
+    python benchmarks/bench_timer_ticks.py [--dashboards 200] [--timers 200] [--entries 1000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from common import PLACEHOLDER_USER_ID, new_id, seed_time_entries, temp_database
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.database import get_db, get_read_db
+from core.ticker import TimerTicker
+from core.timers import MemoryTimerRegistry, RunningTimer
+from core.websocket import BOARD_TOPIC, ConnectionManager
+from server import app
+
+
+class CountingSocket:
+    """In-process client that counts the frames and bytes it receives"""
+
+    def __init__(self, received: asyncio.Event, expected: list):
+        self.received = received
+        self.expected = expected
+        self.bytes = 0
+
+    async def send_text(self, text: str) -> None:
+        self.bytes += len(text)
+        self.expected[0] -= 1
+        if not self.expected[0]:
+            self.received.set()
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+async def poll_round(async_url: str, dashboards: int) -> dict:
+    engine = create_async_engine(async_url)
+    SessionFactory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def bench_get_db():
+        async with SessionFactory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = bench_get_db
+    app.dependency_overrides[get_read_db] = bench_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get("/api/time/entries") for _ in range(dashboards)))
+        elapsed = time.perf_counter() - start
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
+    await engine.dispose()
+    return {"ms": elapsed * 1000, "frames": dashboards, "bytes": sum(len(r.content) for r in responses)}
+
+
+async def tick_round(dashboards: int, timers: int) -> dict:
+    rng = random.Random(timers)
+    now = datetime.utcnow()
+    user_ids = [new_id() for _ in range(timers)]
+    registry = MemoryTimerRegistry()
+    await registry.load([
+        RunningTimer(new_id(), user_id, None, now - timedelta(seconds=rng.randrange(36_000)))
+        for user_id in user_ids
+    ])
+
+    manager = ConnectionManager()
+    received, expected = asyncio.Event(), [dashboards]
+    sockets = [CountingSocket(received, expected) for _ in range(dashboards)]
+    for i, socket in enumerate(sockets):
+        # One dashboard in five follows a single teammate instead of the board
+        manager.register(socket, [f"user:{rng.choice(user_ids)}"] if i % 5 == 0 else [BOARD_TOPIC])
+
+    ticker = TimerTicker(manager, registry, interval=1)
+    encoded = manager.stats.messages
+    start = time.perf_counter()
+    await ticker.tick()
+    await received.wait()
+    elapsed = time.perf_counter() - start
+    encoded = manager.stats.messages - encoded
+    await manager.shutdown()
+    return {"ms": elapsed * 1000, "frames": encoded, "bytes": sum(socket.bytes for socket in sockets)}
+
+
+async def main(args) -> None:
+    with temp_database("ticks.db") as (sync_url, async_url):
+        seed_time_entries(sync_url, args.entries, [], user_id=PLACEHOLDER_USER_ID)
+        polling = await poll_round(async_url, args.dashboards)
+    ticks = await tick_round(args.dashboards, args.timers)
+
+    print(f"{args.dashboards} dashboards, {args.timers} running timers, {args.entries:,} time entries\n")
+    print(f"{'one refresh':<28}{'polling':>14}{'ticks':>14}")
+    print(f"{'wall time (ms)':<28}{polling['ms']:>14,.1f}{ticks['ms']:>14,.1f}")
+    print(f"{'responses/frames encoded':<28}{polling['frames']:>14,}{ticks['frames']:>14,}")
+    print(f"{'bytes sent (KB)':<28}{polling['bytes'] / 1024:>14,.0f}{ticks['bytes'] / 1024:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dashboards", type=int, default=200)
+    parser.add_argument("--timers", type=int, default=200, help="Running timers in the ticks")
+    parser.add_argument("--entries", type=int, default=1000, help="Time entries each poll lists")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,147 @@
+"""
+WebSocket broadcast benchmark: fan-out latency with slow and stalled clients
+
+Simulates --connections in-process WebSocket clients (5k by default). Most
+are healthy, a fraction are slow consumers and a few stall for --stall
+seconds per frame. Each broadcaster sends --messages events, and the script
+reports how long the caller of broadcast() waits and how long healthy
+clients wait for each event.
+
+The sequential broadcaster (the previous ConnectionManager.broadcast) makes
+every healthy client wait behind the slow ones. core.websocket queues each
+frame per connection and evicts the laggards.
+
+Usage:
+    python benchmarks/bench_ws_broadcast.py [--connections 5000] [--messages 5] [--slow 0.01] [--stalled 2]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from common import percentile
+
+from core.websocket import ConnectionManager
+
+
+class SimulatedSocket:
+    """In-process client whose sends take `delay` seconds"""
+
+    def __init__(self, delay: float, healthy: bool):
+        self.delay = delay
+        self.healthy = healthy
+        self.latencies = []
+
+    async def send_text(self, text: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.latencies.append(time.perf_counter() - json.loads(text)["sent_at"])
+
+    async def send_json(self, message: dict) -> None:
+        await self.send_text(json.dumps(message))
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+class SequentialManager:
+    """The previous broadcaster: one awaited send per socket, in order"""
+
+    def __init__(self, sockets):
+        self.active_connections = list(sockets)
+
+    async def broadcast(self, message: dict) -> None:
+        for connection in self.active_connections:
+            try:
+                await connection.send_json(message)
+            except Exception:
+                pass
+
+
+def make_sockets(args) -> list:
+    rng = random.Random(0)
+    sockets = []
+    for i in range(args.connections):
+        if i < args.stalled:
+            sockets.append(SimulatedSocket(args.stall, healthy=False))
+        elif rng.random() < args.slow:
+            sockets.append(SimulatedSocket(args.slow_delay, healthy=False))
+        else:
+            sockets.append(SimulatedSocket(0, healthy=True))
+    rng.shuffle(sockets)
+    return sockets
+
+
+async def run(name: str, manager, sockets: list, args, settle) -> None:
+    caller_waits = []
+    start = time.perf_counter()
+    for i in range(args.messages):
+        sent_at = time.perf_counter()
+        await manager.broadcast({"type": "task:updated", "n": i, "sent_at": sent_at})
+        caller_waits.append(time.perf_counter() - sent_at)
+        await asyncio.sleep(args.interval)
+
+    healthy = [socket for socket in sockets if socket.healthy]
+    expected = len(healthy) * args.messages
+    while sum(len(socket.latencies) for socket in healthy) < expected:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    await settle()
+
+    latencies = [latency for socket in healthy for latency in socket.latencies]
+    print(
+        f"{name:<12} {percentile(caller_waits, 50) * 1000:>12.1f} "
+        f"{percentile(latencies, 50) * 1000:>9.1f} {percentile(latencies, 99) * 1000:>9.1f} "
+        f"{max(latencies) * 1000:>9.1f} {elapsed:>9.2f}",
+        end=""
+    )
+
+
+async def main(args) -> None:
+    print(
+        f"{args.connections:,} connections, {args.messages} messages, "
+        f"{args.slow:.1%} slow ({args.slow_delay * 1000:.0f} ms/frame), "
+        f"{args.stalled} stalled ({args.stall:.1f} s/frame)\n"
+    )
+    print(
+        f"{'broadcaster':<12} {'caller (ms)':>12} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+        f"{'max (ms)':>9} {'total (s)':>9}   healthy-client delivery latency"
+    )
+
+    sockets = make_sockets(args)
+
+    async def no_settle():
+        pass
+
+    await run("sequential", SequentialManager(sockets), sockets, args, no_settle)
+    print()
+
+    sockets = make_sockets(args)
+    manager = ConnectionManager(queue_size=args.queue_size, send_timeout=args.send_timeout)
+    for socket in sockets:
+        manager.register(socket)
+
+    async def evict_and_shutdown():
+        # Give the stalled-send sweep time to evict the stalled clients
+        await asyncio.sleep(args.send_timeout * 1.5)
+        await manager.shutdown()
+
+    await run("fan-out", manager, sockets, args, evict_and_shutdown)
+    stats = manager.stats.snapshot()
+    print(f"   evicted {stats['evictions']}, manager p99 {stats['latency_ms']['p99']} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between broadcasts")
+    parser.add_argument("--slow", type=float, default=0.01, help="Fraction of slow consumers")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="Seconds per frame for slow consumers")
+    parser.add_argument("--stalled", type=int, default=2, help="Number of stalled clients")
+    parser.add_argument("--stall", type=float, default=2.0, help="Seconds per frame for stalled clients")
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--send-timeout", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
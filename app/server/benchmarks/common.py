@@ -0,0 +1,156 @@
+"""
+Shared helpers for the benchmark scripts
+
+Benchmarks run against a throwaway SQLite database so they never touch devdash.db.
+"""
+
+import itertools
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add parent directory to path to import server module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from core.database import Base  # noqa: E402
+from core.ids import PLACEHOLDER_USER_ID, generate_uuid  # noqa: E402
+import core.models  # noqa: E402,F401  (registers tables and the search index on Base.metadata)
+
+
+@contextmanager
+def temp_database(name: str = "bench.db"):
+    """Yield (sync_url, async_url) for a fresh SQLite database with all tables created"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / name
+        sync_url = f"sqlite:///{path}"
+        async_url = f"sqlite+aiosqlite:///{path}"
+        engine = create_engine(sync_url)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+        yield sync_url, async_url
+
+
+def make_session_factory(async_url: str, **engine_kwargs):
+    """Create an (engine, async_sessionmaker) pair for a benchmark database"""
+    engine = create_async_engine(async_url, **engine_kwargs)
+    return engine, async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+def new_id() -> str:
+    """Generate a primary key the same way the models do"""
+    return generate_uuid()
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of samples (nearest-rank)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+@contextmanager
+def timed(label: str):
+    """Print the wall-clock time spent in a block"""
+    start = time.perf_counter()
+    yield
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
+
+
+def seed_tasks(sync_url: str, count: int, batch_size: int = 10_000, **overrides) -> list:
+    """Bulk insert `count` tasks with Zipf-distributed text and return their IDs"""
+    from datetime import datetime
+    from sqlalchemy import insert
+    from core.models import Task
+    from core.ranking import evenly_spaced
+
+    statuses = ["backlog", "todo", "in_progress", "in_review", "done"]
+    now = datetime.utcnow()
+    rng = random.Random(count)
+    ranks = evenly_spaced(count)
+    ids = []
+    engine = create_engine(sync_url)
+    with engine.begin() as conn:
+        for offset in range(0, count, batch_size):
+            rows = []
+            for i in range(offset, min(offset + batch_size, count)):
+                task_id = new_id()
+                ids.append(task_id)
+                rows.append({
+                    "id": task_id,
+                    "title": " ".join(sample_words(rng, 4)).capitalize(),
+                    "description": " ".join(sample_words(rng, 12)),
+                    "status": statuses[i % len(statuses)],
+                    "created_by": PLACEHOLDER_USER_ID,
+                    "labels": [],
+                    "rank": ranks[i],
+                    "created_at": now,
+                    "updated_at": now,
+                    **overrides,
+                })
+            conn.execute(insert(Task), rows)
+    engine.dispose()
+    return ids
+
+
+def seed_time_entries(sync_url: str, count: int, task_ids: list, batch_size: int = 20_000,
+                      user_id: str = PLACEHOLDER_USER_ID) -> None:
+    """Bulk insert `count` completed time entries spread over the last year and refresh the rollups"""
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+    from core.models import TimeEntry
+    from core.rollups import rebuild_time_rollups
+
+    now = datetime.utcnow()
+    engine = create_engine(sync_url)
+    with engine.begin() as conn:
+        for offset in range(0, count, batch_size):
+            rows = []
+            for i in range(offset, min(offset + batch_size, count)):
+                start = now - timedelta(minutes=(i * 17) % (365 * 24 * 60))
+                duration = 60 + (i % 3600)
+                rows.append({
+                    "id": new_id(),
+                    "task_id": task_ids[i % len(task_ids)] if task_ids else None,
+                    "user_id": user_id,
+                    "start_time": start,
+                    "end_time": start + timedelta(seconds=duration),
+                    "duration": duration,
+                    "is_running": False,
+                    "created_at": start,
+                })
+            conn.execute(insert(TimeEntry), rows)
+        # The API maintains the rollups as entries are written; bulk seeding bypasses it
+        rebuild_time_rollups(conn)
+    engine.dispose()
+
+
+WORDS = [
+    "login", "dashboard", "refactor", "database", "migration", "kanban", "timer", "sprint",
+    "github", "webhook", "analytics", "burndown", "velocity", "cache", "websocket", "search",
+    "export", "import", "pagination", "index", "performance", "regression", "bugfix", "release",
+]
+
+_SYLLABLES = ["ka", "ro", "mi", "ta", "ne", "lo", "su", "pi", "da", "ve", "zu", "ch", "or", "en", "is", "al"]
+
+# Generated filler words play the role of very common words; domain words are
+# spread through the mid-frequency range, like real task vocabulary
+_FILLER = [a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES]
+VOCABULARY = _FILLER[:200] + [
+    word for pair in itertools.zip_longest(WORDS, _FILLER[200:]) for word in pair if word
+]
+
+# Zipf-like frequencies, as in natural text: the k-th word appears ~1/k as often as the first
+_CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+
+def sample_words(rng: random.Random, k: int) -> list:
+    """Draw k words from VOCABULARY with Zipf-like frequencies"""
+    return rng.choices(VOCABULARY, cum_weights=_CUM_WEIGHTS, k=k)
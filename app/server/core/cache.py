@@ -0,0 +1,266 @@
+"""
+Response cache for read-heavy endpoints, invalidated by tag
+
+Endpoints such as the analytics charts are polled by every open dashboard
+but only change when tasks, time entries or sprints are written. A cached
+response is stored under its URL plus the current generation of each tag it
+depends on; writers bump a tag's generation after committing, so every
+response built from the old data stops matching and ages out of the backend.
+
+- MemoryCacheBackend: per-process TTL + LRU, the default.
+- RedisCacheBackend: shared between workers, so a write handled by one
+  invalidates the responses cached by all of them.
+
+Responses carry an ETag, and requests whose If-None-Match matches get an
+empty 304 instead of the body.
+
+With a read replica, a response built just after an invalidation may come
+from a replica that has not caught up with the write, so for
+READ_AFTER_WRITE_SECONDS after a tag is invalidated its responses are served
+but not stored.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from core.conditional import etag_matches
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tags for the tables whose writes invalidate cached responses
+TASKS_TAG = "tasks"
+TIME_TAG = "time"
+SPRINTS_TAG = "sprints"
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+class CacheBackend:
+    """Stores response bodies and tag generations"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the body stored under `key`, or None if missing or expired"""
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a body for `ttl` seconds"""
+
+    async def generations(self, tags: List[str]) -> List[int]:
+        """Current generation of each tag"""
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        """Advance the tags' generations, orphaning every entry built under the old ones"""
+
+    async def hold(self, tags: Iterable[str], seconds: float) -> None:
+        """Mark the tags as recently written for `seconds`"""
+
+    async def held(self, tags: List[str]) -> bool:
+        """True while any of the tags is marked as recently written"""
+
+    async def clear(self) -> None:
+        """Drop every entry"""
+
+    async def close(self) -> None:
+        """Release connections"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Bounded in-process cache evicting the least recently used entry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # key -> (time.monotonic() deadline, body), least recently used first
+        self.entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self.tag_generations: Dict[str, int] = {}
+        # tag -> time.monotonic() until which it counts as recently written
+        self.holds: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def generations(self, tags: List[str]) -> List[int]:
+        return [self.tag_generations.get(tag, 0) for tag in tags]
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self.tag_generations[tag] = self.tag_generations.get(tag, 0) + 1
+
+    async def hold(self, tags: Iterable[str], seconds: float) -> None:
+        until = time.monotonic() + seconds
+        for tag in tags:
+            self.holds[tag] = until
+
+    async def held(self, tags: List[str]) -> bool:
+        now = time.monotonic()
+        return any(self.holds.get(tag, 0) > now for tag in tags)
+
+    async def clear(self) -> None:
+        self.entries.clear()
+        self.tag_generations.clear()
+        self.holds.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by every worker through Redis, expiring entries with key TTLs"""
+
+    def __init__(self, url: str, prefix: str):
+        self.url = url
+        self.prefix = prefix
+        self._redis = None
+
+    def _client(self):
+        if self._redis is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError as e:
+                raise RuntimeError("RESPONSE_CACHE=redis requires the redis package") from e
+            self._redis = aioredis.from_url(self.url)
+        return self._redis
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _hold_key(self, tag: str) -> str:
+        return f"{self.prefix}hold:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client().get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client().set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def generations(self, tags: List[str]) -> List[int]:
+        values = await self._client().mget([self._tag_key(tag) for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        async with self._client().pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self._tag_key(tag))
+            await pipe.execute()
+
+    async def hold(self, tags: Iterable[str], seconds: float) -> None:
+        async with self._client().pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.set(self._hold_key(tag), 1, px=max(1, int(seconds * 1000)))
+            await pipe.execute()
+
+    async def held(self, tags: List[str]) -> bool:
+        return any(await self._client().mget([self._hold_key(tag) for tag in tags]))
+
+    async def clear(self) -> None:
+        client = self._client()
+        async for key in client.scan_iter(match=f"{self.prefix}*"):
+            await client.delete(key)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class ResponseCache:
+    """Caches JSON responses per URL until their TTL passes or one of their tags is invalidated"""
+
+    def __init__(self, backend: CacheBackend, ttl: float, replica_lag: float = 0.0):
+        self.backend = backend
+        self.ttl = ttl
+        # Seconds after an invalidation during which a replica may still lack the write
+        self.replica_lag = replica_lag
+
+    async def respond(
+        self,
+        request: Request,
+        tags: Iterable[str],
+        build: Callable[[], Awaitable[BaseModel]]
+    ) -> Response:
+        """
+        Serve the request from the cache, building and storing the response on a miss
+
+        Backend errors are logged and the response is built from the
+        database, so an unavailable Redis only costs the cache hit.
+        """
+        tags = sorted(tags)
+        key, body = None, None
+        try:
+            generations = await self.backend.generations(tags)
+            key = self._key(request, zip(tags, generations))
+            body = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e!r}")
+
+        cache_status = "HIT"
+        if body is None:
+            cache_status = "MISS"
+            body = (await build()).model_dump_json().encode()
+            if key is not None:
+                try:
+                    if not (self.replica_lag and await self.backend.held(tags)):
+                        await self.backend.set(key, body, self.ttl)
+                except Exception as e:
+                    logger.warning(f"Response cache store failed: {e!r}")
+
+        etag = _etag(body)
+        headers = {"ETag": etag, "Cache-Control": "no-cache", CACHE_STATUS_HEADER: cache_status}
+        if etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *tags: str) -> None:
+        """Drop every cached response depending on any of `tags`; call after committing the write"""
+        try:
+            await self.backend.bump(tags)
+            if self.replica_lag:
+                await self.backend.hold(tags, self.replica_lag)
+        except Exception as e:
+            # Stale responses live on until their TTL runs out
+            logger.warning(f"Response cache invalidation of {', '.join(tags)} failed: {e!r}")
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    @staticmethod
+    def _key(request: Request, generations: Iterable[Tuple[str, int]]) -> str:
+        query = "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items()))
+        versions = ",".join(f"{tag}:{generation}" for tag, generation in generations)
+        return f"{request.url.path}?{query}#{versions}"
+
+
+def create_response_cache() -> ResponseCache:
+    """Build the cache selected by settings.RESPONSE_CACHE"""
+    if settings.RESPONSE_CACHE == "redis":
+        backend = RedisCacheBackend(settings.REDIS_URL, settings.RESPONSE_CACHE_PREFIX)
+    else:
+        backend = MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    replica_lag = settings.READ_AFTER_WRITE_SECONDS if settings.DATABASE_READ_URL else 0.0
+    return ResponseCache(backend, settings.RESPONSE_CACHE_TTL, replica_lag)
+
+
+response_cache = create_response_cache()
@@ -25,6 +25,41 @@ class Settings(BaseSettings):
         default="sqlite:///./devdash.db",
         description="Database connection URL"
     )
+    DATABASE_READ_URL: str = Field(
+        default="",
+        description="Read replica serving the polled GET endpoints (empty: everything reads DATABASE_URL)"
+    )
+    READ_AFTER_WRITE_SECONDS: float = Field(
+        default=5.0,
+        description="Seconds a client's reads stay on the primary after it writes, to cover replica lag"
+    )
+    TIME_ORDERED_IDS: bool = Field(
+        default=True,
+        description="Generate time-ordered UUIDv7 primary keys instead of random UUIDv4"
+    )
+    DB_ECHO: bool = Field(default=False, description="Log every SQL statement")
+    DB_POOL_SIZE: int = Field(default=5, description="Connections kept open in the pool")
+    DB_MAX_OVERFLOW: int = Field(default=10, description="Connections opened beyond the pool size under load")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, description="Seconds to wait for a free connection")
+    DB_POOL_RECYCLE: int = Field(
+        default=1800,
+        description="Seconds after which a pooled connection is replaced (-1: never)"
+    )
+    DB_POOL_PRE_PING: bool = Field(default=True, description="Test pooled connections before handing them out")
+    SQLITE_JOURNAL_MODE: str = Field(
+        default="wal",
+        pattern="^(wal|delete|truncate|persist|memory|off)$",
+        description="SQLite journal mode (wal: readers do not block on the writer)"
+    )
+    SQLITE_SYNCHRONOUS: str = Field(
+        default="normal",
+        pattern="^(off|normal|full|extra)$",
+        description="SQLite fsync level (normal with WAL: survives app crashes, may lose the last commits on power loss)"
+    )
+    SQLITE_BUSY_TIMEOUT: int = Field(
+        default=5000,
+        description="Milliseconds a SQLite connection waits for a lock before failing with 'database is locked'"
+    )
 
     # JWT
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=15, description="Access token expiration")
@@ -39,7 +74,7 @@ class Settings(BaseSettings):
         description="GitHub OAuth redirect URI"
     )
 
-    # Redis (for Celery)
+    # Redis (for Celery, the WebSocket event broker and the response cache)
     REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Redis connection URL")
 
     # Cloudflare R2 (optional)
@@ -52,6 +87,67 @@ class Settings(BaseSettings):
     CLAUDE_CODE_PATH: str = Field(default="", description="Path to Claude Code CLI")
     GITHUB_PAT: str = Field(default="", description="GitHub Personal Access Token")
 
+    # WebSocket fan-out
+    WS_SEND_QUEUE_SIZE: int = Field(
+        default=256,
+        description="Messages buffered per WebSocket client before it is evicted as too slow"
+    )
+    WS_SEND_TIMEOUT: float = Field(
+        default=10.0,
+        description="Seconds a single WebSocket send may take before the client is evicted"
+    )
+    WS_TIMER_TICK_INTERVAL: float = Field(
+        default=1.0,
+        ge=0,
+        description="Seconds between timer:tick frames with running timers' elapsed time (0: no ticks)"
+    )
+
+    WS_BROKER: str = Field(
+        default="memory",
+        pattern="^(memory|redis)$",
+        description="Pub/sub backend sharing WebSocket events between processes (memory: single process)"
+    )
+    WS_BROKER_CHANNEL: str = Field(
+        default="devdash:ws",
+        description="Redis channel carrying WebSocket events when WS_BROKER=redis"
+    )
+
+    # Serialization
+    FAST_JSON_RESPONSES: bool = Field(
+        default=False,
+        description="Serialize large list responses straight from the ORM with orjson, skipping validation"
+    )
+
+    # Analytics response cache
+    RESPONSE_CACHE: str = Field(
+        default="memory",
+        pattern="^(memory|redis)$",
+        description="Response cache backend for analytics endpoints (memory: per process)"
+    )
+    RESPONSE_CACHE_TTL: float = Field(
+        default=300.0,
+        description="Seconds a cached response is served before being rebuilt even without writes"
+    )
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        description="Responses kept per process by the memory backend before evicting the least recently used"
+    )
+    RESPONSE_CACHE_PREFIX: str = Field(
+        default="devdash:cache:",
+        description="Key prefix for cached responses when RESPONSE_CACHE=redis"
+    )
+
+    # Running timers
+    TIMER_REGISTRY: str = Field(
+        default="memory",
+        pattern="^(memory|redis)$",
+        description="Where running timers are kept between starts and stops (memory: single process)"
+    )
+    TIMER_REGISTRY_KEY: str = Field(
+        default="devdash:timers",
+        description="Redis hash holding running timers when TIMER_REGISTRY=redis"
+    )
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = Field(default=100, description="API rate limit per minute")
 
@@ -1,39 +1,130 @@
 """
 Database configuration and session management
+
+The engine is configured from Settings: pool sizing, recycling and
+pre-ping for server databases, and on SQLite the journal mode, sync level
+and busy timeout, applied to every new connection. WAL lets readers carry on
+while a write is in progress, and the busy timeout makes concurrent writers
+queue for the lock instead of failing with "database is locked".
+
+With DATABASE_READ_URL set, get_read_db() sessions read from a replica
+instead, except for clients that have just written (core.replica).
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.config import Settings, settings
+from core.replica import reads_from_primary
+
+# Async drivers for the synchronous URLs accepted in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def get_async_url(url: str) -> str:
+    """
+    Convert a database URL to its async driver equivalent
+
+    URLs that already name a driver (e.g. sqlite+aiosqlite://) are returned unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme or scheme not in ASYNC_DRIVERS:
+        return url
+    return f"{ASYNC_DRIVERS[scheme]}{sep}{rest}"
+
+
+def engine_options(url: str, config: Settings = settings) -> Dict[str, Any]:
+    """Keyword arguments for create_async_engine(url) from the DB_* settings"""
+    options: Dict[str, Any] = {"echo": config.DB_ECHO}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # In-memory SQLite keeps a single connection, not a sized pool
+        if parsed.database in (None, "", ":memory:"):
+            return options
+        # aiosqlite otherwise opens a connection, and its thread, per checkout
+        options["poolclass"] = AsyncAdaptedQueuePool
+
+    options.update(
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    return options
 
-from core.config import settings
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG
-)
+def apply_sqlite_pragmas(engine: AsyncEngine, config: Settings = settings) -> None:
+    """Set the SQLITE_* PRAGMAs on each connection the engine opens"""
+    pragmas = [
+        f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT)}",
+    ]
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_database_engine(url: str, config: Settings = settings) -> AsyncEngine:
+    """Create the async engine for a DATABASE_URL, configured from `config`"""
+    async_url = get_async_url(url)
+    engine = create_async_engine(async_url, **engine_options(async_url, config))
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine, config)
+    return engine
+
+
+# Create SQLAlchemy async engine
+engine = create_database_engine(settings.DATABASE_URL)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+# The replica, or the primary again when there is none
+read_engine = create_database_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+ReadSessionLocal = async_sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False)
 
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency for FastAPI endpoints
 
     Usage:
         @app.get("/items")
-        def get_items(db: Session = Depends(get_db)):
-            return db.query(Item).all()
+        async def get_items(db: AsyncSession = Depends(get_db)):
+            result = await db.execute(select(Item))
+            return result.scalars().all()
+    """
+    async with SessionLocal() as db:
+        yield db
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session dependency for GET endpoints that can be served by the replica
+
+    Reads from the primary when no replica is configured, or when the client
+    wrote within the last READ_AFTER_WRITE_SECONDS and the replica may not
+    have its change yet.
     """
-    db = SessionLocal()
-    try:
+    session_factory = SessionLocal if reads_from_primary(request) else ReadSessionLocal
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
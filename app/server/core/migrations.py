@@ -0,0 +1,44 @@
+"""
+Schema migrations at application startup
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+from core.search import ensure_search_index, verify_search_index
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+# Revision matching the schema that Base.metadata.create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def get_alembic_config(connection: Connection = None) -> Config:
+    """Build an Alembic config, optionally bound to an open connection"""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def run_migrations(connection: Connection) -> None:
+    """
+    Upgrade the database to the latest revision
+
+    Databases created by create_all before migrations were introduced have
+    tables but no alembic_version; they are stamped at the baseline first.
+    """
+    config = get_alembic_config(connection)
+    tables = set(inspect(connection).get_table_names())
+
+    if "tasks" in tables and "alembic_version" not in tables:
+        ensure_search_index(connection)
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
+    verify_search_index(connection)
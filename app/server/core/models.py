@@ -2,32 +2,29 @@
 SQLAlchemy database models
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, Integer, Boolean, Date, DateTime, ForeignKey, Text, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 from datetime import datetime
 
 from core.database import Base
-
-
-def generate_uuid():
-    """Generate UUID as string for compatibility with SQLite"""
-    return str(uuid.uuid4())
+from core.ids import NIL_UUID, UUIDKey, generate_uuid
+from core.ranking import FIRST_RANK
+from core.search import register_search_index
 
 
 class User(Base):
     """User model"""
     __tablename__ = "users"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
+    id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     github_id = Column(Integer, unique=True, nullable=True, index=True)
     username = Column(String(255), nullable=False)
     email = Column(String(255), nullable=True)
     avatar_url = Column(String(500), nullable=True)
     github_token = Column(Text, nullable=True)  # Encrypted
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now(), index=True)
 
     # Relationships
     tasks_created = relationship("Task", back_populates="creator", foreign_keys="Task.created_by")
@@ -43,17 +40,18 @@ class Task(Base):
     """Task model for Kanban board"""
     __tablename__ = "tasks"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
+    id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     title = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(String(50), nullable=False, default="backlog", index=True)
     # Status values: backlog, todo, in_progress, in_review, done
-    assignee_id = Column(String(36), ForeignKey("users.id"), nullable=True)
-    created_by = Column(String(36), ForeignKey("users.id"), nullable=False)
+    assignee_id = Column(UUIDKey, ForeignKey("users.id"), nullable=True, index=True)
+    created_by = Column(UUIDKey, ForeignKey("users.id"), nullable=False)
     labels = Column(JSON, nullable=True, default=list)  # List of labels
-    position = Column(Integer, nullable=True)  # For ordering within column
+    position = Column(Integer, nullable=True)  # Legacy ordering, superseded by rank
+    rank = Column(String(64), nullable=False, default=FIRST_RANK, server_default=FIRST_RANK)  # Fractional order within column (core.ranking)
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now(), index=True)
 
     # Relationships
     creator = relationship("User", back_populates="tasks_created", foreign_keys=[created_by])
@@ -61,36 +59,95 @@ class Task(Base):
     time_entries = relationship("TimeEntry", back_populates="task")
     sprint_tasks = relationship("SprintTask", back_populates="task")
 
+    __table_args__ = (
+        # Kanban column listing and neighbour lookups: WHERE status = ? ORDER BY rank
+        Index("ix_tasks_status_rank", "status", "rank"),
+    )
+
     def __repr__(self):
         return f"<Task(id={self.id}, title={self.title}, status={self.status})>"
 
 
+register_search_index(Task.__table__)
+
+
+class TaskStatusEvent(Base):
+    """Append-only log of task status changes, for burndown and cycle time"""
+    __tablename__ = "task_status_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # No foreign key: the history outlives deleted tasks, like their sprint_tasks rows
+    task_id = Column(UUIDKey, nullable=False)
+    from_status = Column(String(50), nullable=True)  # None for the status a task was created with
+    to_status = Column(String(50), nullable=False)
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Lets an event be added for a task that has no ID until it is flushed
+    task = relationship("Task", primaryjoin="foreign(TaskStatusEvent.task_id) == Task.id")
+
+    __table_args__ = (
+        # A task's history in order, and the per-sprint burndown join
+        Index("ix_task_status_events_task_id_changed_at", "task_id", "changed_at"),
+    )
+
+    def __repr__(self):
+        return f"<TaskStatusEvent(task_id={self.task_id}, {self.from_status} -> {self.to_status})>"
+
+
 class TimeEntry(Base):
     """Time tracking entry"""
     __tablename__ = "time_entries"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    task_id = Column(String(36), ForeignKey("tasks.id"), nullable=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    task_id = Column(UUIDKey, ForeignKey("tasks.id"), nullable=True)
+    user_id = Column(UUIDKey, ForeignKey("users.id"), nullable=False)
     start_time = Column(DateTime, nullable=False, default=datetime.utcnow)
     end_time = Column(DateTime, nullable=True)
     duration = Column(Integer, nullable=True)  # Duration in seconds
     is_running = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now(), index=True)
 
     # Relationships
     task = relationship("Task", back_populates="time_entries")
     user = relationship("User", back_populates="time_entries")
 
+    __table_args__ = (
+        # Running timer lookup
+        Index("ix_time_entries_user_id_is_running", "user_id", "is_running"),
+        # At most one running timer per user, however timer requests interleave
+        Index(
+            "ix_time_entries_one_running_per_user", "user_id", unique=True,
+            sqlite_where=text("is_running"), postgresql_where=text("is_running")
+        ),
+        # Entry lists and summaries over a date range
+        Index("ix_time_entries_user_id_start_time", "user_id", "start_time"),
+    )
+
     def __repr__(self):
         return f"<TimeEntry(id={self.id}, task_id={self.task_id}, duration={self.duration})>"
 
 
+class TimeRollup(Base):
+    """Seconds logged per user, task and day, kept up to date as time entries are written (core.rollups)"""
+    __tablename__ = "time_rollups"
+
+    # Key order serves the summary's WHERE user_id = ? AND day BETWEEN ? AND ?
+    user_id = Column(UUIDKey, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # Date of the entries' start_time
+    task_id = Column(UUIDKey, primary_key=True, default=NIL_UUID)  # Nil UUID for time not logged against a task
+    duration = Column(Integer, nullable=False, default=0)  # Seconds
+    entries = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TimeRollup(user_id={self.user_id}, day={self.day}, duration={self.duration})>"
+
+
 class Sprint(Base):
     """Sprint model for sprint planning"""
     __tablename__ = "sprints"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
+    id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
@@ -98,6 +155,7 @@ class Sprint(Base):
     status = Column(String(50), nullable=False, default="planning")
     # Status values: planning, active, completed
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now(), index=True)
 
     # Relationships
     sprint_tasks = relationship("SprintTask", back_populates="sprint")
@@ -106,12 +164,27 @@ class Sprint(Base):
         return f"<Sprint(id={self.id}, name={self.name}, status={self.status})>"
 
 
+class SprintMetrics(Base):
+    """Velocity of a completed sprint, snapshotted when it is marked completed"""
+    __tablename__ = "sprint_metrics"
+
+    sprint_id = Column(UUIDKey, ForeignKey("sprints.id"), primary_key=True)
+    sprint_name = Column(String(255), nullable=False)
+    end_date = Column(DateTime, nullable=False, index=True)  # Velocity reads the latest N
+    tasks_completed = Column(Integer, nullable=False, default=0)
+    story_points = Column(Integer, nullable=False, default=0)  # Points of the completed tasks
+    completed_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+
+    def __repr__(self):
+        return f"<SprintMetrics(sprint_id={self.sprint_id}, points={self.story_points})>"
+
+
 class SprintTask(Base):
     """Association table for Sprint and Task with story points"""
     __tablename__ = "sprint_tasks"
 
-    sprint_id = Column(String(36), ForeignKey("sprints.id"), primary_key=True)
-    task_id = Column(String(36), ForeignKey("tasks.id"), primary_key=True)
+    sprint_id = Column(UUIDKey, ForeignKey("sprints.id"), primary_key=True)
+    task_id = Column(UUIDKey, ForeignKey("tasks.id"), primary_key=True)
     story_points = Column(Integer, nullable=True)
 
     # Relationships
@@ -126,19 +199,24 @@ class GitHubPR(Base):
     """GitHub Pull Request tracking"""
     __tablename__ = "github_prs"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
+    id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     pr_number = Column(Integer, nullable=False)
     repository = Column(String(255), nullable=False, index=True)
     title = Column(String(500), nullable=True)
-    author_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    author_id = Column(UUIDKey, ForeignKey("users.id"), nullable=True)
     status = Column(String(50), nullable=True)  # open, closed, merged
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     merged_at = Column(DateTime, nullable=True)
 
     # Relationships
     author = relationship("User", back_populates="github_prs")
 
+    __table_args__ = (
+        # A user's open PRs, newest first
+        Index("ix_github_prs_author_id_status_created_at", "author_id", "status", "created_at"),
+    )
+
     def __repr__(self):
         return f"<GitHubPR(id={self.id}, repo={self.repository}, pr={self.pr_number})>"
 
@@ -147,8 +225,8 @@ class GitHubSyncLog(Base):
     """GitHub synchronization log"""
     __tablename__ = "github_sync_log"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDKey, ForeignKey("users.id"), nullable=True)
     sync_type = Column(String(50), nullable=False)  # prs, commits, issues
     status = Column(String(50), nullable=False)  # success, failed
     synced_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
@@ -0,0 +1,54 @@
+"""
+Calendar bucketing for time series computed in SQL
+
+period_start() truncates a datetime column to the start of its day, ISO
+week (Monday) or month in the database, so breakdowns can GROUP BY it
+instead of loading rows into Python; hours_between() and seconds_between()
+measure durations the same way.
+"""
+
+from sqlalchemy import Date, Integer, cast, func, literal_column
+
+GRANULARITIES = ("day", "week", "month")
+GRANULARITY_PATTERN = f"^({'|'.join(GRANULARITIES)})$"
+
+# SQLite date() modifiers truncating to each period; 'weekday 0' moves forward
+# to Sunday, so stepping back six days lands on that week's Monday
+_SQLITE_MODIFIERS = {
+    "day": (),
+    "week": ("weekday 0", "-6 days"),
+    "month": ("start of month",),
+}
+
+
+def period_start(column, granularity: str, dialect: str):
+    """SQL expression for the first day of the period containing `column`"""
+    if dialect == "postgresql":
+        return cast(func.date_trunc(granularity, column), Date)
+    if dialect == "sqlite":
+        # Inlined rather than bound so SELECT and GROUP BY render the same expression
+        modifiers = (literal_column(f"'{modifier}'") for modifier in _SQLITE_MODIFIERS[granularity])
+        return func.date(column, *modifiers)
+    if granularity != "day":
+        raise ValueError(f"{granularity} buckets are not supported on {dialect}")
+    return cast(column, Date)
+
+
+def hours_between(start, end, dialect: str):
+    """SQL expression for the hours from `start` to `end`"""
+    if dialect == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 24
+    return func.extract("epoch", end - start) / 3600
+
+
+def seconds_between(start, end, dialect: str):
+    """SQL expression for the whole seconds from `start` to `end`, truncated like int(timedelta.total_seconds())"""
+    if dialect == "sqlite":
+        # julianday() is a float day count; round off its error before truncating
+        return cast(func.round((func.julianday(end) - func.julianday(start)) * 86400, 3), Integer)
+    return cast(func.trunc(func.extract("epoch", end - start)), Integer)
+
+
+def period_key(value) -> str:
+    """ISO date key for a period_start() result (a string on SQLite, a date elsewhere)"""
+    return value if isinstance(value, str) else value.isoformat()
@@ -0,0 +1,145 @@
+"""
+Pub/sub backends that carry WebSocket events between server processes
+
+ConnectionManager delivers an event to its own clients directly and hands
+it to a broker, which forwards it to every other process; each process then
+fans it out to its own subscribers. With several uvicorn workers (or hosts)
+behind a load balancer, clients see events no matter which worker accepted
+their connection.
+
+- InMemoryBroker: processes sharing an InMemoryHub see each other's events.
+  A broker with its own hub (the default) has no peers, which is the
+  single-process setup, and lets tests run several "workers" in one process.
+- RedisBroker: Redis PUBLISH/SUBSCRIBE on one channel, for real deployments.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Callable, List, Optional, Set
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Called with (topics, serialized message); topics None means every connection
+Deliver = Callable[[Optional[List[str]], str], None]
+
+# Seconds to wait before resubscribing after the Redis connection drops
+REDIS_RECONNECT_DELAY = 1.0
+
+
+class Broker:
+    """Forwards serialized events to the other processes' ConnectionManagers"""
+
+    async def start(self, deliver: Deliver) -> None:
+        """Start passing events published by other processes to `deliver`"""
+
+    async def publish(self, topics: Optional[List[str]], text: str) -> None:
+        """Send an event to every other process"""
+
+    async def close(self) -> None:
+        """Stop receiving events and release connections"""
+
+
+class InMemoryHub:
+    """Connects InMemoryBrokers that stand in for separate processes"""
+
+    def __init__(self):
+        self.brokers: Set["InMemoryBroker"] = set()
+
+
+class InMemoryBroker(Broker):
+    """Broker for one process, or for several simulated ones sharing a hub"""
+
+    def __init__(self, hub: Optional[InMemoryHub] = None):
+        self.hub = hub or InMemoryHub()
+        self.deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self.deliver = deliver
+        self.hub.brokers.add(self)
+
+    async def publish(self, topics: Optional[List[str]], text: str) -> None:
+        for broker in list(self.hub.brokers):
+            if broker is not self:
+                broker.deliver(topics, text)
+
+    async def close(self) -> None:
+        self.hub.brokers.discard(self)
+        self.deliver = None
+
+
+class RedisBroker(Broker):
+    """
+    Broker over a Redis pub/sub channel
+
+    Every process subscribes to the channel and skips the events it
+    published itself, which it has already delivered locally.
+    """
+
+    def __init__(self, url: str, channel: str):
+        self.url = url
+        self.channel = channel
+        # Identifies this process's own events on the shared channel
+        self.origin = uuid.uuid4().hex
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("WS_BROKER=redis requires the redis package") from e
+
+        self._redis = aioredis.from_url(self.url)
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        # Subscribe before returning so no event published after startup is missed
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(pubsub, deliver))
+
+    async def publish(self, topics: Optional[List[str]], text: str) -> None:
+        envelope = {"origin": self.origin, "topics": topics, "text": text}
+        await self._redis.publish(self.channel, json.dumps(envelope, separators=(",", ":")))
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self, pubsub, deliver: Deliver) -> None:
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        envelope = json.loads(message["data"])
+                    except ValueError:
+                        logger.warning("Ignoring malformed event on the WebSocket channel")
+                        continue
+                    if envelope.get("origin") != self.origin:
+                        deliver(envelope.get("topics"), envelope["text"])
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket event subscription lost, resubscribing: {e!r}")
+                await asyncio.sleep(REDIS_RECONNECT_DELAY)
+                try:
+                    await pubsub.subscribe(self.channel)
+                except Exception:
+                    # Still down; listen() fails again and we retry after the delay
+                    pass
+
+
+def create_broker() -> Broker:
+    """Build the broker selected by settings.WS_BROKER"""
+    if settings.WS_BROKER == "redis":
+        return RedisBroker(settings.REDIS_URL, settings.WS_BROKER_CHANNEL)
+    return InMemoryBroker()
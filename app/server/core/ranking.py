@@ -0,0 +1,104 @@
+"""
+Fractional rank keys for ordering Kanban cards
+
+A rank is a base-36 string read as a fraction (0.d1d2d3...). Between any two
+ranks there is always another one, so moving a card between two neighbours
+only rewrites the moved card. Ranks use lowercase letters and digits only,
+which sort the same way under byte-wise and locale-aware collations, and
+never end in "0" so there is always room before them.
+"""
+
+from typing import List, Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Appending or prepending steps by STEP in a WIDTH-digit space, so cards added
+# at either end of a column keep short ranks; only inserts between two
+# neighbours bisect and make ranks longer
+WIDTH = 12
+STEP = BASE ** 6
+
+# Rank of the first card in an empty column
+FIRST_RANK = DIGITS[BASE // 2]
+
+# Ranks longer than this are compacted by rebalancing the column
+MAX_RANK_LENGTH = 32
+
+
+def _digit(rank: str, index: int) -> int:
+    """Digit value at `index`, treating missing trailing digits as 0"""
+    return DIGITS.index(rank[index]) if index < len(rank) else 0
+
+
+def _to_int(rank: str) -> int:
+    """Integer value of the first WIDTH digits of a rank"""
+    value = 0
+    for index in range(WIDTH):
+        value = value * BASE + _digit(rank, index)
+    return value
+
+
+def _from_int(value: int) -> str:
+    """Inverse of _to_int, without trailing zeros"""
+    digits = []
+    for _ in range(WIDTH):
+        value, remainder = divmod(value, BASE)
+        digits.append(DIGITS[remainder])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Return a rank that sorts strictly between `before` and `after`
+
+    None means "start of column" for `before` and "end of column" for `after`.
+
+    Raises:
+        ValueError: If before does not sort strictly before after
+    """
+    if before is None and after is None:
+        return FIRST_RANK
+
+    if after is None:
+        value = _to_int(before) + STEP
+        return _from_int(value) if value < BASE ** WIDTH else _midpoint(before, None)
+
+    if before is None:
+        value = _to_int(after) - STEP
+        return _from_int(value) if value > 0 else _midpoint("", after)
+
+    if before >= after:
+        raise ValueError(f"No rank between {before!r} and {after!r}")
+    return _midpoint(before, after)
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    if high is not None:
+        # Keep the shared prefix and split the remainder
+        prefix = 0
+        while prefix < len(high) and _digit(low, prefix) == DIGITS.index(high[prefix]):
+            prefix += 1
+        if prefix:
+            return high[:prefix] + _midpoint(low[prefix:], high[prefix:])
+
+    low_digit = _digit(low, 0)
+    high_digit = DIGITS.index(high[0]) if high else BASE
+
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+
+    # Adjacent first digits: a longer `high` can be cut short, otherwise go one digit deeper
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def evenly_spaced(count: int) -> List[str]:
+    """Return `count` ascending ranks centred in the key space, as used when rebalancing"""
+    if count <= 0:
+        return []
+
+    step = min(STEP, BASE ** WIDTH // (count + 1))
+    start = (BASE ** WIDTH - step * (count - 1)) // 2
+    return [_from_int(start + i * step) for i in range(count)]
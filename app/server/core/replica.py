@@ -0,0 +1,57 @@
+"""
+Read-your-writes routing between the primary database and a read replica
+
+With settings.DATABASE_READ_URL set, the GET endpoints that dashboards poll
+read through get_read_db() from the replica, which trails the primary by its
+replication lag. So that a client never reads back a page missing the change
+it just made, every successful write response sets a cookie naming when the
+replica can be trusted again, and until then get_read_db() gives that client
+the primary.
+"""
+
+import math
+import time
+
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+
+PRIMARY_COOKIE = "devdash_read_primary_until"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True while the client's last write may not have reached the replica yet"""
+    try:
+        return float(request.cookies[PRIMARY_COOKIE]) > time.time()
+    except (KeyError, ValueError):
+        return False
+
+
+def _primary_cookie(window: float) -> bytes:
+    until = time.time() + window
+    return (
+        f"{PRIMARY_COOKIE}={until:.3f}; Max-Age={math.ceil(window)}; Path=/; HttpOnly; SameSite=Lax"
+    ).encode("latin-1")
+
+
+class ReadYourWritesMiddleware:
+    """Sets the primary-read cookie on successful responses to writes while a replica is configured"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not settings.DATABASE_READ_URL:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_marking_writer(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = _primary_cookie(settings.READ_AFTER_WRITE_SECONDS)
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie)]}
+            await send(message)
+
+        await self.app(scope, receive, send_marking_writer)
@@ -0,0 +1,101 @@
+"""
+Daily time rollups
+
+time_rollups holds the seconds logged per (user, day, task), so summaries
+over a date range read one row per day and task instead of every entry.
+Routers call record_time() (or record_times() for bulk imports) in the same
+transaction that gives entries their duration; rebuild_time_rollups()
+recomputes the table from time_entries for backfills and repairs:
+
+    python -m core.rollups
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from sqlalchemy import create_engine, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.ids import NIL_UUID, UUIDKey
+from core.models import TimeEntry, TimeRollup
+from core.periods import period_start
+
+# Stored in place of a NULL task_id, which a primary key column cannot hold
+NO_TASK = NIL_UUID
+
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+async def record_time(db: AsyncSession, entry: TimeEntry) -> None:
+    """Add a finished entry's duration to its day's rollup; no-op while it has none"""
+    await record_times(db, [{
+        "user_id": entry.user_id,
+        "start_time": entry.start_time,
+        "task_id": entry.task_id,
+        "duration": entry.duration,
+    }])
+
+
+async def record_times(db: AsyncSession, entries: Iterable[Mapping]) -> None:
+    """
+    Add many entries (mappings of user_id, start_time, task_id and duration)
+    to their rollups, with one upsert per (user, day, task) they fall in;
+    entries without a duration are skipped
+    """
+    dialect = db.bind.dialect.name
+    if dialect not in _UPSERT_INSERTS:
+        raise NotImplementedError(f"Time rollups are not supported on {dialect}")
+
+    totals: Dict[Tuple[str, date, str], List[int]] = {}
+    for entry in entries:
+        if entry["duration"] is None:
+            continue
+        key = (entry["user_id"], entry["start_time"].date(), entry["task_id"] or NO_TASK)
+        total = totals.setdefault(key, [0, 0])
+        total[0] += entry["duration"]
+        total[1] += 1
+    if not totals:
+        return
+
+    statement = _UPSERT_INSERTS[dialect](TimeRollup)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[TimeRollup.user_id, TimeRollup.day, TimeRollup.task_id],
+            set_={
+                "duration": TimeRollup.duration + statement.excluded.duration,
+                "entries": TimeRollup.entries + statement.excluded.entries,
+            }
+        ),
+        [
+            {"user_id": user_id, "day": day, "task_id": task_id, "duration": duration, "entries": count}
+            for (user_id, day, task_id), (duration, count) in totals.items()
+        ]
+    )
+
+
+def rebuild_time_rollups(conn: Connection) -> int:
+    """Recompute every rollup from time_entries and return the number of rollup rows"""
+    day = period_start(TimeEntry.start_time, "day", conn.dialect.name)
+    task_id = func.coalesce(TimeEntry.task_id, literal(NO_TASK, UUIDKey))
+
+    conn.execute(delete(TimeRollup))
+    conn.execute(insert(TimeRollup).from_select(
+        ["user_id", "day", "task_id", "duration", "entries"],
+        select(TimeEntry.user_id, day, task_id, func.sum(TimeEntry.duration), func.count())
+        .where(TimeEntry.duration.isnot(None))
+        .group_by(TimeEntry.user_id, day, task_id)
+    ))
+    return conn.execute(select(func.count()).select_from(TimeRollup)).scalar_one()
+
+
+if __name__ == "__main__":
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        print(f"Rebuilt {rebuild_time_rollups(conn)} time rollups")
+    engine.dispose()
@@ -2,53 +2,84 @@
 Analytics router - Team productivity metrics and visualizations
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 
-from core.database import get_db
+from core.cache import SPRINTS_TAG, TASKS_TAG, TIME_TAG, response_cache
+from core.database import get_read_db
+from core.periods import hours_between, period_key, period_start
 from core.schemas import (
+    VelocityDataPoint,
     VelocityResponse,
+    BurndownDataPoint,
     BurndownResponse,
     AnalyticsSummary
 )
-from core.models import Task, TimeEntry, Sprint
+from core.models import Task, TaskStatusEvent, TimeRollup, Sprint, SprintMetrics, SprintTask
 
 router = APIRouter()
 
 
 @router.get("/velocity", response_model=VelocityResponse)
 async def get_velocity_data(
+    request: Request,
     sprint_count: int = Query(default=6, ge=1, le=20),
-    db: Session = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_read_db)
+) -> Response:
     """
     Get sprint velocity data
 
-    Returns velocity (tasks completed and story points) for last N sprints
+    Returns velocity (tasks completed and story points) for the last N
+    completed sprints, oldest first, read from the snapshots taken when each
+    sprint was completed. The average is in story points per sprint.
     """
-    # TODO: Implement velocity calculation
-    # 1. Get last N completed sprints
-    # 2. Calculate tasks completed per sprint
-    # 3. Calculate story points per sprint
-    # 4. Calculate average velocity
-    # 5. Return data points for charting
+    return await response_cache.respond(request, (SPRINTS_TAG,), lambda: _velocity(db, sprint_count))
 
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Velocity analytics not yet implemented"
+
+async def _velocity(db: AsyncSession, sprint_count: int) -> VelocityResponse:
+    result = await db.execute(
+        select(SprintMetrics).order_by(SprintMetrics.end_date.desc()).limit(sprint_count)
+    )
+    metrics = result.scalars().all()[::-1]
+
+    data_points = [
+        VelocityDataPoint(
+            sprint_name=sprint.sprint_name,
+            tasks_completed=sprint.tasks_completed,
+            story_points=sprint.story_points,
+            date=sprint.end_date
+        )
+        for sprint in metrics
+    ]
+    average_velocity = (
+        sum(point.story_points for point in data_points) / len(data_points) if data_points else 0.0
     )
 
+    return VelocityResponse(data_points=data_points, average_velocity=average_velocity)
+
 
 @router.get("/burndown/{sprint_id}", response_model=BurndownResponse)
-async def get_burndown_data(sprint_id: str, db: Session = Depends(get_db)):
+async def get_burndown_data(
+    request: Request,
+    sprint_id: str,
+    db: AsyncSession = Depends(get_read_db)
+) -> Response:
     """
     Get burndown chart data for a sprint
 
-    Returns remaining story points per day throughout the sprint
+    Returns remaining story points at the end of each day of the sprint,
+    replayed from the task status history, next to the ideal straight line.
     """
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
+    return await response_cache.respond(
+        request, (SPRINTS_TAG, TASKS_TAG), lambda: _burndown(db, sprint_id)
+    )
+
+
+async def _burndown(db: AsyncSession, sprint_id: str) -> BurndownResponse:
+    sprint = await db.get(Sprint, sprint_id)
 
     if not sprint:
         raise HTTPException(
@@ -56,24 +87,58 @@ async def get_burndown_data(sprint_id: str, db: Session = Depends(get_db)):
             detail=f"Sprint with ID {sprint_id} not found"
         )
 
-    # TODO: Implement burndown calculation
-    # 1. Get all tasks in sprint
-    # 2. Calculate total story points
-    # 3. For each day in sprint, calculate remaining points
-    # 4. Calculate ideal burndown line
-    # 5. Return data points for charting
-
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Burndown analytics not yet implemented"
+    points = func.coalesce(SprintTask.story_points, 0)
+    result = await db.execute(
+        select(func.coalesce(func.sum(points), 0)).where(SprintTask.sprint_id == sprint_id)
+    )
+    total_points = result.scalar_one()
+
+    # Points entering (+) or leaving (-) done per day, from the sprint tasks'
+    # status history, then a running total of the points done at each day's end
+    day = period_start(TaskStatusEvent.changed_at, "day", db.bind.dialect.name)
+    done_delta = (
+        case((TaskStatusEvent.to_status == "done", points), else_=0)
+        - case((TaskStatusEvent.from_status == "done", points), else_=0)
     )
+    daily = (
+        select(day.label("day"), func.sum(done_delta).label("delta"))
+        .select_from(TaskStatusEvent)
+        .join(SprintTask, SprintTask.task_id == TaskStatusEvent.task_id)
+        .where(SprintTask.sprint_id == sprint_id)
+        .group_by(day)
+        .subquery()
+    )
+    result = await db.execute(
+        select(daily.c.day, func.sum(daily.c.delta).over(order_by=daily.c.day))
+        .order_by(daily.c.day)
+    )
+    done_by_day = [(period_key(day), done) for day, done in result.all()]
+
+    days = [
+        sprint.start_date.date() + timedelta(days=offset)
+        for offset in range((sprint.end_date.date() - sprint.start_date.date()).days + 1)
+    ]
+    data_points = []
+    done, index = 0, 0
+    for offset, current in enumerate(days):
+        while index < len(done_by_day) and done_by_day[index][0] <= current.isoformat():
+            done = done_by_day[index][1]
+            index += 1
+        ideal = total_points * (1 - offset / (len(days) - 1)) if len(days) > 1 else 0
+        data_points.append(BurndownDataPoint(
+            date=datetime.combine(current, time.min),
+            remaining_points=total_points - done,
+            ideal_remaining=round(ideal)
+        ))
+
+    return BurndownResponse(sprint_id=sprint.id, sprint_name=sprint.name, data_points=data_points)
 
 
 @router.get("/commits")
 async def get_commit_frequency(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get commit frequency data
@@ -103,7 +168,7 @@ async def get_commit_frequency(
 async def get_pr_metrics(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get PR cycle time metrics
@@ -133,7 +198,7 @@ async def get_pr_metrics(
 async def get_team_activity(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get team activity feed
@@ -159,35 +224,53 @@ async def get_team_activity(
 
 
 @router.get("/summary", response_model=AnalyticsSummary)
-async def get_analytics_summary(db: Session = Depends(get_db)):
+async def get_analytics_summary(request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
     """
     Get overall analytics summary
 
     Returns high-level metrics: total tasks, completed tasks, time logged, etc.
     """
-    # Count tasks by status
-    total_tasks = db.query(Task).count()
-    completed_tasks = db.query(Task).filter(Task.status == "done").count()
-    active_tasks = db.query(Task).filter(
-        Task.status.in_(["in_progress", "in_review"])
-    ).count()
-
-    # Calculate total time logged
-    time_entries = db.query(TimeEntry).filter(
-        TimeEntry.duration.isnot(None)
-    ).all()
-    total_time_logged = sum(entry.duration or 0 for entry in time_entries)
-
-    # TODO: Calculate average cycle time
-    # 1. Get completed tasks
-    # 2. Calculate time from created_at to when status became "done"
-    # 3. Return average in hours
-    average_cycle_time = None
+    return await response_cache.respond(request, (TASKS_TAG, TIME_TAG), lambda: _summary(db))
+
+
+async def _summary(db: AsyncSession) -> AnalyticsSummary:
+    # Task counts and total time logged (from the daily rollups) in a single round-trip
+    total_time_logged = (
+        select(func.coalesce(func.sum(TimeRollup.duration), 0))
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(
+            func.count(Task.id).label("total_tasks"),
+            func.coalesce(
+                func.sum(case((Task.status == "done", 1), else_=0)), 0
+            ).label("completed_tasks"),
+            func.coalesce(
+                func.sum(case((Task.status.in_(["in_progress", "in_review"]), 1), else_=0)), 0
+            ).label("active_tasks"),
+            total_time_logged.label("total_time_logged"),
+        ).select_from(Task)
+    )
+    totals = result.one()
+
+    # Average hours from creation to the last move into done, over done tasks
+    done_at = (
+        select(TaskStatusEvent.task_id, func.max(TaskStatusEvent.changed_at).label("done_at"))
+        .where(TaskStatusEvent.to_status == "done")
+        .group_by(TaskStatusEvent.task_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(func.avg(hours_between(Task.created_at, done_at.c.done_at, db.bind.dialect.name)))
+        .join(done_at, done_at.c.task_id == Task.id)
+        .where(Task.status == "done")
+    )
+    average_cycle_time = result.scalar_one()
 
     return AnalyticsSummary(
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        active_tasks=active_tasks,
-        total_time_logged=total_time_logged,
+        total_tasks=totals.total_tasks,
+        completed_tasks=totals.completed_tasks,
+        active_tasks=totals.active_tasks,
+        total_time_logged=totals.total_time_logged,
         average_cycle_time=average_cycle_time
     )
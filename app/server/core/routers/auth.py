@@ -3,7 +3,7 @@ Authentication router - GitHub OAuth and JWT token management
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
 from core.schemas import Token, UserResponse, GitHubOAuthCallback
@@ -12,7 +12,7 @@ router = APIRouter()
 
 
 @router.post("/github/callback", response_model=Token)
-async def github_oauth_callback(callback_data: GitHubOAuthCallback, db: Session = Depends(get_db)):
+async def github_oauth_callback(callback_data: GitHubOAuthCallback, db: AsyncSession = Depends(get_db)):
     """
     GitHub OAuth callback endpoint
 
@@ -59,7 +59,7 @@ async def logout():
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(db: Session = Depends(get_db)):
+async def get_current_user(db: AsyncSession = Depends(get_db)):
     """
     Get current authenticated user
     """
@@ -2,11 +2,14 @@
 GitHub router - GitHub integration for PRs, commits, and issues
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
+from core.conditional import conditional_get
 from core.database import get_db
+from core.ids import PLACEHOLDER_USER_ID
 from core.schemas import (
     GitHubPRResponse,
     GitHubSyncRequest,
@@ -18,7 +21,7 @@ router = APIRouter()
 
 
 @router.post("/connect", status_code=status.HTTP_200_OK)
-async def connect_github(db: Session = Depends(get_db)):
+async def connect_github(db: AsyncSession = Depends(get_db)):
     """
     Initialize GitHub OAuth connection
 
@@ -36,25 +39,32 @@ async def connect_github(db: Session = Depends(get_db)):
 
 
 @router.get("/prs", response_model=List[GitHubPRResponse])
-async def get_my_prs(db: Session = Depends(get_db)):
+async def get_my_prs(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """
     Get PRs created by the current user
 
-    Returns list of open PRs across all repositories
+    Returns list of open PRs across all repositories, answering 304 when
+    If-None-Match carries the current ETag
     """
+    not_modified = await conditional_get(request, response, db, GitHubPR)
+    if not_modified:
+        return not_modified
+
     # TODO: Get current user ID from JWT token
-    current_user_id = "placeholder-user-id"
+    current_user_id = PLACEHOLDER_USER_ID
 
-    prs = db.query(GitHubPR).filter(
-        GitHubPR.author_id == current_user_id,
-        GitHubPR.status == "open"
-    ).order_by(GitHubPR.created_at.desc()).all()
+    result = await db.execute(
+        select(GitHubPR).where(
+            GitHubPR.author_id == current_user_id,
+            GitHubPR.status == "open"
+        ).order_by(GitHubPR.created_at.desc())
+    )
 
-    return prs
+    return result.scalars().all()
 
 
 @router.get("/reviews", response_model=List[GitHubPRResponse])
-async def get_prs_to_review(db: Session = Depends(get_db)):
+async def get_prs_to_review(db: AsyncSession = Depends(get_db)):
     """
     Get PRs awaiting review from the current user
 
@@ -72,7 +82,7 @@ async def get_prs_to_review(db: Session = Depends(get_db)):
 
 
 @router.get("/commits")
-async def get_recent_commits(limit: int = 20, db: Session = Depends(get_db)):
+async def get_recent_commits(limit: int = 20, db: AsyncSession = Depends(get_db)):
     """
     Get recent commits across all repositories
 
@@ -90,7 +100,7 @@ async def get_recent_commits(limit: int = 20, db: Session = Depends(get_db)):
 
 
 @router.get("/issues")
-async def get_my_issues(db: Session = Depends(get_db)):
+async def get_my_issues(db: AsyncSession = Depends(get_db)):
     """
     Get issues assigned to the current user
 
@@ -110,7 +120,7 @@ async def get_my_issues(db: Session = Depends(get_db)):
 @router.post("/sync", response_model=GitHubSyncResponse)
 async def sync_github_data(
     sync_request: GitHubSyncRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Trigger manual GitHub data synchronization
@@ -118,7 +128,7 @@ async def sync_github_data(
     Syncs PRs, commits, and/or issues based on sync_type
     """
     # TODO: Get current user ID from JWT token
-    _ = "placeholder-user-id"  # Will be used when auth is implemented
+    _ = PLACEHOLDER_USER_ID  # Will be used when auth is implemented
 
     # TODO: Implement GitHub sync
     # 1. Validate user has GitHub token
@@ -134,7 +144,7 @@ async def sync_github_data(
 
 
 @router.post("/webhook")
-async def github_webhook(db: Session = Depends(get_db)):
+async def github_webhook(db: AsyncSession = Depends(get_db)):
     """
     GitHub webhook endpoint
 
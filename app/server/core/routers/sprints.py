@@ -2,35 +2,98 @@
 Sprints router - Sprint planning and management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from core.database import get_db
+from core.cache import SPRINTS_TAG, response_cache
+from core.conditional import conditional_get
+from core.config import settings
+from core.database import get_db, get_read_db
 from core.schemas import (
     SprintCreate,
     SprintUpdate,
     SprintResponse,
     SprintTaskCreate
 )
-from core.models import Sprint, Task, SprintTask
+from core.models import Sprint, SprintMetrics, Task, SprintTask
+from core.serialization import fast_json_response, serialize_sprint
 
 router = APIRouter()
 
 
+async def _get_sprint_or_404(db: AsyncSession, sprint_id: str) -> Sprint:
+    """Load a sprint, raising 404 if it does not exist"""
+    sprint = await db.get(Sprint, sprint_id)
+
+    if not sprint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sprint with ID {sprint_id} not found"
+        )
+
+    return sprint
+
+
+async def _sync_sprint_metrics(db: AsyncSession, sprint: Sprint, was_completed: bool) -> None:
+    """
+    Keep the sprint's velocity snapshot in step with its status
+
+    Completing a sprint records the tasks done and their story points at that
+    moment; reopening it drops the snapshot. Renaming or re-dating a completed
+    sprint only updates the copied name and end date.
+    """
+    if sprint.status != "completed":
+        if was_completed:
+            await db.execute(delete(SprintMetrics).where(SprintMetrics.sprint_id == sprint.id))
+        return
+
+    if was_completed:
+        metrics = await db.get(SprintMetrics, sprint.id)
+        if metrics:
+            metrics.sprint_name = sprint.name
+            metrics.end_date = sprint.end_date
+            return
+
+    result = await db.execute(
+        select(func.count(Task.id), func.coalesce(func.sum(SprintTask.story_points), 0))
+        .select_from(SprintTask)
+        .join(Task, Task.id == SprintTask.task_id)
+        .where(SprintTask.sprint_id == sprint.id, Task.status == "done")
+    )
+    tasks_completed, story_points = result.one()
+
+    await db.merge(SprintMetrics(
+        sprint_id=sprint.id,
+        sprint_name=sprint.name,
+        end_date=sprint.end_date,
+        tasks_completed=tasks_completed,
+        story_points=story_points
+    ))
+
+
 @router.get("/", response_model=List[SprintResponse])
-async def list_sprints(db: Session = Depends(get_db)):
+async def list_sprints(request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
     """
     List all sprints
 
-    Returns sprints ordered by start date (most recent first)
+    Returns sprints ordered by start date (most recent first), answering 304
+    when If-None-Match carries the current ETag
     """
-    sprints = db.query(Sprint).order_by(Sprint.start_date.desc()).all()
+    not_modified = await conditional_get(request, response, db, Sprint)
+    if not_modified:
+        return not_modified
+
+    result = await db.execute(select(Sprint).order_by(Sprint.start_date.desc()))
+    sprints = result.scalars().all()
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_sprint.many(sprints), response)
     return sprints
 
 
 @router.post("/", response_model=SprintResponse, status_code=status.HTTP_201_CREATED)
-async def create_sprint(sprint_data: SprintCreate, db: Session = Depends(get_db)):
+async def create_sprint(sprint_data: SprintCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new sprint
     """
@@ -44,46 +107,37 @@ async def create_sprint(sprint_data: SprintCreate, db: Session = Depends(get_db)
     sprint = Sprint(**sprint_data.model_dump())
 
     db.add(sprint)
-    db.commit()
-    db.refresh(sprint)
+    await db.flush()
+    await _sync_sprint_metrics(db, sprint, was_completed=False)
+    await db.commit()
+    await response_cache.invalidate(SPRINTS_TAG)
 
     return sprint
 
 
 @router.get("/{sprint_id}", response_model=SprintResponse)
-async def get_sprint(sprint_id: str, db: Session = Depends(get_db)):
+async def get_sprint(sprint_id: str, db: AsyncSession = Depends(get_db)):
     """
     Get sprint by ID
 
     Returns sprint details with associated tasks
     """
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
-
-    if not sprint:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Sprint with ID {sprint_id} not found"
-        )
-
-    return sprint
+    return await _get_sprint_or_404(db, sprint_id)
 
 
 @router.patch("/{sprint_id}", response_model=SprintResponse)
 async def update_sprint(
     sprint_id: str,
     sprint_data: SprintUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update sprint
-    """
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
 
-    if not sprint:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Sprint with ID {sprint_id} not found"
-        )
+    Moving a sprint to `completed` records its velocity for /api/analytics/velocity.
+    """
+    sprint = await _get_sprint_or_404(db, sprint_id)
+    was_completed = sprint.status == "completed"
 
     # Update only provided fields
     for field, value in sprint_data.model_dump(exclude_unset=True).items():
@@ -96,29 +150,26 @@ async def update_sprint(
             detail="End date must be after start date"
         )
 
-    db.commit()
-    db.refresh(sprint)
+    await _sync_sprint_metrics(db, sprint, was_completed)
+    await db.commit()
+    await response_cache.invalidate(SPRINTS_TAG)
 
     return sprint
 
 
 @router.delete("/{sprint_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_sprint(sprint_id: str, db: Session = Depends(get_db)):
+async def delete_sprint(sprint_id: str, db: AsyncSession = Depends(get_db)):
     """
     Delete sprint
 
     Also removes task associations but does not delete the tasks
     """
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
+    sprint = await _get_sprint_or_404(db, sprint_id)
 
-    if not sprint:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Sprint with ID {sprint_id} not found"
-        )
-
-    db.delete(sprint)
-    db.commit()
+    await db.execute(delete(SprintMetrics).where(SprintMetrics.sprint_id == sprint_id))
+    await db.delete(sprint)
+    await db.commit()
+    await response_cache.invalidate(SPRINTS_TAG)
 
     return None
 
@@ -127,21 +178,16 @@ async def delete_sprint(sprint_id: str, db: Session = Depends(get_db)):
 async def add_task_to_sprint(
     sprint_id: str,
     task_data: SprintTaskCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Add task to sprint with story points
     """
     # Verify sprint exists
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
-    if not sprint:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Sprint with ID {sprint_id} not found"
-        )
+    await _get_sprint_or_404(db, sprint_id)
 
     # Verify task exists
-    task = db.query(Task).filter(Task.id == task_data.task_id).first()
+    task = await db.get(Task, task_data.task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -149,10 +195,7 @@ async def add_task_to_sprint(
         )
 
     # Check if task already in sprint
-    existing = db.query(SprintTask).filter(
-        SprintTask.sprint_id == sprint_id,
-        SprintTask.task_id == task_data.task_id
-    ).first()
+    existing = await db.get(SprintTask, (sprint_id, task_data.task_id))
 
     if existing:
         raise HTTPException(
@@ -168,7 +211,8 @@ async def add_task_to_sprint(
     )
 
     db.add(sprint_task)
-    db.commit()
+    await db.commit()
+    await response_cache.invalidate(SPRINTS_TAG)
 
     return {"message": "Task added to sprint successfully"}
 
@@ -177,15 +221,12 @@ async def add_task_to_sprint(
 async def remove_task_from_sprint(
     sprint_id: str,
     task_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Remove task from sprint
     """
-    sprint_task = db.query(SprintTask).filter(
-        SprintTask.sprint_id == sprint_id,
-        SprintTask.task_id == task_id
-    ).first()
+    sprint_task = await db.get(SprintTask, (sprint_id, task_id))
 
     if not sprint_task:
         raise HTTPException(
@@ -193,7 +234,8 @@ async def remove_task_from_sprint(
             detail="Task not found in sprint"
         )
 
-    db.delete(sprint_task)
-    db.commit()
+    await db.delete(sprint_task)
+    await db.commit()
+    await response_cache.invalidate(SPRINTS_TAG)
 
     return None
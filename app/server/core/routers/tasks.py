@@ -2,79 +2,488 @@
 Tasks router - Kanban board task management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-
-from core.database import get_db
-from core.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskMove
-from core.models import Task, User
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, bindparam, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import selectinload
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from core.bulk import import_ndjson
+from core.cache import TASKS_TAG, response_cache
+from core.conditional import conditional_get
+from core.config import settings
+from core.database import get_db, get_read_db
+from core.export import EXPORT_FORMAT_PATTERN, export_response
+from core.ids import PLACEHOLDER_USER_ID
+from core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from core.ranking import MAX_RANK_LENGTH, evenly_spaced, rank_between
+from core.search import apply_search
+from core.serialization import fast_json_response, serialize_task
+from core.schemas import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskMove,
+    TaskBatchRequest, TaskBatchResponse, TaskBatchResult,
+    TaskBatchCreate, TaskBatchUpdate, TaskBatchMove, TaskBatchAssign, TaskBatchDelete,
+    ImportReport,
+)
+from core.models import Task, TaskStatusEvent, User, generate_uuid
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Stable board order; `id` breaks rank ties so keyset pagination never skips or repeats rows
+TASK_PAGE_ORDER = (Task.rank, Task.id)
+
+
+async def _get_task_or_404(db: AsyncSession, task_id: str) -> Task:
+    """Load a task with its assignee, raising 404 if it does not exist"""
+    result = await db.execute(
+        select(Task)
+        .options(selectinload(Task.assignee))
+        .where(Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+    task = result.scalar_one_or_none()
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with ID {task_id} not found"
+        )
+
+    return task
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Validate a comma-separated `fields` projection against TaskResponse"""
+    if not fields:
+        return None
+
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - set(TaskResponse.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown task fields: {', '.join(sorted(unknown))}"
+        )
+
+    return selected
+
+
+def _after_cursor(rank: str, task_id: str):
+    """Keyset predicate for rows sorting after (rank, id) in TASK_PAGE_ORDER"""
+    return or_(Task.rank > rank, and_(Task.rank == rank, Task.id > task_id))
+
+
+def _split_page(rows: Sequence, limit: int) -> Tuple[Sequence, Optional[str]]:
+    """Trim the extra look-ahead row and build the cursor for the next page"""
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor((last.rank, last.id))
+
+
+def _projected_response(content: list, next_cursor: Optional[str], response: Response) -> JSONResponse:
+    """Return a field-projected page, bypassing TaskResponse validation, with the headers set on `response`"""
+    headers = dict(response.headers)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return JSONResponse(content=jsonable_encoder(content), headers=headers)
+
+
+async def _edge_rank(
+    db: AsyncSession,
+    task_status: str,
+    last: bool,
+    exclude_id: Optional[str] = None
+) -> Optional[str]:
+    """Rank of the first or last card in a column, or None if it is empty"""
+    await db.flush()
+    query = select(Task.rank).where(Task.status == task_status)
+    if exclude_id:
+        query = query.where(Task.id != exclude_id)
+    query = query.order_by(Task.rank.desc() if last else Task.rank).limit(1)
+    return (await db.execute(query)).scalar_one_or_none()
+
+
+async def _adjacent_rank(
+    db: AsyncSession,
+    task_status: str,
+    rank: str,
+    following: bool,
+    exclude_ids: Tuple[str, ...]
+) -> Optional[str]:
+    """
+    Rank of the card directly after (or before) `rank` in a column
+
+    Cards tied with `rank` count as adjacent, so the caller sees the tie.
+    """
+    await db.flush()
+    query = select(Task.rank).where(Task.status == task_status, Task.id.notin_(exclude_ids))
+    if following:
+        query = query.where(Task.rank >= rank).order_by(Task.rank)
+    else:
+        query = query.where(Task.rank <= rank).order_by(Task.rank.desc())
+    return (await db.execute(query.limit(1))).scalar_one_or_none()
+
+
+async def _neighbour_rank(
+    db: AsyncSession,
+    neighbour_id: str,
+    task_status: str,
+    loaded: Optional[Dict[str, Task]] = None
+) -> str:
+    """
+    Rank of a neighbour card named in a move, which must be in the target column
+
+    Tasks in `loaded` are read from memory instead of the database.
+    """
+    if loaded and neighbour_id in loaded:
+        neighbour = loaded[neighbour_id]
+        rank = neighbour.rank if neighbour.status == task_status else None
+    else:
+        await db.flush()
+        result = await db.execute(
+            select(Task.rank).where(Task.id == neighbour_id, Task.status == task_status)
+        )
+        rank = result.scalar_one_or_none()
+
+    if rank is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Task with ID {neighbour_id} is not in the {task_status} column"
+        )
+
+    return rank
+
+
+async def _target_ranks(
+    db: AsyncSession,
+    task: Task,
+    move_data: TaskMove,
+    loaded: Optional[Dict[str, Task]] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Ranks of the cards the moved task will sit between
+
+    Each lookup is a single seek on the (status, rank) index; None means the
+    start or end of the column.
+    """
+    column = move_data.status
+
+    if move_data.after_task_id:
+        before = await _neighbour_rank(db, move_data.after_task_id, column, loaded)
+        if move_data.before_task_id:
+            return before, await _neighbour_rank(db, move_data.before_task_id, column, loaded)
+        return before, await _adjacent_rank(
+            db, column, before, True, (task.id, move_data.after_task_id)
+        )
+
+    if move_data.before_task_id:
+        after = await _neighbour_rank(db, move_data.before_task_id, column, loaded)
+        return await _adjacent_rank(
+            db, column, after, False, (task.id, move_data.before_task_id)
+        ), after
+
+    if move_data.position is not None:
+        # Legacy index-based moves need an OFFSET scan; neighbour IDs avoid it
+        await db.flush()
+        result = await db.execute(
+            select(Task.rank)
+            .where(Task.status == column, Task.id != task.id)
+            .order_by(*TASK_PAGE_ORDER)
+            .offset(max(move_data.position - 1, 0))
+            .limit(2)
+        )
+        ranks = result.scalars().all()
+        if move_data.position == 0:
+            return None, ranks[0] if ranks else None
+        if ranks:
+            return ranks[0], ranks[1] if len(ranks) > 1 else None
+
+    # Default to end of column
+    return await _edge_rank(db, column, last=True, exclude_id=task.id), None
+
+
+# Rewrites one rank only if the card has not been moved since it was read
+_rebalance_statement = (
+    update(Task.__table__)
+    .where(
+        Task.__table__.c.id == bindparam("task_id"),
+        Task.__table__.c.status == bindparam("task_status"),
+        Task.__table__.c.rank == bindparam("old_rank"),
+    )
+    .values(rank=bindparam("new_rank"))
+)
+
+
+async def _rebalance(db: AsyncSession, task_status: str) -> None:
+    """
+    Respace every rank in a column evenly, keeping the current order
+
+    Each UPDATE is conditional on the status and rank that were read, so a
+    card moved concurrently keeps the rank its own move gave it instead of
+    being dragged back to its old slot.
+    """
+    await db.flush()
+    result = await db.execute(
+        select(Task.id, Task.rank).where(Task.status == task_status).order_by(*TASK_PAGE_ORDER)
+    )
+    rows = result.all()
+
+    if rows:
+        await db.execute(
+            _rebalance_statement,
+            [
+                {
+                    "task_id": row.id,
+                    "task_status": task_status,
+                    "old_rank": row.rank,
+                    "new_rank": rank,
+                }
+                for row, rank in zip(rows, evenly_spaced(len(rows)))
+            ]
+        )
+
+
+async def _place_task(
+    db: AsyncSession,
+    task: Task,
+    move_data: TaskMove,
+    background_tasks: BackgroundTasks,
+    loaded: Optional[Dict[str, Task]] = None
+) -> None:
+    """Set a task's status and rank for a move; only the task itself is modified"""
+    if task.id in (move_data.after_task_id, move_data.before_task_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A task cannot be moved next to itself"
+        )
+
+    before, after = await _target_ranks(db, task, move_data, loaded)
+
+    if before is not None and after is not None and before >= after:
+        # Concurrent moves can leave equal ranks; respace the column and retry
+        await _rebalance(db, move_data.status)
+        # The rebalance bypasses the identity map, so reload the ranks held in
+        # memory; a stale task.rank could hide the final write from the flush
+        await db.execute(
+            select(Task).where(Task.id.in_([task.id, *(loaded or ())]))
+            .execution_options(populate_existing=True)
+        )
+        before, after = await _target_ranks(db, task, move_data, loaded)
+        if before is not None and after is not None and before >= after:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_task_id must come before before_task_id in the column"
+            )
+
+    previous_status = task.status
+    task.status = move_data.status
+    task.rank = rank_between(before, after)
+    if task.status != previous_status:
+        _record_status(db, task, previous_status)
+
+    if len(task.rank) > MAX_RANK_LENGTH:
+        background_tasks.add_task(rebalance_column, db.bind, move_data.status)
+
+
+async def _apply_task_update(
+    db: AsyncSession,
+    task: Task,
+    task_data: TaskUpdate,
+    background_tasks: BackgroundTasks,
+    loaded: Optional[Dict[str, Task]] = None
+) -> bool:
+    """
+    Set the provided fields on a task, returning True if it changed column
+
+    A new status goes through _place_task so the task gets a rank in its new
+    column rather than keeping one that only made sense in the old one.
+    """
+    changes = task_data.model_dump(exclude_unset=True)
+    new_status = changes.pop("status", None)
+
+    for field, value in changes.items():
+        setattr(task, field, value)
+
+    if new_status is None or new_status == task.status:
+        return False
+
+    await _place_task(db, task, TaskMove(status=new_status), background_tasks, loaded)
+    return True
+
+
+def _record_status(db: AsyncSession, task: Task, previous_status: Optional[str]) -> None:
+    """Log a task entering its current status; previous_status is None for a new task"""
+    db.add(TaskStatusEvent(task=task, from_status=previous_status, to_status=task.status))
+
+
+async def _get_user_or_404(db: AsyncSession, user_id: str) -> User:
+    """Load an assignee, raising 404 if the user does not exist"""
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found"
+        )
+
+    return user
+
+
+async def rebalance_column(bind: Union[AsyncEngine, AsyncConnection], task_status: str) -> None:
+    """
+    Background job compacting the ranks of a column
+
+    Runs after the response is sent, in its own session; the request session
+    is already closed by then.
+    """
+    async with AsyncSession(bind=bind, expire_on_commit=False) as db:
+        await _rebalance(db, task_status)
+        await db.commit()
+
 
 @router.get("/", response_model=List[TaskResponse])
 async def list_tasks(
+    request: Request,
+    response: Response,
     status_filter: Optional[str] = Query(None, alias="status"),
     assignee_id: Optional[str] = Query(None, alias="assignee"),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    List all tasks with optional filtering
+    List tasks with optional filtering, one page at a time
 
     Filters:
     - status: Filter by task status (backlog, todo, in_progress, in_review, done)
     - assignee: Filter by assignee user ID
-    - search: Search in title and description
+    - search: Full-text search in title and description (prefix matching, best match first)
+
+    Pagination:
+    - limit: Page size
+    - cursor: Value of the X-Next-Cursor header from the previous page (ignored when searching)
+    - fields: Comma-separated subset of task fields to return (e.g. id,title,status)
+
+    Responses carry an ETag; a request whose If-None-Match still matches gets
+    an empty 304 without the list being queried.
     """
-    query = db.query(Task)
+    selected = _parse_fields(fields)
+    not_modified = await conditional_get(request, response, db, Task, User)
+    if not_modified:
+        return not_modified
+    query = select(Task)
 
     if status_filter:
-        query = query.filter(Task.status == status_filter)
+        query = query.where(Task.status == status_filter)
 
     if assignee_id:
-        query = query.filter(Task.assignee_id == assignee_id)
+        query = query.where(Task.assignee_id == assignee_id)
 
     if search:
-        query = query.filter(
-            (Task.title.ilike(f"%{search}%")) | (Task.description.ilike(f"%{search}%"))
-        )
-
-    tasks = query.order_by(Task.position, Task.created_at.desc()).all()
+        query, rank = apply_search(query, Task.__table__, db.bind.dialect.name, search)
+        # Ranked search results are a single best-first page
+        query = query.order_by(*((rank,) if rank is not None else TASK_PAGE_ORDER)).limit(limit)
+    else:
+        if cursor:
+            query = query.where(_after_cursor(*decode_cursor(cursor, 2)))
+        query = query.order_by(*TASK_PAGE_ORDER).limit(limit + 1)
+
+    if selected is not None and "assignee" not in selected:
+        # Column projection: no ORM entities or relationships needed
+        columns = {name: getattr(Task, name) for name in selected}
+        columns.update({"rank": Task.rank, "id": Task.id})
+        result = await db.execute(query.with_only_columns(*columns.values()))
+        rows = result.all()
+        page, next_cursor = _split_page(rows, limit)
+        content = [{name: getattr(row, name) for name in selected} for row in page]
+        return _projected_response(content, next_cursor, response)
+
+    result = await db.execute(query.options(selectinload(Task.assignee)))
+    tasks, next_cursor = _split_page(result.scalars().all(), limit)
+
+    if selected is not None:
+        content = [
+            TaskResponse.model_validate(task).model_dump(include=selected)
+            for task in tasks
+        ]
+        return _projected_response(content, next_cursor, response)
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_task.many(tasks), response)
     return tasks
 
 
+@router.get("/export")
+async def export_tasks(
+    export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    assignee_id: Optional[str] = Query(None, alias="assignee"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export tasks as NDJSON or CSV in board order
+
+    Filters:
+    - status: Filter by task status
+    - assignee: Filter by assignee user ID
+
+    Rows are streamed from a server-side cursor, so any number of tasks can
+    be exported in constant memory.
+    """
+    query = select(
+        Task.id, Task.title, Task.description, Task.status, Task.assignee_id, Task.created_by,
+        Task.labels, Task.rank, Task.created_at, Task.updated_at
+    )
+
+    if status_filter:
+        query = query.where(Task.status == status_filter)
+
+    if assignee_id:
+        query = query.where(Task.assignee_id == assignee_id)
+
+    return export_response(db.bind, query.order_by(*TASK_PAGE_ORDER), export_format, "tasks")
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task_data: TaskCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new task
     """
     # TODO: Get current user ID from JWT token
-    current_user_id = "placeholder-user-id"
+    current_user_id = PLACEHOLDER_USER_ID
 
-    # Calculate position (last in the column)
-    max_position = db.query(Task).filter(Task.status == task_data.status).count()
+    # Rank after the last card in the column
+    last_rank = await _edge_rank(db, task_data.status, last=True)
 
     task = Task(
         **task_data.model_dump(),
         created_by=current_user_id,
-        position=max_position
+        rank=rank_between(last_rank, None)
     )
 
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    _record_status(db, task, None)
+    await db.commit()
+    await response_cache.invalidate(TASKS_TAG)
 
-    return task
+    return await _get_task_or_404(db, task.id)
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: str, db: Session = Depends(get_db)):
-    """
-    Get task by ID
-    """
-    task = db.query(Task).filter(Task.id == task_id).first()
+def _loaded_task_or_404(loaded: Dict[str, Task], task_id: str) -> Task:
+    """Look up a task preloaded for a batch, raising 404 if it does not exist"""
+    task = loaded.get(task_id)
 
     if not task:
         raise HTTPException(
@@ -85,101 +494,286 @@ async def get_task(task_id: str, db: Session = Depends(get_db)):
     return task
 
 
-@router.patch("/{task_id}", response_model=TaskResponse)
-async def update_task(task_id: str, task_data: TaskUpdate, db: Session = Depends(get_db)):
+def _check_batch_assignee(user_ids: Set[str], assignee_id: Optional[str]) -> None:
+    """Raise 404 unless an assignee is unset or among the users preloaded for a batch"""
+    if assignee_id is not None and assignee_id not in user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {assignee_id} not found"
+        )
+
+
+async def _apply_batch_operation(
+    db: AsyncSession,
+    operation,
+    loaded: Dict[str, Task],
+    user_ids: Set[str],
+    tails: Dict[str, Optional[str]],
+    background_tasks: BackgroundTasks,
+    current_user_id: str
+) -> Tuple[int, Optional[Task]]:
     """
-    Update task
+    Apply one batch operation to the session without flushing it
+
+    `tails` caches the last rank of each column so consecutive creates do not
+    query for it again; operations that may change a column's last card drop
+    its entry. Returns the status code and the affected task.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    if isinstance(operation, TaskBatchCreate):
+        _check_batch_assignee(user_ids, operation.data.assignee_id)
+        column = operation.data.status
+        if column not in tails:
+            tails[column] = await _edge_rank(db, column, last=True)
+        tails[column] = rank_between(tails[column], None)
+
+        task = Task(
+            **operation.data.model_dump(),
+            created_by=current_user_id,
+            rank=tails[column]
+        )
+        db.add(task)
+        _record_status(db, task, None)
+        return status.HTTP_201_CREATED, task
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with ID {task_id} not found"
+    task = _loaded_task_or_404(loaded, operation.task_id)
+
+    if isinstance(operation, TaskBatchUpdate):
+        _check_batch_assignee(user_ids, operation.data.assignee_id)
+        if await _apply_task_update(db, task, operation.data, background_tasks, loaded):
+            tails.pop(task.status, None)
+
+    elif isinstance(operation, TaskBatchMove):
+        await _place_task(db, task, operation.data, background_tasks, loaded)
+        tails.pop(task.status, None)
+
+    elif isinstance(operation, TaskBatchAssign):
+        _check_batch_assignee(user_ids, operation.assignee_id)
+        task.assignee_id = operation.assignee_id
+
+    elif isinstance(operation, TaskBatchDelete):
+        await db.delete(task)
+        del loaded[task.id]
+        return status.HTTP_204_NO_CONTENT, None
+
+    return status.HTTP_200_OK, task
+
+
+@router.post("/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply create/update/move/assign/delete operations in one transaction
+
+    Operations run in order and see the effect of earlier ones. Referenced
+    tasks and users are loaded with one query each and the writes are flushed
+    together, so reordering a column costs a few statements rather than
+    several per card. A failing operation is reported in its result with the
+    status code the single-task endpoint would return, and the rest of the
+    batch is still committed.
+    """
+    # TODO: Get current user ID from JWT token
+    current_user_id = PLACEHOLDER_USER_ID
+    operations = batch.operations
+
+    task_ids = set()
+    for operation in operations:
+        if not isinstance(operation, TaskBatchCreate):
+            task_ids.add(operation.task_id)
+        if isinstance(operation, TaskBatchMove):
+            task_ids.update(filter(None, (operation.data.after_task_id, operation.data.before_task_id)))
+
+    loaded: Dict[str, Task] = {}
+    if task_ids:
+        result = await db.execute(select(Task).where(Task.id.in_(task_ids)))
+        loaded = {task.id: task for task in result.scalars()}
+
+    user_ids: Set[str] = set()
+    assignee_ids = set()
+    for operation in operations:
+        if isinstance(operation, TaskBatchAssign):
+            assignee_ids.add(operation.assignee_id)
+        elif isinstance(operation, (TaskBatchCreate, TaskBatchUpdate)) and operation.data.assignee_id:
+            assignee_ids.add(operation.data.assignee_id)
+    if assignee_ids:
+        result = await db.execute(select(User.id).where(User.id.in_(assignee_ids)))
+        user_ids = set(result.scalars())
+
+    tails: Dict[str, Optional[str]] = {}
+    outcomes = []
+    for operation in operations:
+        try:
+            status_code, task = await _apply_batch_operation(
+                db, operation, loaded, user_ids, tails, background_tasks, current_user_id
+            )
+            outcomes.append((status_code, task, None))
+        except HTTPException as exc:
+            outcomes.append((exc.status_code, None, exc.detail))
+
+    await db.commit()
+    await response_cache.invalidate(TASKS_TAG)
+
+    # Reload every returned task with its assignee in one query
+    returned_ids = {task.id for _, task, _ in outcomes if task is not None}
+    tasks = {}
+    if returned_ids:
+        result = await db.execute(
+            select(Task)
+            .options(selectinload(Task.assignee))
+            .where(Task.id.in_(returned_ids))
+            .execution_options(populate_existing=True)
         )
+        tasks = {task.id: task for task in result.scalars()}
 
-    # Update only provided fields
-    for field, value in task_data.model_dump(exclude_unset=True).items():
-        setattr(task, field, value)
+    results = []
+    for index, (operation, (status_code, task, detail)) in enumerate(zip(operations, outcomes)):
+        # A task deleted by a later operation in the batch has nothing left to return
+        reloaded = tasks.get(task.id) if task is not None else None
+        results.append(TaskBatchResult(
+            index=index,
+            op=operation.op,
+            status_code=status_code,
+            task=TaskResponse.model_validate(reloaded) if reloaded is not None else None,
+            detail=detail
+        ))
+
+    return TaskBatchResponse(results=results)
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_tasks(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Create tasks from an NDJSON body, one TaskCreate object per line
 
-    db.commit()
-    db.refresh(task)
+    Tasks are appended to their columns in the order given. Lines that fail
+    validation or name an unknown assignee are skipped and reported; the
+    rest are inserted in chunks with executemany and committed together.
+    """
+    # TODO: Get current user ID from JWT token
+    current_user_id = PLACEHOLDER_USER_ID
+    tails: Dict[str, Optional[str]] = {}
+
+    async def insert_chunk(chunk: List[Tuple[int, TaskCreate]]) -> List[Tuple[int, str]]:
+        assignee_ids = {data.assignee_id for _, data in chunk if data.assignee_id}
+        user_ids: Set[str] = set()
+        if assignee_ids:
+            result = await db.execute(select(User.id).where(User.id.in_(assignee_ids)))
+            user_ids = set(result.scalars())
+
+        now = datetime.utcnow()
+        refused, tasks, events = [], [], []
+        for line, data in chunk:
+            if data.assignee_id and data.assignee_id not in user_ids:
+                refused.append((line, f"User with ID {data.assignee_id} not found"))
+                continue
+            if data.status not in tails:
+                tails[data.status] = await _edge_rank(db, data.status, last=True)
+            tails[data.status] = rank_between(tails[data.status], None)
+
+            task_id = generate_uuid()
+            tasks.append({
+                **data.model_dump(),
+                "id": task_id,
+                "created_by": current_user_id,
+                "rank": tails[data.status],
+                "created_at": now,
+                "updated_at": now,
+            })
+            events.append({"task_id": task_id, "from_status": None, "to_status": data.status, "changed_at": now})
+
+        if tasks:
+            await db.execute(insert(Task), tasks)
+            await db.execute(insert(TaskStatusEvent), events)
+        return refused
+
+    report = await import_ndjson(request, db, TaskCreate, insert_chunk, "tasks")
+    await response_cache.invalidate(TASKS_TAG)
+    return report
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(task_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    Get task by ID
+    """
+    task = await _get_task_or_404(db, task_id)
 
     return task
 
 
+@router.patch("/{task_id}", response_model=TaskResponse)
+async def update_task(
+    task_id: str,
+    task_data: TaskUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update task
+
+    A status change moves the task to the end of its new column.
+    """
+    task = await _get_task_or_404(db, task_id)
+
+    await _apply_task_update(db, task, task_data, background_tasks)
+
+    await db.commit()
+    await response_cache.invalidate(TASKS_TAG)
+
+    return await _get_task_or_404(db, task_id)
+
+
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(task_id: str, db: Session = Depends(get_db)):
+async def delete_task(task_id: str, db: AsyncSession = Depends(get_db)):
     """
     Delete task
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await _get_task_or_404(db, task_id)
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with ID {task_id} not found"
-        )
-
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
+    await response_cache.invalidate(TASKS_TAG)
 
     return None
 
 
 @router.patch("/{task_id}/move", response_model=TaskResponse)
-async def move_task(task_id: str, move_data: TaskMove, db: Session = Depends(get_db)):
+async def move_task(
+    task_id: str,
+    move_data: TaskMove,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Move task to different column/status
-    """
-    task = db.query(Task).filter(Task.id == task_id).first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with ID {task_id} not found"
-        )
 
-    # Update status
-    task.status = move_data.status
-
-    # Update position if provided
-    if move_data.position is not None:
-        task.position = move_data.position
-    else:
-        # Default to end of column
-        max_position = db.query(Task).filter(Task.status == move_data.status).count()
-        task.position = max_position
+    The task is placed between `after_task_id` and `before_task_id` (either may
+    be omitted), at the legacy `position` index, or at the end of the column.
+    Only the moved task is written.
+    """
+    task = await _get_task_or_404(db, task_id)
 
-    db.commit()
-    db.refresh(task)
+    await _place_task(db, task, move_data, background_tasks)
+    await db.commit()
+    await response_cache.invalidate(TASKS_TAG)
 
-    return task
+    return await _get_task_or_404(db, task_id)
 
 
 @router.post("/{task_id}/assign", response_model=TaskResponse)
-async def assign_task(task_id: str, assignee_id: str, db: Session = Depends(get_db)):
+async def assign_task(task_id: str, assignee_id: str, db: AsyncSession = Depends(get_db)):
     """
     Assign task to user
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with ID {task_id} not found"
-        )
+    task = await _get_task_or_404(db, task_id)
 
     # Verify user exists
-    user = db.query(User).filter(User.id == assignee_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {assignee_id} not found"
-        )
+    await _get_user_or_404(db, assignee_id)
 
     task.assignee_id = assignee_id
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await response_cache.invalidate(TASKS_TAG)
 
-    return task
+    return await _get_task_or_404(db, task_id)
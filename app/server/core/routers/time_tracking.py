@@ -2,94 +2,206 @@
 Time tracking router - Timer and time entry management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timedelta
-
-from core.database import get_db
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import RowMapping, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Awaitable, List, Optional, Tuple
+from datetime import datetime, time, timedelta
+
+from core.bulk import import_ndjson
+from core.cache import TIME_TAG, response_cache
+from core.conditional import conditional_get
+from core.config import settings
+from core.database import get_db, get_read_db
+from core.export import EXPORT_FORMAT_PATTERN, export_response
+from core.ids import PLACEHOLDER_USER_ID
+from core.periods import GRANULARITY_PATTERN, period_key, period_start, seconds_between
 from core.schemas import (
     TimeEntryCreate,
     TimeEntryStart,
     TimeEntryResponse,
-    TimeSummary
+    RunningTimerResponse,
+    TimeSummary,
+    ImportReport
 )
-from core.models import TimeEntry
+from core.models import Task, TimeEntry, TimeRollup, User, generate_uuid
+from core.rollups import NO_TASK, record_time, record_times
+from core.serialization import fast_json_response, serialize_time_entry
+from core.timers import RunningTimer, timer_registry
+from core.websocket import manager, timer_topics
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Eager-load the nested task/assignee rendered by TimeEntryResponse
+ENTRY_LOAD_OPTIONS = (selectinload(TimeEntry.task).selectinload(Task.assignee),)
 
-@router.post("/start", response_model=TimeEntryResponse, status_code=status.HTTP_201_CREATED)
-async def start_timer(timer_data: TimeEntryStart, db: Session = Depends(get_db)):
+
+async def _load_entry(db: AsyncSession, entry_id: str) -> TimeEntry:
+    """Reload a time entry with the relationships needed for its response"""
+    result = await db.execute(
+        select(TimeEntry)
+        .options(*ENTRY_LOAD_OPTIONS)
+        .where(TimeEntry.id == entry_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def _stop_running_timer(db: AsyncSession, user_id: str, now: datetime) -> Optional[RowMapping]:
     """
-    Start a new timer
+    Stop the user's running timer, if any, and add it to the rollups
 
-    Stops any existing running timer for the user before starting new one
+    The check and the transition are one UPDATE ... RETURNING, so two
+    requests cannot both stop (and count) the same timer. Returns the
+    stopped entry's id, user_id, task_id, start_time and duration.
     """
-    # TODO: Get current user ID from JWT token
-    current_user_id = "placeholder-user-id"
+    result = await db.execute(
+        update(TimeEntry)
+        .where(TimeEntry.user_id == user_id, TimeEntry.is_running.is_(True))
+        .values(
+            is_running=False,
+            end_time=now,
+            duration=seconds_between(TimeEntry.start_time, now, db.bind.dialect.name)
+        )
+        .returning(TimeEntry.id, TimeEntry.user_id, TimeEntry.task_id, TimeEntry.start_time, TimeEntry.duration)
+        .execution_options(synchronize_session=False)
+    )
+    stopped = result.mappings().first()
+    if stopped is None:
+        return None
+    await record_times(db, [stopped])
+    return stopped
 
-    # Stop any existing running timer
-    existing_timer = db.query(TimeEntry).filter(
-        TimeEntry.user_id == current_user_id,
-        TimeEntry.is_running.is_(True)
-    ).first()
 
-    if existing_timer:
-        existing_timer.end_time = datetime.utcnow()
-        existing_timer.duration = int((existing_timer.end_time - existing_timer.start_time).total_seconds())
-        existing_timer.is_running = False
+async def _update_registry(change: Awaitable[None]) -> None:
+    """Apply a committed timer start or stop to the timer registry"""
+    try:
+        await change
+    except Exception as e:
+        # The registry is rebuilt from the database on the next startup
+        logger.warning(f"Timer registry update failed: {e!r}")
 
-    # Create new timer
-    time_entry = TimeEntry(
-        task_id=timer_data.task_id,
-        user_id=current_user_id,
-        start_time=datetime.utcnow(),
-        is_running=True
-    )
 
-    db.add(time_entry)
-    db.commit()
-    db.refresh(time_entry)
+async def _announce_stop(stopped: RowMapping) -> None:
+    """Tell WebSocket clients a timer stopped, with the duration the server recorded"""
+    await manager.publish(timer_topics(stopped["user_id"], stopped["task_id"]), {
+        "type": "timer:stopped",
+        "entry_id": stopped["id"],
+        "user_id": stopped["user_id"],
+        "task_id": stopped["task_id"],
+        "duration": stopped["duration"]
+    })
+
+
+@router.post("/start", response_model=TimeEntryResponse, status_code=status.HTTP_201_CREATED)
+async def start_timer(timer_data: TimeEntryStart, db: AsyncSession = Depends(get_db)):
+    """
+    Start a new timer
 
+    Stops any existing running timer for the user before starting new one.
+    The partial unique index on running timers turns a concurrent start into
+    an IntegrityError; the loser retries once, stopping the winner's timer.
+    WebSocket clients are sent timer:stopped for the previous timer and
+    timer:started for the new one.
+    """
+    # TODO: Get current user ID from JWT token
+    current_user_id = PLACEHOLDER_USER_ID
+
+    for attempt in range(2):
+        now = datetime.utcnow()
+        stopped = await _stop_running_timer(db, current_user_id, now)
+        entry_id = generate_uuid()
+        try:
+            await db.execute(insert(TimeEntry).values(
+                id=entry_id,
+                task_id=timer_data.task_id,
+                user_id=current_user_id,
+                start_time=now,
+                is_running=True
+            ))
+            await db.commit()
+            break
+        except IntegrityError:
+            await db.rollback()
+            if attempt:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Another timer was started at the same time"
+                )
+    await response_cache.invalidate(TIME_TAG)
+
+    time_entry = await _load_entry(db, entry_id)
+    timer = RunningTimer(time_entry.id, time_entry.user_id, time_entry.task_id, time_entry.start_time)
+    await _update_registry(timer_registry.started(timer))
+    if stopped is not None:
+        await _announce_stop(stopped)
+    await manager.publish(timer_topics(timer.user_id, timer.task_id), {"type": "timer:started", **timer.describe()})
     return time_entry
 
 
 @router.post("/stop", response_model=TimeEntryResponse)
-async def stop_timer(db: Session = Depends(get_db)):
+async def stop_timer(db: AsyncSession = Depends(get_db)):
     """
     Stop the currently running timer
+
+    WebSocket clients are sent timer:stopped with the recorded duration.
     """
     # TODO: Get current user ID from JWT token
-    current_user_id = "placeholder-user-id"
+    current_user_id = PLACEHOLDER_USER_ID
 
-    time_entry = db.query(TimeEntry).filter(
-        TimeEntry.user_id == current_user_id,
-        TimeEntry.is_running.is_(True)
-    ).first()
+    stopped = await _stop_running_timer(db, current_user_id, datetime.utcnow())
 
-    if not time_entry:
+    if stopped is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No running timer found"
         )
 
-    time_entry.end_time = datetime.utcnow()
-    time_entry.duration = int((time_entry.end_time - time_entry.start_time).total_seconds())
-    time_entry.is_running = False
+    await db.commit()
+    await response_cache.invalidate(TIME_TAG)
+    await _update_registry(timer_registry.stopped(current_user_id, stopped["id"]))
+    await _announce_stop(stopped)
 
-    db.commit()
-    db.refresh(time_entry)
+    return await _load_entry(db, stopped["id"])
 
-    return time_entry
+
+@router.get("/running", response_model=List[RunningTimerResponse])
+async def get_running_timers(user_id: Optional[str] = Query(None)):
+    """
+    List running timers, most recently started first
+
+    Answered from the timer registry without touching the database.
+
+    Filters:
+    - user_id: Only this user's timer
+    """
+    if user_id:
+        timer = await timer_registry.get(user_id)
+        timers = [timer] if timer else []
+    else:
+        timers = await timer_registry.all()
+
+    now = datetime.utcnow()
+    return [
+        RunningTimerResponse(**timer._asdict(), elapsed=timer.elapsed(now))
+        for timer in sorted(timers, key=lambda timer: timer.start_time, reverse=True)
+    ]
 
 
 @router.get("/entries", response_model=List[TimeEntryResponse])
 async def get_time_entries(
+    request: Request,
+    response: Response,
     task_id: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get time entries with optional filtering
@@ -98,67 +210,166 @@ async def get_time_entries(
     - task_id: Filter by task
     - start_date: Filter entries after this date
     - end_date: Filter entries before this date
+
+    Answers 304 when If-None-Match carries the current ETag.
     """
+    # Entries embed their task and its assignee
+    not_modified = await conditional_get(request, response, db, TimeEntry, Task, User)
+    if not_modified:
+        return not_modified
+
     # TODO: Get current user ID from JWT token
-    current_user_id = "placeholder-user-id"
+    current_user_id = PLACEHOLDER_USER_ID
 
-    query = db.query(TimeEntry).filter(TimeEntry.user_id == current_user_id)
+    query = (
+        select(TimeEntry)
+        .options(*ENTRY_LOAD_OPTIONS)
+        .where(TimeEntry.user_id == current_user_id)
+    )
 
     if task_id:
-        query = query.filter(TimeEntry.task_id == task_id)
+        query = query.where(TimeEntry.task_id == task_id)
 
     if start_date:
-        query = query.filter(TimeEntry.start_time >= start_date)
+        query = query.where(TimeEntry.start_time >= start_date)
 
     if end_date:
-        query = query.filter(TimeEntry.start_time <= end_date)
+        query = query.where(TimeEntry.start_time <= end_date)
 
-    entries = query.order_by(TimeEntry.start_time.desc()).all()
+    result = await db.execute(query.order_by(TimeEntry.start_time.desc()))
+    entries = result.scalars().all()
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_time_entry.many(entries), response)
     return entries
 
 
-@router.post("/entries", response_model=TimeEntryResponse, status_code=status.HTTP_201_CREATED)
-async def create_time_entry(entry_data: TimeEntryCreate, db: Session = Depends(get_db)):
+@router.get("/export")
+async def export_time_entries(
+    export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    task_id: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Create a manual time entry
+    Export time entries as NDJSON or CSV, oldest first, e.g. for payroll
+
+    Takes the same filters as /entries. Rows are streamed from a server-side
+    cursor, so any date range can be exported in constant memory.
     """
     # TODO: Get current user ID from JWT token
-    current_user_id = "placeholder-user-id"
+    current_user_id = PLACEHOLDER_USER_ID
+
+    query = (
+        select(
+            TimeEntry.id, TimeEntry.user_id, TimeEntry.task_id, Task.title.label("task_title"),
+            TimeEntry.start_time, TimeEntry.end_time, TimeEntry.duration, TimeEntry.is_running
+        )
+        .outerjoin(Task, Task.id == TimeEntry.task_id)
+        .where(TimeEntry.user_id == current_user_id)
+    )
+
+    if task_id:
+        query = query.where(TimeEntry.task_id == task_id)
+
+    if start_date:
+        query = query.where(TimeEntry.start_time >= start_date)
+
+    if end_date:
+        query = query.where(TimeEntry.start_time <= end_date)
 
-    # Calculate duration if end_time provided
+    return export_response(db.bind, query.order_by(TimeEntry.start_time), export_format, "time-entries")
+
+
+def _entry_duration(entry_data: TimeEntryCreate) -> Optional[int]:
+    """Seconds logged by a manual entry: from its end time if given, else its stated duration"""
     duration = None
     if entry_data.end_time:
         duration = int((entry_data.end_time - entry_data.start_time).total_seconds())
+    return duration or entry_data.duration
+
+
+@router.post("/entries", response_model=TimeEntryResponse, status_code=status.HTTP_201_CREATED)
+async def create_time_entry(entry_data: TimeEntryCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Create a manual time entry
+    """
+    # TODO: Get current user ID from JWT token
+    current_user_id = PLACEHOLDER_USER_ID
 
     time_entry = TimeEntry(
         task_id=entry_data.task_id,
         user_id=current_user_id,
         start_time=entry_data.start_time,
         end_time=entry_data.end_time,
-        duration=duration or entry_data.duration,
+        duration=_entry_duration(entry_data),
         is_running=False
     )
 
     db.add(time_entry)
-    db.commit()
-    db.refresh(time_entry)
+    await record_time(db, time_entry)
+    await db.commit()
+    await response_cache.invalidate(TIME_TAG)
+
+    return await _load_entry(db, time_entry.id)
 
-    return time_entry
+
+@router.post("/import", response_model=ImportReport)
+async def import_time_entries(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Create manual time entries from an NDJSON body, one TimeEntryCreate object per line
+
+    Lines that fail validation are skipped and reported; the rest are
+    inserted in chunks with executemany, their daily rollups updated with
+    one upsert per day and task, and everything committed together.
+    """
+    # TODO: Get current user ID from JWT token
+    current_user_id = PLACEHOLDER_USER_ID
+
+    async def insert_chunk(chunk: List[Tuple[int, TimeEntryCreate]]) -> List[Tuple[int, str]]:
+        now = datetime.utcnow()
+        entries = [
+            {
+                "id": generate_uuid(),
+                "task_id": data.task_id,
+                "user_id": current_user_id,
+                "start_time": data.start_time,
+                "end_time": data.end_time,
+                "duration": _entry_duration(data),
+                "is_running": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, data in chunk
+        ]
+        await db.execute(insert(TimeEntry), entries)
+        await record_times(db, entries)
+        return []
+
+    report = await import_ndjson(request, db, TimeEntryCreate, insert_chunk, "time entries")
+    await response_cache.invalidate(TIME_TAG)
+    return report
 
 
 @router.get("/summary", response_model=TimeSummary)
 async def get_time_summary(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    granularity: str = Query(default="day", pattern=GRANULARITY_PATTERN),
+    include_entries: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get time tracking summary
 
-    Returns total duration, entries, and breakdowns by task and date
+    Returns total duration and breakdowns by task and by day, ISO week or
+    month (`granularity`), read from the daily time rollups, so the cost grows
+    with the days in the range rather than the entries. Whole days between
+    start_date and end_date are counted. The entries themselves are only
+    included with include_entries=true.
     """
     # TODO: Get current user ID from JWT token
-    current_user_id = "placeholder-user-id"
+    current_user_id = PLACEHOLDER_USER_ID
 
     # Default to last 7 days if no dates provided
     if not end_date:
@@ -166,31 +377,46 @@ async def get_time_summary(
     if not start_date:
         start_date = end_date - timedelta(days=7)
 
-    entries = db.query(TimeEntry).filter(
-        TimeEntry.user_id == current_user_id,
-        TimeEntry.start_time >= start_date,
-        TimeEntry.start_time <= end_date,
-        TimeEntry.duration.isnot(None)
-    ).all()
-
-    # Calculate total duration
-    total_duration = sum(entry.duration or 0 for entry in entries)
+    first_day, last_day = start_date.date(), end_date.date()
+    in_range = (
+        TimeRollup.user_id == current_user_id,
+        TimeRollup.day >= first_day,
+        TimeRollup.day <= last_day
+    )
+    seconds = func.sum(TimeRollup.duration)
 
     # Group by task
-    by_task = {}
-    for entry in entries:
-        task_id = entry.task_id or "no_task"
-        by_task[task_id] = by_task.get(task_id, 0) + (entry.duration or 0)
+    result = await db.execute(
+        select(TimeRollup.task_id, seconds).where(*in_range).group_by(TimeRollup.task_id)
+    )
+    by_task = {"no_task" if task_id == NO_TASK else task_id: total for task_id, total in result.all()}
 
-    # Group by date
-    by_date = {}
-    for entry in entries:
-        date_key = entry.start_time.date().isoformat()
-        by_date[date_key] = by_date.get(date_key, 0) + (entry.duration or 0)
+    # Group by period
+    period = period_start(TimeRollup.day, granularity, db.bind.dialect.name)
+    result = await db.execute(
+        select(period, seconds).where(*in_range).group_by(period).order_by(period)
+    )
+    by_date = {period_key(start): total for start, total in result.all()}
+
+    entries = None
+    if include_entries:
+        result = await db.execute(
+            select(TimeEntry)
+            .options(*ENTRY_LOAD_OPTIONS)
+            .where(
+                TimeEntry.user_id == current_user_id,
+                TimeEntry.start_time >= datetime.combine(first_day, time.min),
+                TimeEntry.start_time < datetime.combine(last_day + timedelta(days=1), time.min),
+                TimeEntry.duration.isnot(None)
+            )
+            .order_by(TimeEntry.start_time.desc())
+        )
+        entries = result.scalars().all()
 
     return TimeSummary(
-        total_duration=total_duration,
+        total_duration=sum(by_task.values()),
         entries=entries,
+        granularity=granularity,
         by_task=by_task,
         by_date=by_date
     )
@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List
+from typing import Annotated, Optional, List, Literal, Union
 from datetime import datetime
 
 
@@ -66,7 +66,9 @@ class TaskUpdate(BaseModel):
 class TaskMove(BaseModel):
     """Task move schema"""
     status: str = Field(..., pattern="^(backlog|todo|in_progress|in_review|done)$")
-    position: Optional[int] = None
+    after_task_id: Optional[str] = Field(None, description="Place the task directly after this task")
+    before_task_id: Optional[str] = Field(None, description="Place the task directly before this task")
+    position: Optional[int] = Field(None, ge=0, description="Legacy zero-based index in the column")
 
 
 class TaskResponse(TaskBase):
@@ -74,6 +76,7 @@ class TaskResponse(TaskBase):
     id: str
     created_by: str
     position: Optional[int] = None
+    rank: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     assignee: Optional[UserResponse] = None
@@ -82,6 +85,64 @@ class TaskResponse(TaskBase):
         from_attributes = True
 
 
+class TaskBatchCreate(BaseModel):
+    """Batch operation creating a task"""
+    op: Literal["create"]
+    data: TaskCreate
+
+
+class TaskBatchUpdate(BaseModel):
+    """Batch operation updating a task"""
+    op: Literal["update"]
+    task_id: str
+    data: TaskUpdate
+
+
+class TaskBatchMove(BaseModel):
+    """Batch operation moving a task"""
+    op: Literal["move"]
+    task_id: str
+    data: TaskMove
+
+
+class TaskBatchAssign(BaseModel):
+    """Batch operation assigning a task"""
+    op: Literal["assign"]
+    task_id: str
+    assignee_id: str
+
+
+class TaskBatchDelete(BaseModel):
+    """Batch operation deleting a task"""
+    op: Literal["delete"]
+    task_id: str
+
+
+TaskBatchOperation = Annotated[
+    Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchMove, TaskBatchAssign, TaskBatchDelete],
+    Field(discriminator="op")
+]
+
+
+class TaskBatchRequest(BaseModel):
+    """Task batch schema; operations are applied in order"""
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBatchResult(BaseModel):
+    """Outcome of one batch operation"""
+    index: int
+    op: str
+    status_code: int
+    task: Optional[TaskResponse] = None
+    detail: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    """Task batch response schema, one result per operation"""
+    results: List[TaskBatchResult]
+
+
 # ============================================================================
 # Time Entry Schemas
 # ============================================================================
@@ -123,12 +184,27 @@ class TimeEntryResponse(TimeEntryBase):
         from_attributes = True
 
 
+class RunningTimerResponse(BaseModel):
+    """A running timer, as kept by the timer registry"""
+    id: str = Field(..., description="ID of the running time entry")
+    user_id: str
+    task_id: Optional[str] = None
+    start_time: datetime
+    elapsed: int = Field(..., description="Seconds the timer has been running")
+
+
 class TimeSummary(BaseModel):
     """Time summary response"""
     total_duration: int = Field(..., description="Total duration in seconds")
-    entries: List[TimeEntryResponse]
+    entries: Optional[List[TimeEntryResponse]] = Field(
+        None, description="Entries in the range, only with include_entries=true"
+    )
+    granularity: str = Field(default="day", description="Period covered by each by_date bucket")
     by_task: dict = Field(default_factory=dict, description="Duration grouped by task")
-    by_date: dict = Field(default_factory=dict, description="Duration grouped by date")
+    by_date: dict = Field(
+        default_factory=dict,
+        description="Duration grouped by period, keyed by the period's first day"
+    )
 
 
 # ============================================================================
@@ -269,6 +345,25 @@ class AnalyticsSummary(BaseModel):
     average_cycle_time: Optional[float] = Field(None, description="Average task cycle time in hours")
 
 
+# ============================================================================
+# Bulk Import Schemas
+# ============================================================================
+
+class ImportRowError(BaseModel):
+    """A rejected NDJSON line"""
+    line: int = Field(..., description="1-based line number in the request body")
+    detail: str
+
+
+class ImportReport(BaseModel):
+    """Outcome of a bulk NDJSON import"""
+    imported: int
+    rejected: int
+    errors: List[ImportRowError] = Field(..., description="The first rejected lines and why")
+    seconds: float
+    rows_per_second: float
+
+
 # ============================================================================
 # Authentication Schemas
 # ============================================================================
@@ -301,11 +396,19 @@ class WSMessage(BaseModel):
     data: Optional[dict] = None
 
 
+class WSTimerElapsed(BaseModel):
+    """A running timer in a timer:tick message"""
+    entry_id: str
+    user_id: str
+    task_id: Optional[str] = None
+    elapsed: int = Field(..., description="Elapsed time in seconds")
+
+
 class WSTimerUpdate(BaseModel):
-    """WebSocket timer update message"""
+    """WebSocket timer update message: every running timer the client subscribes to"""
     type: str = "timer:tick"
-    task_id: str
-    elapsed: int = Field(..., description="Elapsed time in seconds")
+    server_time: datetime = Field(..., description="UTC time the elapsed times were computed at")
+    timers: List[WSTimerElapsed]
 
 
 class WSTaskUpdate(BaseModel):
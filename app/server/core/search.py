@@ -0,0 +1,186 @@
+"""
+Full-text search index for tasks
+
+SQLite uses an external-content FTS5 table kept in sync with `tasks` by
+triggers; PostgreSQL uses a generated `tsvector` column with a GIN index.
+Other databases fall back to substring matching.
+
+The FTS5 table is keyed on the implicit rowid of `tasks`, whose primary key is
+a string. Anything that renumbers those rowids (VACUUM, or rebuilding the
+table as Alembic batch mode does) leaves the index pointing at the wrong rows,
+so migrations alter `tasks` in place where they can; one that has to rebuild
+it must also recreate the triggers, which go with the old table, and rebuild
+the index (see 0008). verify_search_index() checks the index on every startup
+and rebuilds it if it no longer matches.
+"""
+
+import logging
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import DDL, Table, column, event, func, inspect, literal_column, or_, table
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DatabaseError
+from sqlalchemy.sql import Select
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "tasks_fts"
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='tasks', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='3 4'
+    )
+    """,
+    # Weight title matches above description matches, like the Postgres A/B weights
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+]
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+]
+
+# Shorter terms match whole words only: a one- or two-letter prefix matches most
+# of the index and would make ranking cost proportional to the table size
+MIN_PREFIX_LENGTH = 3
+
+fts = table(FTS_TABLE, column("rowid"), column("rank"))
+search_vector = literal_column("tasks.search_vector")
+
+
+def is_search_index_table(name: str) -> bool:
+    """True for the FTS5 table and its shadow tables (tasks_fts_data, tasks_fts_idx, ...)"""
+    return name == FTS_TABLE or name.startswith(f"{FTS_TABLE}_")
+
+
+def register_search_index(tasks_table: Table) -> None:
+    """Create/drop the search index alongside the tasks table in metadata.create_all/drop_all"""
+    for statement in SQLITE_DDL:
+        event.listen(tasks_table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in POSTGRES_DDL:
+        event.listen(tasks_table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+    # The FTS5 shadow table is not part of the metadata, so drop it explicitly
+    event.listen(
+        tasks_table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+    )
+
+
+def ensure_search_index(conn: Connection) -> None:
+    """
+    Install the search index on an existing database and index current rows
+
+    Safe to run on every startup; does nothing once the index exists.
+    """
+    dialect = conn.dialect.name
+    inspector = inspect(conn)
+
+    if dialect == "sqlite" and FTS_TABLE not in inspector.get_table_names():
+        for statement in SQLITE_DDL:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    elif dialect == "postgresql":
+        columns = {col["name"] for col in inspector.get_columns("tasks")}
+        if "search_vector" not in columns:
+            for statement in POSTGRES_DDL:
+                conn.exec_driver_sql(statement)
+
+
+def verify_search_index(conn: Connection) -> None:
+    """
+    Rebuild the SQLite search index if it no longer matches the tasks table
+
+    FTS5's integrity check compares the index with the content table, which
+    catches rowids renumbered behind the triggers' back. No-op elsewhere.
+    """
+    if conn.dialect.name != "sqlite" or FTS_TABLE not in inspect(conn).get_table_names():
+        return
+
+    try:
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('integrity-check', 1)")
+    except DatabaseError:
+        logger.warning("Search index is out of sync with tasks; rebuilding it")
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _terms(search: str) -> list:
+    """Split user input into index tokens, dropping query-syntax characters"""
+    return re.findall(r"\w+", search.lower())
+
+
+def apply_search(
+    query: Select,
+    task_table: Table,
+    dialect: str,
+    search: str
+) -> Tuple[Select, Optional[object]]:
+    """
+    Restrict a task query to rows matching `search`
+
+    Every term must match, and terms of MIN_PREFIX_LENGTH or more characters
+    match as word prefixes so results update while the user is still typing.
+    Returns the filtered query and a rank expression to order by (best first),
+    or None when the database has no text index.
+    """
+    terms = _terms(search)
+    if not terms:
+        return query, None
+
+    if dialect == "sqlite":
+        match = " ".join(
+            f'"{term}"*' if len(term) >= MIN_PREFIX_LENGTH else f'"{term}"' for term in terms
+        )
+        # Every match that passes the caller's filters is ranked; the caller's
+        # LIMIT bounds the rows returned, not the rows considered
+        query = query.join(fts, fts.c.rowid == literal_column("tasks.rowid")).where(
+            literal_column(FTS_TABLE).op("MATCH")(match)
+        )
+        # FTS5 rank is bm25(), where lower is better
+        return query, fts.c.rank.asc()
+
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery(
+            "simple",
+            " & ".join(f"{term}:*" if len(term) >= MIN_PREFIX_LENGTH else term for term in terms)
+        )
+        query = query.where(search_vector.op("@@")(tsquery))
+        return query, func.ts_rank(search_vector, tsquery).desc()
+
+    for term in terms:
+        pattern = f"%{term}%"
+        query = query.where(
+            or_(task_table.c.title.ilike(pattern), task_table.c.description.ilike(pattern))
+        )
+    return query, None
@@ -0,0 +1,56 @@
+"""
+Fast JSON path for large list responses
+
+By default FastAPI validates every returned ORM object against the
+endpoint's response_model, converts the result with jsonable_encoder and
+encodes it with json. For lists of thousands of tasks or time entries that
+dominates the request. With settings.FAST_JSON_RESPONSES the list endpoints
+instead copy the response fields straight off the ORM objects, using
+serializers built once from the response schemas, and encode them with
+orjson. The JSON is the same; the schema is trusted rather than checked,
+which holds for rows the application wrote itself.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from core.schemas import SprintResponse, TaskResponse, TimeEntryResponse, UserResponse
+
+
+class ModelSerializer:
+    """Turns ORM objects into the dicts a response schema would dump, without validating them"""
+
+    def __init__(self, schema: Type[BaseModel], nested: Optional[Dict[str, "ModelSerializer"]] = None):
+        # (field name, value for objects without the attribute), in schema order
+        self.fields = tuple(
+            (name, field.get_default(call_default_factory=True))
+            for name, field in schema.model_fields.items()
+        )
+        self.nested = nested or {}
+
+    def __call__(self, obj: Any) -> Dict[str, Any]:
+        row = {name: getattr(obj, name, default) for name, default in self.fields}
+        for name, serializer in self.nested.items():
+            value = row[name]
+            if isinstance(value, list):
+                row[name] = serializer.many(value)
+            elif value is not None:
+                row[name] = serializer(value)
+        return row
+
+    def many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        return [self(obj) for obj in objs]
+
+
+serialize_user = ModelSerializer(UserResponse)
+serialize_task = ModelSerializer(TaskResponse, {"assignee": serialize_user})
+serialize_time_entry = ModelSerializer(TimeEntryResponse, {"task": serialize_task})
+serialize_sprint = ModelSerializer(SprintResponse, {"tasks": serialize_task})
+
+
+def fast_json_response(content: Any, response: Response) -> ORJSONResponse:
+    """Encode serialized content with orjson, keeping the headers already set on `response`"""
+    return ORJSONResponse(content=content, headers=dict(response.headers))
@@ -0,0 +1,92 @@
+"""
+Server-side timer ticks for WebSocket clients
+
+Dashboards used to run a clock per browser from whatever start time they had
+seen. Instead, every WS_TIMER_TICK_INTERVAL seconds the ticker reads the
+running timers from the timer registry and queues one "timer:tick" frame per
+connection covering every timer it subscribes to: all of them for the board,
+and those of the user or task for "user:<id>" and "task:<id>". Elapsed times
+are computed here, once, so every client shows the same value.
+
+Connections subscribed to the same topics share one serialized frame, so a
+tick costs one encode per distinct subscription, not per client.
+
+Each process ticks its own connections and sends nothing through the broker;
+with several workers, TIMER_REGISTRY=redis gives them all every timer.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import FrozenSet, List, Optional, Set, Tuple
+
+from core.config import settings
+from core.timers import TimerRegistry, timer_registry
+from core.websocket import ConnectionManager, manager, serialize, timer_topics
+
+logger = logging.getLogger(__name__)
+
+
+class TimerTicker:
+    """Pushes the elapsed time of running timers to subscribed WebSocket clients"""
+
+    def __init__(self, manager: ConnectionManager, registry: TimerRegistry, interval: float):
+        self.manager = manager
+        self.registry = registry
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start ticking in the background; an interval of 0 disables ticks"""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                # A registry outage skips ticks; clients keep their last values
+                logger.warning(f"Timer tick failed: {e!r}")
+
+    async def tick(self, now: Optional[datetime] = None) -> None:
+        """Queue one timer:tick frame for every connection subscribed to a running timer"""
+        if not self.manager.connections:
+            return
+        timers = await self.registry.all()
+        if not timers:
+            return
+
+        now = now or datetime.utcnow()
+        server_time = now.isoformat()
+        # (timer as sent, topics it is published to), most recently started first
+        ticking: List[Tuple[dict, Set[str]]] = [
+            (
+                {
+                    "entry_id": timer.id,
+                    "user_id": timer.user_id,
+                    "task_id": timer.task_id,
+                    "elapsed": timer.elapsed(now),
+                },
+                set(timer_topics(timer.user_id, timer.task_id)),
+            )
+            for timer in sorted(timers, key=lambda timer: timer.start_time, reverse=True)
+        ]
+
+        def frame(topics: FrozenSet[str]) -> Optional[str]:
+            subscribed = [item for item, item_topics in ticking if not item_topics.isdisjoint(topics)]
+            if not subscribed:
+                return None
+            return serialize({"type": "timer:tick", "server_time": server_time, "timers": subscribed})
+
+        self.manager.send_per_topics(frame)
+
+
+ticker = TimerTicker(manager, timer_registry, settings.WS_TIMER_TICK_INTERVAL)
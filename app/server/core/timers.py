@@ -0,0 +1,179 @@
+"""
+Registry of running timers, answering "who is timing what" without a query
+
+Timer starts and stops, and every dashboard showing what is currently
+running, used to filter time_entries on is_running. The registry keeps each
+user's running timer instead: it is loaded from the database at startup and
+updated by the time tracking router after each commit, so
+GET /api/time/running and the /ws timer events are answered from memory.
+
+- MemoryTimerRegistry: per process, the default; right for a single worker.
+- RedisTimerRegistry: one hash shared by every worker, so a timer started
+  through one worker is seen by all of them.
+
+The database remains the source of truth (its partial unique index allows
+one running timer per user) and the registry is rebuilt from it on startup.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import select
+
+from core.config import settings
+from core.models import TimeEntry
+
+
+class RunningTimer(NamedTuple):
+    """A user's running timer: the open time entry and when it started"""
+    id: str
+    user_id: str
+    task_id: Optional[str]
+    start_time: datetime
+
+    def elapsed(self, now: Optional[datetime] = None) -> int:
+        """Whole seconds the timer has been running"""
+        return max(0, int(((now or datetime.utcnow()) - self.start_time).total_seconds()))
+
+    def describe(self, now: Optional[datetime] = None) -> dict:
+        """The timer as sent to WebSocket clients"""
+        return {
+            "entry_id": self.id,
+            "user_id": self.user_id,
+            "task_id": self.task_id,
+            "start_time": self.start_time.isoformat(),
+            "elapsed": self.elapsed(now),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps({**self._asdict(), "start_time": self.start_time.isoformat()})
+
+    @classmethod
+    def from_json(cls, value) -> "RunningTimer":
+        data = json.loads(value)
+        return cls(**{**data, "start_time": datetime.fromisoformat(data["start_time"])})
+
+
+async def running_timers(db) -> List[RunningTimer]:
+    """Read every running timer from the database (an AsyncSession or AsyncConnection)"""
+    result = await db.execute(
+        select(TimeEntry.id, TimeEntry.user_id, TimeEntry.task_id, TimeEntry.start_time)
+        .where(TimeEntry.is_running.is_(True))
+    )
+    return [RunningTimer(*row) for row in result]
+
+
+class TimerRegistry:
+    """Running timers by user ID"""
+
+    async def load(self, timers: Iterable[RunningTimer]) -> None:
+        """Replace every timer with `timers`, as read from the database"""
+
+    async def started(self, timer: RunningTimer) -> None:
+        """Record a committed timer start, replacing the user's previous timer"""
+
+    async def stopped(self, user_id: str, entry_id: str) -> None:
+        """Forget the user's timer if it is still entry `entry_id`"""
+
+    async def get(self, user_id: str) -> Optional[RunningTimer]:
+        """The user's running timer, if any"""
+
+    async def all(self) -> List[RunningTimer]:
+        """Every running timer"""
+
+    async def clear(self) -> None:
+        """Forget every timer"""
+        await self.load([])
+
+    async def close(self) -> None:
+        """Release connections"""
+
+
+class MemoryTimerRegistry(TimerRegistry):
+    """Timers held in this process"""
+
+    def __init__(self):
+        self.timers: Dict[str, RunningTimer] = {}
+
+    async def load(self, timers: Iterable[RunningTimer]) -> None:
+        self.timers = {timer.user_id: timer for timer in timers}
+
+    async def started(self, timer: RunningTimer) -> None:
+        self.timers[timer.user_id] = timer
+
+    async def stopped(self, user_id: str, entry_id: str) -> None:
+        timer = self.timers.get(user_id)
+        # A stop that lost a race to a newer start must not forget the new timer
+        if timer is not None and timer.id == entry_id:
+            del self.timers[user_id]
+
+    async def get(self, user_id: str) -> Optional[RunningTimer]:
+        return self.timers.get(user_id)
+
+    async def all(self) -> List[RunningTimer]:
+        return list(self.timers.values())
+
+
+# Deletes the user's field only while it still holds the stopped entry
+STOP_IF_CURRENT = """
+local value = redis.call('HGET', KEYS[1], ARGV[1])
+if value and cjson.decode(value)['id'] == ARGV[2] then
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+
+class RedisTimerRegistry(TimerRegistry):
+    """Timers shared by every worker in one Redis hash, user ID -> timer JSON"""
+
+    def __init__(self, url: str, key: str):
+        self.url = url
+        self.key = key
+        self._redis = None
+
+    def _client(self):
+        if self._redis is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError as e:
+                raise RuntimeError("TIMER_REGISTRY=redis requires the redis package") from e
+            self._redis = aioredis.from_url(self.url)
+        return self._redis
+
+    async def load(self, timers: Iterable[RunningTimer]) -> None:
+        mapping = {timer.user_id: timer.to_json() for timer in timers}
+        async with self._client().pipeline(transaction=True) as pipe:
+            pipe.delete(self.key)
+            if mapping:
+                pipe.hset(self.key, mapping=mapping)
+            await pipe.execute()
+
+    async def started(self, timer: RunningTimer) -> None:
+        await self._client().hset(self.key, timer.user_id, timer.to_json())
+
+    async def stopped(self, user_id: str, entry_id: str) -> None:
+        await self._client().eval(STOP_IF_CURRENT, 1, self.key, user_id, entry_id)
+
+    async def get(self, user_id: str) -> Optional[RunningTimer]:
+        value = await self._client().hget(self.key, user_id)
+        return RunningTimer.from_json(value) if value is not None else None
+
+    async def all(self) -> List[RunningTimer]:
+        return [RunningTimer.from_json(value) for value in (await self._client().hgetall(self.key)).values()]
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def create_timer_registry() -> TimerRegistry:
+    """Build the registry selected by settings.TIMER_REGISTRY"""
+    if settings.TIMER_REGISTRY == "redis":
+        return RedisTimerRegistry(settings.REDIS_URL, settings.TIMER_REGISTRY_KEY)
+    return MemoryTimerRegistry()
+
+
+timer_registry = create_timer_registry()
@@ -0,0 +1,344 @@
+"""
+WebSocket connection management and event fan-out
+
+Each connection gets a bounded outgoing queue drained by its own sender task,
+so a broadcast only serializes the message once and enqueues it; a slow or
+stalled client delays nobody but itself. Clients whose queue overflows, or
+whose send exceeds the timeout, are evicted and can reconnect.
+
+Clients subscribe to topics ("board", "sprint:<id>", "user:<id>",
+"task:<id>"), and a topic -> connections index means publishing an event only
+touches that topic's subscribers.
+
+publish() and broadcast() also hand each event to a broker (core.pubsub) so
+that clients connected to other server processes receive it too.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from core.config import settings
+from core.pubsub import Broker, InMemoryBroker, create_broker
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to evicted clients ("Try Again Later")
+EVICTED_CLOSE_CODE = 1013
+
+# Number of recent deliveries the latency percentiles are computed over
+LATENCY_SAMPLES = 10_000
+
+# The shared Kanban board; every connection starts subscribed to it
+BOARD_TOPIC = "board"
+TOPIC_PATTERN = re.compile(r"^(board|(sprint|user|task):[\w-]{1,64})$")
+MAX_TOPICS_PER_CONNECTION = 256
+
+
+def is_valid_topic(topic: str) -> bool:
+    return isinstance(topic, str) and TOPIC_PATTERN.match(topic) is not None
+
+
+def timer_topics(user_id: Optional[str], task_id: Optional[str]) -> List[str]:
+    """
+    Timer events go to the board, which shows running timers, as well as to
+    the user's and the task's subscribers
+    """
+    topics = [BOARD_TOPIC]
+    if user_id:
+        topics.append(f"user:{user_id}")
+    if task_id:
+        topics.append(f"task:{task_id}")
+    return topics
+
+
+def serialize(message: dict) -> str:
+    """Encode a message the same way WebSocket.send_json does"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class FanoutStats:
+    """Counters and latency samples for broadcast delivery"""
+
+    def __init__(self):
+        self.messages = 0
+        self.deliveries = 0
+        self.evictions = 0
+        # Seconds from broadcast() to the send completing, per delivery
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def record_delivery(self, latency: float) -> None:
+        self.deliveries += 1
+        self.latencies.append(latency)
+
+    def snapshot(self) -> dict:
+        """Current counters plus fan-out latency percentiles in milliseconds"""
+        samples = sorted(self.latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not samples:
+                return None
+            index = min(len(samples) - 1, int(fraction * len(samples)))
+            return round(samples[index] * 1000, 3)
+
+        return {
+            "messages": self.messages,
+            "deliveries": self.deliveries,
+            "evictions": self.evictions,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(samples[-1] * 1000, 3) if samples else None,
+            },
+        }
+
+
+class Connection:
+    """A connected client and its outgoing message queue"""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        # (serialized message, time.perf_counter() when broadcast)
+        self.queue: asyncio.Queue[Tuple[str, float]] = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+        self.topics: Set[str] = set()
+        # time.perf_counter() when the in-flight send started, None when idle
+        self.send_started: Optional[float] = None
+
+
+class ConnectionManager:
+    """Manage WebSocket connections and fan out broadcasts to them"""
+
+    def __init__(
+        self,
+        queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        send_timeout: float = settings.WS_SEND_TIMEOUT,
+        broker: Optional[Broker] = None
+    ):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.broker = broker or InMemoryBroker()
+        self.connections: Dict[WebSocket, Connection] = {}
+        self.subscribers: Dict[str, Set[Connection]] = {}
+        self.stats = FanoutStats()
+        self._closing: Set[asyncio.Task] = set()
+        self._reaper: Optional[asyncio.Task] = None
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.connections)
+
+    async def start(self) -> None:
+        """Start receiving events published by other server processes"""
+        await self.broker.start(self._deliver)
+
+    async def connect(self, websocket: WebSocket, topics: Iterable[str] = (BOARD_TOPIC,)) -> None:
+        await websocket.accept()
+        self.register(websocket, topics)
+        logger.info(f"WebSocket connected. Total connections: {len(self.connections)}")
+
+    def register(self, websocket: WebSocket, topics: Iterable[str] = (BOARD_TOPIC,)) -> Connection:
+        """Start delivering broadcasts to an already accepted websocket"""
+        connection = Connection(websocket, self.queue_size)
+        connection.sender = asyncio.create_task(self._send_loop(connection))
+        self.connections[websocket] = connection
+        self.subscribe(websocket, topics)
+
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_stalled())
+        return connection
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        """Stop delivering to a websocket; safe to call more than once"""
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
+
+        self._unindex(connection, list(connection.topics))
+        if connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+        logger.info(f"WebSocket disconnected. Total connections: {len(self.connections)}")
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]) -> Set[str]:
+        """
+        Add topics to a connection's subscriptions and return the full set
+
+        Raises:
+            ValueError: If a topic is malformed or the connection would exceed
+                MAX_TOPICS_PER_CONNECTION
+        """
+        connection = self.connections[websocket]
+        topics = set(topics)
+
+        invalid = sorted(topic for topic in topics if not is_valid_topic(topic))
+        if invalid:
+            raise ValueError(f"Invalid topics: {', '.join(map(str, invalid))}")
+        if len(connection.topics | topics) > MAX_TOPICS_PER_CONNECTION:
+            raise ValueError(f"At most {MAX_TOPICS_PER_CONNECTION} topics per connection")
+
+        for topic in topics - connection.topics:
+            self.subscribers.setdefault(topic, set()).add(connection)
+        connection.topics |= topics
+        return set(connection.topics)
+
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]) -> Set[str]:
+        """Remove topics from a connection's subscriptions and return what is left"""
+        connection = self.connections[websocket]
+        self._unindex(connection, [topic for topic in topics if topic in connection.topics])
+        return set(connection.topics)
+
+    def _unindex(self, connection: Connection, topics: List[str]) -> None:
+        for topic in topics:
+            connection.topics.discard(topic)
+            subscribers = self.subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self.subscribers[topic]
+
+    def send(self, websocket: WebSocket, message: dict) -> None:
+        """Queue a message for one client, behind any broadcasts already queued for it"""
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+
+        self.stats.messages += 1
+        try:
+            connection.queue.put_nowait((serialize(message), time.perf_counter()))
+        except asyncio.QueueFull:
+            self._evict(connection, "send queue full")
+
+    async def broadcast(self, message: dict) -> None:
+        """Broadcast message to all connected clients, in every server process"""
+        text = serialize(message)
+        self.broadcast_text(text)
+        await self._forward(None, text)
+
+    def broadcast_text(self, text: str) -> None:
+        """Queue an already serialized message for every connection without waiting on any"""
+        self._enqueue(list(self.connections.values()), text)
+
+    async def publish(self, topics: Iterable[str], message: dict) -> None:
+        """Send a message to every connection subscribed to any of `topics`, in every server process"""
+        topics, text = list(topics), serialize(message)
+        self.publish_text(topics, text)
+        await self._forward(topics, text)
+
+    def publish_text(self, topics: Iterable[str], text: str) -> None:
+        """Queue an already serialized message for the topics' subscribers, once per connection"""
+        recipients: Set[Connection] = set()
+        for topic in topics:
+            recipients.update(self.subscribers.get(topic, ()))
+        self._enqueue(recipients, text)
+
+    def send_per_topics(self, build: Callable[[FrozenSet[str]], Optional[str]]) -> None:
+        """
+        Queue a frame for each connection built from the topics it subscribes to
+
+        `build` is called once per distinct set of topics, so connections
+        subscribed alike share one serialized frame; connections it returns
+        None for get nothing.
+        """
+        frames: Dict[FrozenSet[str], List[Connection]] = {}
+        for connection in self.connections.values():
+            frames.setdefault(frozenset(connection.topics), []).append(connection)
+
+        for topics, connections in frames.items():
+            text = build(topics)
+            if text is not None:
+                self._enqueue(connections, text)
+
+    def _deliver(self, topics: Optional[List[str]], text: str) -> None:
+        """Fan out an event received from another process to this process's clients"""
+        if topics is None:
+            self.broadcast_text(text)
+        else:
+            self.publish_text(topics, text)
+
+    async def _forward(self, topics: Optional[List[str]], text: str) -> None:
+        try:
+            await self.broker.publish(topics, text)
+        except Exception as e:
+            # Local clients already have the event; the others miss this one
+            logger.warning(f"Failed to forward WebSocket event to other processes: {e!r}")
+
+    def _enqueue(self, connections: Iterable[Connection], text: str) -> None:
+        self.stats.messages += 1
+        queued_at = time.perf_counter()
+
+        for connection in connections:
+            try:
+                connection.queue.put_nowait((text, queued_at))
+            except asyncio.QueueFull:
+                self._evict(connection, "send queue full")
+
+    async def shutdown(self) -> None:
+        """Stop every sender task and disconnect from the broker"""
+        tasks = [connection.sender for connection in self.connections.values()]
+        if self._reaper is not None:
+            tasks.append(self._reaper)
+            self._reaper = None
+        self.connections.clear()
+        self.subscribers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, *self._closing, return_exceptions=True)
+        await self.broker.close()
+
+    async def _send_loop(self, connection: Connection) -> None:
+        while True:
+            text, queued_at = await connection.queue.get()
+
+            connection.send_started = time.perf_counter()
+            try:
+                await connection.websocket.send_text(text)
+            except Exception as e:
+                self._evict(connection, f"send failed: {e!r}")
+                return
+            connection.send_started = None
+
+            self.stats.record_delivery(time.perf_counter() - queued_at)
+
+    async def _reap_stalled(self) -> None:
+        """
+        Evict clients whose current send has exceeded the timeout
+
+        One periodic sweep instead of a timeout per send keeps the per-message
+        cost of a delivery to a single await.
+        """
+        while self.connections:
+            await asyncio.sleep(self.send_timeout / 2)
+            deadline = time.perf_counter() - self.send_timeout
+            for connection in list(self.connections.values()):
+                if connection.send_started is not None and connection.send_started < deadline:
+                    self._evict(connection, "send timed out")
+
+    def _evict(self, connection: Connection, reason: str) -> None:
+        """Drop a lagging or broken client and close its socket in the background"""
+        if self.connections.get(connection.websocket) is not connection:
+            return
+
+        logger.warning(f"Evicting WebSocket client: {reason}")
+        self.stats.evictions += 1
+        self.disconnect(connection.websocket)
+
+        closing = asyncio.create_task(self._close(connection.websocket))
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(code=EVICTED_CLOSE_CODE), self.send_timeout)
+        except Exception:
+            # The client is already gone or not reading; nothing left to do
+            pass
+
+
+manager = ConnectionManager(broker=create_broker())
@@ -0,0 +1,43 @@
+"""composite indexes for hot query paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 22:48:49.365370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('github_prs', schema=None) as batch_op:
+        batch_op.create_index('ix_github_prs_author_id_status_created_at', ['author_id', 'status', 'created_at'], unique=False)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tasks_assignee_id'), ['assignee_id'], unique=False)
+        batch_op.create_index('ix_tasks_status_position', ['status', 'position'], unique=False)
+
+    with op.batch_alter_table('time_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_time_entries_user_id_is_running', ['user_id', 'is_running'], unique=False)
+        batch_op.create_index('ix_time_entries_user_id_start_time', ['user_id', 'start_time'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('time_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_time_entries_user_id_start_time')
+        batch_op.drop_index('ix_time_entries_user_id_is_running')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_status_position')
+        batch_op.drop_index(batch_op.f('ix_tasks_assignee_id'))
+
+    with op.batch_alter_table('github_prs', schema=None) as batch_op:
+        batch_op.drop_index('ix_github_prs_author_id_status_created_at')
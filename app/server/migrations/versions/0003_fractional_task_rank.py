@@ -0,0 +1,90 @@
+"""fractional task rank
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 22:54:06.566062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rank helpers as of this revision (see core/ranking.py), frozen so the
+# backfill replays the same way however the ranking scheme changes later
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+WIDTH = 12
+STEP = BASE ** 6
+FIRST_RANK = "i"
+
+
+def evenly_spaced(count):
+    """`count` ascending base-36 ranks centred in a WIDTH-digit key space"""
+    if count <= 0:
+        return []
+
+    step = min(STEP, BASE ** WIDTH // (count + 1))
+    start = (BASE ** WIDTH - step * (count - 1)) // 2
+    ranks = []
+    for i in range(count):
+        value, digits = start + i * step, []
+        for _ in range(WIDTH):
+            value, remainder = divmod(value, BASE)
+            digits.append(DIGITS[remainder])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+tasks = sa.table(
+    'tasks',
+    sa.column('id', sa.String),
+    sa.column('status', sa.String),
+    sa.column('position', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+    sa.column('rank', sa.String),
+)
+
+
+def upgrade() -> None:
+    # Plain ALTER TABLE: recreating `tasks` in batch mode would renumber the
+    # rowids the SQLite search index points at
+    op.add_column('tasks', sa.Column('rank', sa.String(length=64), nullable=False, server_default=FIRST_RANK))
+
+    # Rank existing cards in their previous board order
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(tasks.c.id, tasks.c.status).order_by(
+            tasks.c.status,
+            tasks.c.position.asc().nulls_first(),
+            tasks.c.created_at.desc(),
+            tasks.c.id.desc(),
+        )
+    ).all()
+
+    columns = {}
+    for task_id, status in rows:
+        columns.setdefault(status, []).append(task_id)
+
+    update = tasks.update().where(tasks.c.id == sa.bindparam('task_id')).values(rank=sa.bindparam('new_rank'))
+    for task_ids in columns.values():
+        conn.execute(update, [
+            {'task_id': task_id, 'new_rank': rank}
+            for task_id, rank in zip(task_ids, evenly_spaced(len(task_ids)))
+        ])
+
+    op.drop_index('ix_tasks_status_position', table_name='tasks')
+    op.create_index('ix_tasks_status_rank', 'tasks', ['status', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_rank', table_name='tasks')
+    op.create_index('ix_tasks_status_position', 'tasks', ['status', 'position'], unique=False)
+    op.drop_column('tasks', 'rank')
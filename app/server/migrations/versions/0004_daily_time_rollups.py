@@ -0,0 +1,50 @@
+"""daily time rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:42.976697
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Day of an entry's start_time, per dialect, as of this revision
+DAY_EXPRESSIONS = {
+    'sqlite': 'date(start_time)',
+    'postgresql': 'CAST(start_time AS DATE)',
+}
+
+
+def upgrade() -> None:
+    op.create_table('time_rollups',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('task_id', sa.String(length=36), nullable=False),
+    sa.Column('duration', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'task_id')
+    )
+
+    # Backfill from the entries logged so far
+    day = DAY_EXPRESSIONS.get(op.get_bind().dialect.name, 'CAST(start_time AS DATE)')
+    op.execute(
+        "INSERT INTO time_rollups (user_id, day, task_id, duration, entries) "
+        f"SELECT user_id, {day}, COALESCE(task_id, ''), SUM(duration), COUNT(*) "
+        "FROM time_entries WHERE duration IS NOT NULL "
+        f"GROUP BY user_id, {day}, COALESCE(task_id, '')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('time_rollups')
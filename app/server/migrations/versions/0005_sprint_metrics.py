@@ -0,0 +1,52 @@
+"""sprint metrics
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:02:14.872968
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sprint_metrics',
+    sa.Column('sprint_id', sa.String(length=36), nullable=False),
+    sa.Column('sprint_name', sa.String(length=255), nullable=False),
+    sa.Column('end_date', sa.DateTime(), nullable=False),
+    sa.Column('tasks_completed', sa.Integer(), nullable=False),
+    sa.Column('story_points', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['sprint_id'], ['sprints.id'], ),
+    sa.PrimaryKeyConstraint('sprint_id')
+    )
+    with op.batch_alter_table('sprint_metrics', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sprint_metrics_end_date'), ['end_date'], unique=False)
+
+    # Snapshot the sprints completed so far from their current tasks
+    op.execute(
+        "INSERT INTO sprint_metrics (sprint_id, sprint_name, end_date, tasks_completed, story_points) "
+        "SELECT sprints.id, sprints.name, sprints.end_date, "
+        "COUNT(tasks.id), COALESCE(SUM(CASE WHEN tasks.id IS NOT NULL THEN sprint_tasks.story_points END), 0) "
+        "FROM sprints "
+        "LEFT JOIN sprint_tasks ON sprint_tasks.sprint_id = sprints.id "
+        "LEFT JOIN tasks ON tasks.id = sprint_tasks.task_id AND tasks.status = 'done' "
+        "WHERE sprints.status = 'completed' "
+        "GROUP BY sprints.id, sprints.name, sprints.end_date"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('sprint_metrics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sprint_metrics_end_date'))
+
+    op.drop_table('sprint_metrics')
@@ -0,0 +1,49 @@
+"""task status events
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:04:39.326725
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_status_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('task_id', sa.String(length=36), nullable=False),
+    sa.Column('from_status', sa.String(length=50), nullable=True),
+    sa.Column('to_status', sa.String(length=50), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('task_status_events', schema=None) as batch_op:
+        batch_op.create_index('ix_task_status_events_task_id_changed_at', ['task_id', 'changed_at'], unique=False)
+
+    # Seed one event per existing task. The real history is unknown: done
+    # tasks are taken to have finished at their last update, the rest to have
+    # held their current status since creation.
+    op.execute(
+        "INSERT INTO task_status_events (task_id, from_status, to_status, changed_at) "
+        "SELECT id, NULL, status, "
+        "CASE WHEN status = 'done' THEN COALESCE(updated_at, created_at, CURRENT_TIMESTAMP) "
+        "ELSE COALESCE(created_at, CURRENT_TIMESTAMP) END "
+        "FROM tasks"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('task_status_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_status_events_task_id_changed_at')
+
+    op.drop_table('task_status_events')
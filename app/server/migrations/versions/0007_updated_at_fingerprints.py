@@ -0,0 +1,66 @@
+"""updated_at fingerprints
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:09:45.326309
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('github_prs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_github_prs_updated_at'), ['updated_at'], unique=False)
+
+    # Existing rows were last changed no earlier than they were created. SQLite
+    # cannot add a column with a non-constant default, so the default is set
+    # afterwards (batch mode rebuilds the table there)
+    with op.batch_alter_table('sprints', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE sprints SET updated_at = created_at")
+    with op.batch_alter_table('sprints', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', server_default=sa.func.now())
+        batch_op.create_index(batch_op.f('ix_sprints_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tasks_updated_at'), ['updated_at'], unique=False)
+
+    # As for sprints
+    with op.batch_alter_table('time_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE time_entries SET updated_at = created_at")
+    with op.batch_alter_table('time_entries', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', server_default=sa.func.now())
+        batch_op.create_index(batch_op.f('ix_time_entries_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_updated_at'))
+
+    with op.batch_alter_table('time_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_time_entries_updated_at'))
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tasks_updated_at'))
+
+    with op.batch_alter_table('sprints', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sprints_updated_at'))
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('github_prs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_github_prs_updated_at'))
@@ -0,0 +1,188 @@
+"""binary uuid keys
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 09:12:04.518837
+
+"""
+import uuid
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every column holding a row key
+KEY_COLUMNS: Dict[str, List[str]] = {
+    'users': ['id'],
+    'tasks': ['id', 'assignee_id', 'created_by'],
+    'task_status_events': ['task_id'],
+    'time_entries': ['id', 'task_id', 'user_id'],
+    'time_rollups': ['user_id', 'task_id'],
+    'sprints': ['id'],
+    'sprint_metrics': ['sprint_id'],
+    'sprint_tasks': ['sprint_id', 'task_id'],
+    'github_prs': ['id', 'author_id'],
+    'github_sync_log': ['id', 'user_id'],
+}
+
+# Rows rewritten per statement on SQLite
+BATCH_SIZE = 10000
+
+NIL_UUID = uuid.UUID(int=0)
+
+# core.ids.LEGACY_ID_NAMESPACE, which must never change
+LEGACY_ID_NAMESPACE = uuid.UUID("6f1d3c9e-2b4a-4e8f-9a51-7c0d2e6b8f34")
+
+CANONICAL_UUID_PATTERN = '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+
+# Search index triggers as of this revision; rebuilding `tasks` drops them
+SQLITE_SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+]
+
+
+def legacy_uuid(key: str) -> uuid.UUID:
+    """Same mapping as core.ids.legacy_uuid: UUIDs are kept, "" becomes nil, anything else a UUIDv5"""
+    if key == "":
+        return NIL_UUID
+    try:
+        return uuid.UUID(key)
+    except ValueError:
+        return uuid.uuid5(LEGACY_ID_NAMESPACE, key)
+
+
+def to_bytes(key: Optional[str]) -> Optional[bytes]:
+    return None if key is None else legacy_uuid(key).bytes
+
+
+def to_text(key: Optional[bytes]) -> Optional[str]:
+    if key is None:
+        return None
+    key = uuid.UUID(bytes=bytes(key))
+    return "" if key == NIL_UUID else str(key)
+
+
+def rewrite_sqlite_keys(table: str, columns: List[str], convert: Callable) -> None:
+    """Pass every row's key columns through `convert`, a batch of rowids at a time"""
+    conn = op.get_bind()
+    update = sa.text(
+        f"UPDATE {table} SET {', '.join(f'{c} = :{c}' for c in columns)} WHERE rowid = :rowid"
+    )
+    last = float('-inf')
+    while True:
+        rows = conn.execute(
+            sa.text(f"SELECT rowid, {', '.join(columns)} FROM {table} WHERE rowid > :last ORDER BY rowid LIMIT :limit"),
+            {'last': last, 'limit': BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [
+            {'rowid': row[0], **{column: convert(key) for column, key in zip(columns, row[1:])}}
+            for row in rows
+        ])
+        last = rows[-1][0]
+
+
+def retype_sqlite_keys(type_: sa.types.TypeEngine, existing_type: sa.types.TypeEngine) -> None:
+    # SQLite keeps a value's storage class whatever the column's declared
+    # type, so the values are converted in place first and the batch copy
+    # only changes the declaration
+    for table, columns in KEY_COLUMNS.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=type_, existing_type=existing_type)
+
+    # Recreating `tasks` dropped the search index triggers and may have
+    # renumbered the rowids the index points at
+    for statement in SQLITE_SEARCH_TRIGGERS:
+        op.execute(statement)
+    op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def retype_postgresql_keys(type_: sa.types.TypeEngine, existing_type: sa.types.TypeEngine, using: str) -> None:
+    # A foreign key cannot join columns of different types, so the
+    # constraints are dropped while the two sides are converted
+    inspector = sa.inspect(op.get_bind())
+    foreign_keys = [(table, fk) for table in KEY_COLUMNS for fk in inspector.get_foreign_keys(table)]
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+    for table, columns in KEY_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=type_, existing_type=existing_type,
+                postgresql_using=using.format(column=column)
+            )
+
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'], table, fk['referred_table'], fk['constrained_columns'], fk['referred_columns']
+        )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    if conn.dialect.name == 'postgresql':
+        # Keys that are not UUIDs get the UUID legacy_uuid() gives them
+        for table, columns in KEY_COLUMNS.items():
+            for column in columns:
+                keys = conn.execute(
+                    sa.text(f"SELECT DISTINCT {column} FROM {table} WHERE {column} !~ :pattern"),
+                    {'pattern': CANONICAL_UUID_PATTERN}
+                ).scalars().all()
+                if keys:
+                    conn.execute(
+                        sa.text(f"UPDATE {table} SET {column} = :new WHERE {column} = :old"),
+                        [{'old': key, 'new': str(legacy_uuid(key))} for key in keys]
+                    )
+        retype_postgresql_keys(postgresql.UUID(), sa.String(length=36), '{column}::uuid')
+    else:
+        for table, columns in KEY_COLUMNS.items():
+            rewrite_sqlite_keys(table, columns, to_bytes)
+        retype_sqlite_keys(sa.LargeBinary(length=16), sa.String(length=36))
+
+
+def downgrade() -> None:
+    # Keys that were not UUIDs before the upgrade keep their UUIDs, except the
+    # empty key of time not logged against a task
+    conn = op.get_bind()
+
+    if conn.dialect.name == 'postgresql':
+        retype_postgresql_keys(sa.String(length=36), postgresql.UUID(), '{column}::text')
+        conn.execute(
+            sa.text("UPDATE time_rollups SET task_id = '' WHERE task_id = :nil"),
+            {'nil': str(NIL_UUID)}
+        )
+    else:
+        for table, columns in KEY_COLUMNS.items():
+            rewrite_sqlite_keys(table, columns, to_text)
+        retype_sqlite_keys(sa.String(length=36), sa.LargeBinary(length=16))
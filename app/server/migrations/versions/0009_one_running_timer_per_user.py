@@ -0,0 +1,64 @@
+"""one running timer per user
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:37:44.925550
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keys are passed back as read, in whichever form the dialect stores them
+time_entries = sa.table(
+    'time_entries',
+    sa.column('id'),
+    sa.column('user_id'),
+    sa.column('start_time', sa.DateTime),
+    sa.column('end_time', sa.DateTime),
+    sa.column('is_running', sa.Boolean),
+)
+
+
+def upgrade() -> None:
+    # Races between timer requests may already have left a user with several
+    # running timers. Keep the latest running and close the others without a
+    # duration, so they stay out of the rollups like discarded entries
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(time_entries.c.id, time_entries.c.user_id)
+        .where(time_entries.c.is_running == sa.true())
+        .order_by(time_entries.c.user_id, time_entries.c.start_time.desc())
+    ).all()
+    latest, duplicates = set(), []
+    for entry_id, user_id in rows:
+        if user_id in latest:
+            duplicates.append(entry_id)
+        latest.add(user_id)
+    if duplicates:
+        conn.execute(
+            time_entries.update()
+            .where(time_entries.c.id == sa.bindparam('entry_id'))
+            .values(is_running=False, end_time=time_entries.c.start_time),
+            [{'entry_id': entry_id} for entry_id in duplicates]
+        )
+
+    with op.batch_alter_table('time_entries', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_time_entries_one_running_per_user', ['user_id'], unique=True,
+            sqlite_where=sa.text('is_running'), postgresql_where=sa.text('is_running')
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('time_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_time_entries_one_running_per_user')
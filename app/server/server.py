@@ -2,14 +2,22 @@
 Developer Productivity Dashboard - Main FastAPI Application
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from typing import List, Optional
 import logging
 
+from core.cache import response_cache
 from core.config import settings
-from core.database import engine, Base
+from core.database import engine, read_engine
+from core.migrations import run_migrations
+from core.pagination import NEXT_CURSOR_HEADER
+from core.replica import ReadYourWritesMiddleware
 from core.routers import auth, tasks, time_tracking, github, analytics, sprints
+from core.ticker import ticker
+from core.timers import running_timers, timer_registry
+from core.websocket import BOARD_TOPIC, is_valid_topic, manager
 
 # Configure logging
 logging.basicConfig(
@@ -25,14 +33,32 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Developer Productivity Dashboard...")
 
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created")
+    # Apply database migrations
+    async with engine.begin() as conn:
+        await conn.run_sync(run_migrations)
+    logger.info("Database migrations applied")
+
+    # Serve running timers from memory from now on
+    async with engine.connect() as conn:
+        timers = await running_timers(conn)
+    await timer_registry.load(timers)
+    logger.info(f"Loaded {len(timers)} running timers")
+
+    # Receive WebSocket events published by other workers
+    await manager.start()
+    ticker.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await ticker.stop()
+    await manager.shutdown()
+    await response_cache.close()
+    await timer_registry.close()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 # Initialize FastAPI application
@@ -43,6 +69,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Keep clients that just wrote reading from the primary, not the replica
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -50,6 +79,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -81,38 +111,38 @@ async def health_check():
     }
 
 
-# WebSocket connection manager
-class ConnectionManager:
-    """Manage WebSocket connections"""
-
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
+@app.get("/api/ws/stats")
+async def websocket_stats():
+    """WebSocket fan-out counters and delivery latency"""
+    return {"connections": len(manager.connections), **manager.stats.snapshot()}
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
-
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected clients"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting message: {e}")
-
-
-manager = ConnectionManager()
+def _task_topics(task_id: Optional[str]) -> List[str]:
+    return [f"task:{task_id}"] if task_id else []
 
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates"""
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, topics: Optional[str] = None):
+    """
+    WebSocket endpoint for real-time updates
+
+    Connections start subscribed to the `topics` query parameter (comma
+    separated), or to "board" when it is absent. Send
+    {"type": "subscribe" | "unsubscribe", "topics": [...]} to change that;
+    topics are "board", "sprint:<id>", "user:<id>" and "task:<id>".
+
+    Timer events come from the server: "timer:started" and "timer:stopped"
+    when POST /api/time/start and /stop commit, and a "timer:tick" every
+    WS_TIMER_TICK_INTERVAL seconds with the elapsed time of each running
+    timer the connection subscribes to (core.ticker). {"type": "timer:running"}
+    is answered with every running timer, read from the timer registry.
+    """
+    initial = [topic for topic in (topics or BOARD_TOPIC).split(",") if topic]
+    if not all(is_valid_topic(topic) for topic in initial):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await manager.connect(websocket, initial)
     try:
         while True:
             data = await websocket.receive_json()
@@ -121,31 +151,44 @@ async def websocket_endpoint(websocket: WebSocket):
             message_type = data.get("type")
 
             if message_type == "ping":
-                await websocket.send_json({"type": "pong"})
-
-            elif message_type == "timer:start":
-                # Broadcast timer start to all clients
-                await manager.broadcast({
-                    "type": "timer:started",
-                    "task_id": data.get("task_id"),
-                    "user_id": data.get("user_id")
+                manager.send(websocket, {"type": "pong"})
+
+            elif message_type in ("subscribe", "unsubscribe"):
+                requested = data.get("topics") or []
+                try:
+                    if message_type == "subscribe":
+                        current = manager.subscribe(websocket, requested)
+                    else:
+                        current = manager.unsubscribe(websocket, requested)
+                except (TypeError, ValueError) as e:
+                    manager.send(websocket, {"type": "error", "detail": str(e)})
+                    continue
+                manager.send(websocket, {"type": "subscribed", "topics": sorted(current)})
+
+            elif message_type == "timer:running":
+                timers = await timer_registry.all()
+                manager.send(websocket, {
+                    "type": "timer:running",
+                    "timers": [timer.describe() for timer in timers]
                 })
 
-            elif message_type == "timer:stop":
-                # Broadcast timer stop to all clients
-                await manager.broadcast({
-                    "type": "timer:stopped",
-                    "task_id": data.get("task_id"),
-                    "user_id": data.get("user_id"),
-                    "duration": data.get("duration")
+            elif message_type in ("timer:start", "timer:stop"):
+                # Clients no longer report their own timers or durations
+                manager.send(websocket, {
+                    "type": "error",
+                    "detail": f"{message_type} is not accepted; timers are started and stopped through /api/time"
                 })
 
             elif message_type == "task:update":
-                # Broadcast task update to all clients
-                await manager.broadcast({
-                    "type": "task:updated",
-                    "task": data.get("task")
-                })
+                # Notify board viewers and the task's subscribers
+                task = data.get("task") or {}
+                await manager.publish(
+                    [BOARD_TOPIC] + _task_topics(task.get("id") if isinstance(task, dict) else None),
+                    {
+                        "type": "task:updated",
+                        "task": data.get("task")
+                    }
+                )
 
             else:
                 logger.warning(f"Unknown message type: {message_type}")
@@ -0,0 +1,61 @@
+"""
+Shared test fixtures
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import server module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from server import app  # noqa: E402
+from core.cache import response_cache  # noqa: E402
+from core.database import Base, get_db, get_read_db  # noqa: E402
+from core.timers import timer_registry  # noqa: E402
+
+# Create test database outside the working tree
+TEST_DB_PATH = Path(tempfile.mkdtemp(prefix="devdash-tests-")) / "test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DB_PATH}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DB_PATH}"
+
+# Sync engine for schema setup/teardown
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+# TestClient may run each request on a fresh event loop, so connections are not pooled
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_db():
+    """Override database dependency for testing"""
+    async with TestingSessionLocal() as db:
+        yield db
+
+
+app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
+
+
+@pytest.fixture(scope="function")
+def test_db():
+    """Create test database tables"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    # Responses cached and timers registered by this test describe tables that no longer exist
+    asyncio.run(response_cache.clear())
+    asyncio.run(timer_registry.clear())
+
+
+@pytest.fixture
+def client(test_db):
+    """Test client fixture"""
+    return TestClient(app)
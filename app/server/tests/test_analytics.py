@@ -0,0 +1,216 @@
+"""
+Tests for analytics router
+"""
+
+
+def test_analytics_summary_empty(client):
+    """Test summary on an empty database"""
+    response = client.get("/api/analytics/summary")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_tasks"] == 0
+    assert data["completed_tasks"] == 0
+    assert data["active_tasks"] == 0
+    assert data["total_time_logged"] == 0
+
+
+def test_analytics_summary(client):
+    """Test summary counts tasks by status and sums logged time"""
+    client.post("/api/tasks/", json={"title": "Todo", "status": "todo"})
+    client.post("/api/tasks/", json={"title": "Doing", "status": "in_progress"})
+    client.post("/api/tasks/", json={"title": "Reviewing", "status": "in_review"})
+    client.post("/api/tasks/", json={"title": "Done", "status": "done"})
+
+    client.post("/api/time/entries", json={"start_time": "2024-01-01T09:00:00", "duration": 1800})
+    client.post(
+        "/api/time/entries",
+        json={"start_time": "2024-01-01T10:00:00", "end_time": "2024-01-01T11:00:00"}
+    )
+
+    response = client.get("/api/analytics/summary")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_tasks"] == 4
+    assert data["completed_tasks"] == 1
+    assert data["active_tasks"] == 2
+    assert data["total_time_logged"] == 5400
+
+
+def _sprint(client, name, start, end):
+    response = client.post(
+        "/api/sprints/",
+        json={"name": name, "start_date": f"{start}T00:00:00", "end_date": f"{end}T00:00:00"}
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _sprint_task(client, sprint_id, title, task_status, points):
+    task_id = client.post("/api/tasks/", json={"title": title, "status": task_status}).json()["id"]
+    client.post(f"/api/sprints/{sprint_id}/tasks", json={"task_id": task_id, "story_points": points})
+    return task_id
+
+
+def test_velocity_empty(client):
+    """Test velocity with no completed sprints"""
+    response = client.get("/api/analytics/velocity")
+    assert response.status_code == 200
+    assert response.json() == {"data_points": [], "average_velocity": 0.0}
+
+
+def test_velocity_snapshots_completed_sprints(client):
+    """Test completing a sprint records the done tasks and their points, and later edits do not change it"""
+    first = _sprint(client, "Sprint 1", "2024-01-01", "2024-01-14")
+    done_id = _sprint_task(client, first, "Done", "done", 5)
+    _sprint_task(client, first, "Done too", "done", 3)
+    _sprint_task(client, first, "Unfinished", "todo", 8)
+
+    second = _sprint(client, "Sprint 2", "2024-01-15", "2024-01-28")
+    _sprint_task(client, second, "Done", "done", 2)
+    _sprint(client, "Sprint 3", "2024-01-29", "2024-02-11")  # Still planning
+
+    # Complete out of order; the chart follows the sprints' end dates
+    client.patch(f"/api/sprints/{second}", json={"status": "completed"})
+    client.patch(f"/api/sprints/{first}", json={"status": "completed"})
+
+    # Changes after completion leave the snapshot alone, apart from the name
+    client.patch(f"/api/tasks/{done_id}", json={"status": "todo"})
+    client.patch(f"/api/sprints/{first}", json={"name": "Sprint One"})
+
+    data = client.get("/api/analytics/velocity").json()
+    assert [
+        (point["sprint_name"], point["tasks_completed"], point["story_points"])
+        for point in data["data_points"]
+    ] == [("Sprint One", 2, 8), ("Sprint 2", 1, 2)]
+    assert data["average_velocity"] == 5.0
+
+    latest = client.get("/api/analytics/velocity", params={"sprint_count": 1}).json()
+    assert [point["sprint_name"] for point in latest["data_points"]] == ["Sprint 2"]
+
+
+def test_velocity_drops_reopened_and_deleted_sprints(client):
+    """Test reopening or deleting a completed sprint removes it from velocity"""
+    reopened = _sprint(client, "Reopened", "2024-01-01", "2024-01-14")
+    deleted = _sprint(client, "Deleted", "2024-01-15", "2024-01-28")
+    for sprint_id in (reopened, deleted):
+        client.patch(f"/api/sprints/{sprint_id}", json={"status": "completed"})
+
+    client.patch(f"/api/sprints/{reopened}", json={"status": "active"})
+    assert client.delete(f"/api/sprints/{deleted}").status_code == 204
+
+    assert client.get("/api/analytics/velocity").json()["data_points"] == []
+
+
+def _replace_history(task_events):
+    """Overwrite the status history with (task_id, from_status, to_status, changed_at) rows"""
+    from datetime import datetime
+    from sqlalchemy import delete, insert
+    from conftest import engine
+    from core.models import TaskStatusEvent
+
+    with engine.begin() as conn:
+        conn.execute(delete(TaskStatusEvent))
+        conn.execute(insert(TaskStatusEvent), [
+            {
+                "task_id": task_id,
+                "from_status": from_status,
+                "to_status": to_status,
+                "changed_at": datetime.fromisoformat(changed_at),
+            }
+            for task_id, from_status, to_status, changed_at in task_events
+        ])
+
+
+def test_burndown_replays_status_history(client):
+    """Test remaining points follow tasks entering and leaving done, day by day"""
+    sprint_id = _sprint(client, "Sprint", "2024-03-04", "2024-03-08")
+    a = _sprint_task(client, sprint_id, "A", "done", 5)
+    b = _sprint_task(client, sprint_id, "B", "todo", 3)
+    c = _sprint_task(client, sprint_id, "C", "done", 2)
+    _sprint_task(client, sprint_id, "D", "todo", None)
+    outside = client.post("/api/tasks/", json={"title": "Other sprint", "status": "done"}).json()["id"]
+
+    _replace_history([
+        (a, None, "todo", "2024-03-01T09:00:00"),
+        (a, "todo", "done", "2024-03-05T10:00:00"),
+        (b, None, "todo", "2024-03-01T09:00:00"),
+        (b, "todo", "done", "2024-03-06T10:00:00"),
+        (b, "done", "in_review", "2024-03-07T10:00:00"),
+        (c, None, "done", "2024-03-02T09:00:00"),  # Done before the sprint started
+        (outside, None, "done", "2024-03-05T09:00:00"),
+    ])
+
+    response = client.get(f"/api/analytics/burndown/{sprint_id}")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["sprint_name"] == "Sprint"
+    assert [point["date"][:10] for point in data["data_points"]] == [
+        "2024-03-04", "2024-03-05", "2024-03-06", "2024-03-07", "2024-03-08"
+    ]
+    assert [point["remaining_points"] for point in data["data_points"]] == [8, 3, 0, 3, 3]
+    assert [point["ideal_remaining"] for point in data["data_points"]] == [10, 8, 5, 2, 0]
+
+
+def test_burndown_unknown_sprint(client):
+    """Test burndown for a missing sprint is a 404"""
+    assert client.get("/api/analytics/burndown/missing").status_code == 404
+
+
+def test_analytics_summary_average_cycle_time(client):
+    """Test cycle time runs from creation to the last move into done, for done tasks only"""
+    from sqlalchemy import text
+    from conftest import engine
+
+    done = client.post("/api/tasks/", json={"title": "Done", "status": "done"}).json()["id"]
+    reopened = client.post("/api/tasks/", json={"title": "Reopened", "status": "done"}).json()["id"]
+    client.post("/api/tasks/", json={"title": "Open", "status": "todo"})
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET created_at = '2024-03-01 00:00:00.000000'"))
+    _replace_history([
+        (done, None, "todo", "2024-03-01T00:00:00"),
+        (done, "todo", "done", "2024-03-02T00:00:00"),  # 24 hours
+        (reopened, None, "todo", "2024-03-01T00:00:00"),
+        (reopened, "todo", "done", "2024-03-01T12:00:00"),
+        (reopened, "done", "todo", "2024-03-02T00:00:00"),
+        (reopened, "todo", "done", "2024-03-03T00:00:00"),  # 48 hours
+    ])
+
+    data = client.get("/api/analytics/summary").json()
+    assert data["average_cycle_time"] == 36.0
+
+
+def test_analytics_responses_cached_until_a_write(client):
+    """Test repeat requests are served from the cache and a task write invalidates them"""
+    first = client.get("/api/analytics/summary")
+    assert first.headers["X-Cache"] == "MISS"
+
+    second = client.get("/api/analytics/summary")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.json() == first.json()
+
+    client.post("/api/tasks/", json={"title": "New", "status": "todo"})
+
+    third = client.get("/api/analytics/summary")
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.headers["ETag"] != first.headers["ETag"]
+    assert third.json()["total_tasks"] == 1
+
+
+def test_analytics_conditional_get(client):
+    """Test a matching If-None-Match gets an empty 304 and a stale one the full body"""
+    etag = client.get("/api/analytics/velocity").headers["ETag"]
+
+    response = client.get("/api/analytics/velocity", headers={"If-None-Match": f'"other", {etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    sprint_id = _sprint(client, "Sprint", "2024-01-01", "2024-01-14")
+    client.patch(f"/api/sprints/{sprint_id}", json={"status": "completed"})
+
+    response = client.get("/api/analytics/velocity", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [point["sprint_name"] for point in response.json()["data_points"]] == ["Sprint"]
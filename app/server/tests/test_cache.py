@@ -0,0 +1,82 @@
+"""
+Tests for the response cache backends
+"""
+
+import asyncio
+
+from core.cache import MemoryCacheBackend
+
+
+def test_memory_backend_evicts_least_recently_used():
+    """Test the oldest untouched entry goes first once the cache is full"""
+
+    async def scenario():
+        backend = MemoryCacheBackend(max_entries=2)
+        await backend.set("a", b"1", ttl=60)
+        await backend.set("b", b"2", ttl=60)
+        assert await backend.get("a") == b"1"  # "b" is now least recently used
+
+        await backend.set("c", b"3", ttl=60)
+        assert await backend.get("b") is None
+        assert await backend.get("a") == b"1"
+        assert await backend.get("c") == b"3"
+
+    asyncio.run(scenario())
+
+
+def test_memory_backend_expires_entries():
+    """Test an entry past its TTL is a miss and is dropped"""
+
+    async def scenario():
+        backend = MemoryCacheBackend(max_entries=8)
+        await backend.set("short", b"1", ttl=0.01)
+        await backend.set("long", b"2", ttl=60)
+        await asyncio.sleep(0.02)
+
+        assert await backend.get("short") is None
+        assert await backend.get("long") == b"2"
+        assert list(backend.entries) == ["long"]
+
+    asyncio.run(scenario())
+
+
+def test_memory_backend_tag_generations():
+    """Test bumping a tag advances only that tag's generation"""
+
+    async def scenario():
+        backend = MemoryCacheBackend(max_entries=8)
+        await backend.bump(["tasks"])
+        await backend.bump(["tasks", "time"])
+        assert await backend.generations(["sprints", "tasks", "time"]) == [0, 2, 1]
+
+    asyncio.run(scenario())
+
+
+def test_responses_are_not_stored_while_a_replica_may_lag():
+    """Test responses built right after an invalidation are served but only cached once the hold ends"""
+    from starlette.requests import Request
+
+    from core.cache import ResponseCache
+    from core.schemas import ImportReport
+
+    def request():
+        return Request({"type": "http", "method": "GET", "path": "/api/analytics/summary", "query_string": b"", "headers": []})
+
+    async def scenario():
+        cache = ResponseCache(MemoryCacheBackend(max_entries=8), ttl=60, replica_lag=0.05)
+        builds = []
+
+        async def build():
+            builds.append(1)
+            return ImportReport(imported=len(builds), rejected=0, errors=[], seconds=0, rows_per_second=0)
+
+        await cache.invalidate("tasks")
+        assert (await cache.respond(request(), ["tasks"], build)).headers["X-Cache"] == "MISS"
+        assert (await cache.respond(request(), ["tasks"], build)).headers["X-Cache"] == "MISS"
+
+        await asyncio.sleep(0.06)
+        await cache.respond(request(), ["tasks"], build)
+        assert (await cache.respond(request(), ["tasks"], build)).headers["X-Cache"] == "HIT"
+        assert len(builds) == 3
+
+    asyncio.run(scenario())
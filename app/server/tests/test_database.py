@@ -0,0 +1,89 @@
+"""
+Tests for engine configuration
+"""
+
+import asyncio
+
+from sqlalchemy import Column, Integer, MetaData, Table, func, insert, select
+
+from core.config import settings
+from core.database import create_database_engine, engine_options
+
+
+def test_engine_options_follow_settings():
+    """Test pool sizing comes from the DB_* settings and echo no longer follows DEBUG"""
+    config = settings.model_copy(update={"DEBUG": True, "DB_ECHO": False, "DB_POOL_SIZE": 7, "DB_POOL_RECYCLE": 60})
+
+    options = engine_options("postgresql+asyncpg://db/devdash", config)
+    assert options["echo"] is False
+    assert (options["pool_size"], options["pool_recycle"], options["pool_pre_ping"]) == (7, 60, True)
+
+    assert engine_options("sqlite+aiosqlite:///./devdash.db", config)["pool_size"] == 7
+    assert engine_options("sqlite+aiosqlite://", config) == {"echo": False}
+
+
+def test_sqlite_connections_get_pragmas_and_take_concurrent_writers(tmp_path):
+    """Test every connection runs in WAL with the configured sync level, and 100 writers all commit"""
+    db_engine = create_database_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    counters = Table("counters", MetaData(), Column("id", Integer, primary_key=True), Column("writer", Integer))
+
+    async def run():
+        async with db_engine.begin() as conn:
+            await conn.run_sync(counters.metadata.create_all)
+            pragmas = [
+                (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout")
+            ]
+
+        async def writer(number: int):
+            for _ in range(5):
+                async with db_engine.begin() as conn:
+                    await conn.execute(insert(counters).values(writer=number))
+
+        await asyncio.gather(*(writer(number) for number in range(100)))
+        async with db_engine.connect() as conn:
+            rows = (await conn.execute(select(func.count()).select_from(counters))).scalar_one()
+        await db_engine.dispose()
+        return pragmas, rows
+
+    pragmas, rows = asyncio.run(run())
+    assert pragmas == ["wal", 1, settings.SQLITE_BUSY_TIMEOUT]
+    assert rows == 500
+
+
+def test_get_read_db_routes_to_replica_until_the_client_writes(client, tmp_path, monkeypatch):
+    """Test polled lists read the replica, except for a client that has just written"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    import core.database
+    from conftest import TestingSessionLocal
+    from core.database import Base, get_read_db
+    from core.replica import PRIMARY_COOKIE
+    from server import app
+
+    # A replica that has not received any of the primary's writes
+    replica_path = tmp_path / "replica.db"
+    sync_replica = create_engine(f"sqlite:///{replica_path}")
+    Base.metadata.create_all(bind=sync_replica)
+    sync_replica.dispose()
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool)
+
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", f"sqlite:///{replica_path}")
+    monkeypatch.setattr(core.database, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(core.database, "ReadSessionLocal", async_sessionmaker(bind=replica_engine))
+    monkeypatch.delitem(app.dependency_overrides, get_read_db)
+
+    created = client.post("/api/tasks/", json={"title": "Just written"})
+    assert PRIMARY_COOKIE in created.cookies
+    assert [task["title"] for task in client.get("/api/tasks/").json()] == ["Just written"]
+
+    client.cookies.clear()
+    assert client.get("/api/tasks/").json() == []
+
+    monkeypatch.setattr(settings, "READ_AFTER_WRITE_SECONDS", 0)
+    client.post("/api/tasks/", json={"title": "Lag covered"})
+    assert client.get("/api/tasks/").json() == []
+
+    asyncio.run(replica_engine.dispose())
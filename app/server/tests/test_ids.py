@@ -0,0 +1,45 @@
+"""
+Tests for binary UUID keys
+"""
+
+import time
+import uuid
+
+from core.ids import NIL_UUID, generate_uuid, legacy_uuid, uuid7
+
+
+def test_uuid7_is_version_7_and_time_ordered():
+    """Test UUIDv7 keys carry their version and variant and sort by creation time"""
+    keys = []
+    for _ in range(3):
+        keys.append(uuid7())
+        time.sleep(0.002)
+
+    assert all(key.version == 7 and key.variant == uuid.RFC_4122 for key in keys)
+    assert keys == sorted(keys)
+    assert abs((keys[0].int >> 80) - time.time() * 1000) < 1000
+
+
+def test_legacy_uuid_is_stable():
+    """Test text keys map to the same UUID every time, keeping UUIDs and the empty key recognisable"""
+    key = generate_uuid()
+
+    assert legacy_uuid(key) == key
+    assert legacy_uuid(key.upper()) == key
+    assert legacy_uuid("") == NIL_UUID
+    assert legacy_uuid("user-1") == legacy_uuid("user-1") != legacy_uuid("user-2")
+
+
+def test_keys_round_trip_through_the_api(client):
+    """Test keys read back as the strings written, and non-UUID keys are simply not found"""
+    from conftest import engine
+
+    task = client.post("/api/tasks/", json={"title": "Binary key"}).json()
+    assert uuid.UUID(task["id"]).version == 7
+    assert client.get(f"/api/tasks/{task['id']}").json()["id"] == task["id"]
+    assert client.get(f"/api/tasks/{task['id'].upper()}").json()["id"] == task["id"]
+    assert client.get("/api/tasks/not-a-uuid").status_code == 404
+
+    with engine.connect() as conn:
+        stored = conn.exec_driver_sql("SELECT id FROM tasks").scalar_one()
+    assert stored == uuid.UUID(task["id"]).bytes
@@ -0,0 +1,116 @@
+"""
+Tests for Alembic migrations
+"""
+
+import uuid
+from datetime import datetime
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, insert, inspect, select, text
+
+from core.database import Base
+from core.ids import PLACEHOLDER_USER_ID
+from core.migrations import BASELINE_REVISION, get_alembic_config, run_migrations
+from core.models import Task, TimeEntry, TimeRollup, User
+from core.rollups import NO_TASK
+from core.search import FTS_TABLE, is_search_index_table
+
+
+def _include_name(name, type_, parent_names):
+    return not (type_ == "table" and is_search_index_table(name))
+
+
+def test_migrations_match_models(tmp_path):
+    """Test upgrading an empty database yields exactly the schema declared by the models"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+
+    with engine.begin() as conn:
+        run_migrations(conn)
+
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"include_name": _include_name})
+        assert compare_metadata(context, Base.metadata) == []
+        assert FTS_TABLE in inspect(conn).get_table_names()
+
+    engine.dispose()
+
+
+def test_migrations_adopt_database_created_without_alembic(tmp_path):
+    """Test a database built before migrations existed is stamped at the baseline and upgraded"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+
+    # Recreate the pre-migration schema: the baseline tables without version tracking
+    with engine.begin() as conn:
+        command.upgrade(get_alembic_config(conn), BASELINE_REVISION)
+        conn.exec_driver_sql("DROP TABLE alembic_version")
+
+    with engine.begin() as conn:
+        run_migrations(conn)
+
+    with engine.connect() as conn:
+        index_names = {index["name"] for index in inspect(conn).get_indexes("time_entries")}
+        assert "ix_time_entries_user_id_is_running" in index_names
+        assert "ix_time_entries_user_id_start_time" in index_names
+
+    engine.dispose()
+
+
+def test_binary_key_migration_converts_text_keys(tmp_path):
+    """Test text keys become 16-byte UUIDs, non-UUID keys keep their references, and search still works"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'keys.db'}")
+    task_id = str(uuid.uuid4())
+
+    with engine.begin() as conn:
+        command.upgrade(get_alembic_config(conn), "0007")
+        conn.execute(text("INSERT INTO users (id, username) VALUES ('placeholder-user-id', 'dev')"))
+        conn.execute(
+            text("INSERT INTO tasks (id, title, status, created_by) VALUES (:id, 'Migrate keys', 'todo', 'placeholder-user-id')"),
+            {"id": task_id}
+        )
+        conn.execute(text(
+            "INSERT INTO time_rollups (user_id, day, task_id, duration, entries) "
+            "VALUES ('placeholder-user-id', '2024-03-01', '', 60, 1)"
+        ))
+
+    with engine.begin() as conn:
+        run_migrations(conn)
+
+    with engine.begin() as conn:
+        assert conn.execute(text("SELECT typeof(id), length(id) FROM tasks")).one() == ("blob", 16)
+        task = conn.execute(select(Task.id, Task.created_by)).one()
+        assert task == (task_id, PLACEHOLDER_USER_ID)
+        assert conn.execute(select(User.id)).scalar_one() == PLACEHOLDER_USER_ID
+        assert conn.execute(select(TimeRollup.task_id)).scalar_one() == NO_TASK
+
+        # The search index triggers survive the rebuild of tasks
+        conn.execute(insert(Task), [{"title": "Binary keys", "status": "todo", "created_by": PLACEHOLDER_USER_ID}])
+        matches = conn.exec_driver_sql("SELECT count(*) FROM tasks_fts WHERE tasks_fts MATCH 'keys'").scalar_one()
+        assert matches == 2
+
+    engine.dispose()
+
+
+def test_running_timer_migration_closes_duplicate_timers(tmp_path):
+    """Test a user left with several running timers keeps only the latest before the unique index is built"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'timers.db'}")
+
+    with engine.begin() as conn:
+        command.upgrade(get_alembic_config(conn), "0008")
+        conn.execute(insert(TimeEntry), [
+            {"user_id": PLACEHOLDER_USER_ID, "start_time": datetime(2024, 3, 4, hour), "is_running": True}
+            for hour in (9, 11, 10)
+        ])
+
+    with engine.begin() as conn:
+        run_migrations(conn)
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(TimeEntry.start_time, TimeEntry.is_running, TimeEntry.end_time).order_by(TimeEntry.start_time)
+        ).all()
+        assert [(row.start_time.hour, row.is_running) for row in rows] == [(9, False), (10, False), (11, True)]
+        assert all(row.end_time == row.start_time for row in rows if not row.is_running)
+
+    engine.dispose()
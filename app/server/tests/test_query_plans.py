@@ -0,0 +1,70 @@
+"""
+Query plan tests: every filtered router query must be served by an index
+"""
+
+import re
+
+import pytest
+from sqlalchemy import event
+
+from conftest import async_engine, engine
+from core.ids import PLACEHOLDER_USER_ID
+
+# Requests covering the filtered queries issued by the routers
+ROUTER_REQUESTS = [
+    ("post", "/api/tasks/", {"json": {"title": "Planned", "status": "todo"}}),
+    ("get", "/api/tasks/", {"params": {"status": "todo"}}),
+    ("get", "/api/tasks/", {"params": {"assignee": PLACEHOLDER_USER_ID}}),
+    ("post", "/api/time/start", {"json": {}}),
+    ("post", "/api/time/stop", {}),
+    ("get", "/api/time/entries", {"params": {"start_date": "2024-01-01T00:00:00"}}),
+    ("get", "/api/time/summary", {}),
+    ("get", "/api/github/prs", {}),
+]
+
+# A plan step that reads a table without an index looks like "SCAN tasks"
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def _capture_statements(client, method, url, kwargs):
+    """Run a request and return the (statement, parameters) pairs it executed"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = getattr(client, method)(url, **kwargs)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert response.status_code < 400, response.text
+    return statements
+
+
+def _full_scans(statement, parameters):
+    """Return the tables the statement reads without using an index"""
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+
+    return [
+        match.group(1)
+        for *_, detail in plan
+        if (match := FULL_SCAN.match(detail))
+    ]
+
+
+@pytest.mark.parametrize("method,url,kwargs", ROUTER_REQUESTS)
+def test_router_queries_use_indexes(client, method, url, kwargs):
+    """Test each filtered router query is planned as an index search, not a table scan"""
+    client.post("/api/tasks/", json={"title": "Seed", "status": "todo"})
+    client.post("/api/time/entries", json={"start_time": "2024-01-02T09:00:00", "duration": 60})
+    client.post("/api/time/start", json={})
+
+    statements = _capture_statements(client, method, url, kwargs)
+    assert statements
+
+    for statement, parameters in statements:
+        assert _full_scans(statement, parameters) == [], statement
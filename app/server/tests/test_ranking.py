@@ -0,0 +1,67 @@
+"""
+Tests for fractional rank keys
+"""
+
+import random
+
+import pytest
+
+from core.ranking import MAX_RANK_LENGTH, evenly_spaced, rank_between
+
+
+def test_rank_between_keeps_order_under_random_inserts():
+    """Test random inserts always produce a key strictly between the neighbours"""
+    rng = random.Random(42)
+    ranks = [rank_between(None, None)]
+
+    for _ in range(2000):
+        index = rng.randint(0, len(ranks))
+        before = ranks[index - 1] if index > 0 else None
+        after = ranks[index] if index < len(ranks) else None
+        rank = rank_between(before, after)
+
+        assert before is None or before < rank
+        assert after is None or rank < after
+        assert not rank.endswith("0")
+        ranks.insert(index, rank)
+
+    assert ranks == sorted(ranks)
+
+
+def test_appending_and_prepending_keep_ranks_short():
+    """Test cards added at either end of a column do not grow their rank"""
+    first = last = rank_between(None, None)
+    for _ in range(10000):
+        first = rank_between(None, first)
+        last = rank_between(last, None)
+
+    assert len(first) <= 12
+    assert len(last) <= 12
+
+
+def test_repeated_bisection_grows_slowly():
+    """Test dropping cards into the same gap adds about one digit per five moves"""
+    before, after = evenly_spaced(2)
+    for _ in range(100):
+        after = rank_between(before, after)
+
+    assert before < after
+    assert len(after) <= MAX_RANK_LENGTH
+
+
+def test_rank_between_rejects_unordered_neighbours():
+    """Test equal or reversed neighbours are an error"""
+    with pytest.raises(ValueError):
+        rank_between("k", "k")
+    with pytest.raises(ValueError):
+        rank_between("m", "k")
+
+
+def test_evenly_spaced():
+    """Test rebalanced ranks are ascending, unique and short"""
+    ranks = evenly_spaced(10000)
+
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+    assert max(len(rank) for rank in ranks) <= 12
+    assert evenly_spaced(0) == []
@@ -0,0 +1,59 @@
+"""
+Tests for the fast JSON response path
+"""
+
+import pytest
+
+from core.config import settings
+
+
+@pytest.fixture
+def seeded(client):
+    """Tasks with and without an assignee, a sprint and time entries embedding tasks"""
+    from sqlalchemy import insert
+    from conftest import engine
+    from core.models import User, generate_uuid
+
+    user_id = generate_uuid()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "username": "ada", "email": "ada@example.com"}])
+
+    task_id = client.post(
+        "/api/tasks/", json={"title": "Assigned", "status": "todo", "labels": ["bug", "ünïcode"]}
+    ).json()["id"]
+    client.post(f"/api/tasks/{task_id}/assign", params={"assignee_id": user_id})
+    client.post("/api/tasks/", json={"title": "Unassigned", "description": "Details"})
+    client.post(
+        "/api/sprints/",
+        json={"name": "Sprint", "start_date": "2024-03-04T00:00:00", "end_date": "2024-03-15T00:00:00"}
+    )
+    client.post(
+        "/api/time/entries",
+        json={"start_time": "2024-03-04T09:00:00.250000", "duration": 60, "task_id": task_id}
+    )
+    client.post("/api/time/entries", json={"start_time": "2024-03-05T09:00:00", "duration": 30})
+    return client
+
+
+@pytest.mark.parametrize("url", ["/api/tasks/", "/api/sprints/", "/api/time/entries"])
+def test_fast_json_matches_validated_response(seeded, monkeypatch, url):
+    """Test the orjson path returns the same JSON and headers as response_model validation"""
+    standard = seeded.get(url)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = seeded.get(url)
+
+    assert fast.status_code == standard.status_code == 200
+    assert fast.json() == standard.json()
+    assert fast.json()
+    assert fast.headers["ETag"] == standard.headers["ETag"]
+
+
+def test_fast_json_keeps_pagination_cursor(client, monkeypatch):
+    """Test the next-page cursor survives the fast path"""
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    for i in range(3):
+        client.post("/api/tasks/", json={"title": f"Task {i}"})
+
+    response = client.get("/api/tasks/", params={"limit": 2})
+    assert [task["title"] for task in response.json()] == ["Task 0", "Task 1"]
+    assert response.headers["X-Next-Cursor"]
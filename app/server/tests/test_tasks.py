@@ -2,51 +2,6 @@
 Tests for tasks router
 """
 
-import sys
-from pathlib import Path
-
-# Add parent directory to path to import server module
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-import pytest  # noqa: E402
-from fastapi.testclient import TestClient  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-
-from server import app  # noqa: E402
-from core.database import Base, get_db  # noqa: E402
-
-# Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def override_get_db():
-    """Override database dependency for testing"""
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db
-
-
-@pytest.fixture(scope="function")
-def test_db():
-    """Create test database tables"""
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture
-def client(test_db):
-    """Test client fixture"""
-    return TestClient(app)
-
 
 def test_create_task(client):
     """Test creating a task"""
@@ -173,3 +128,603 @@ def test_filter_tasks_by_status(client):
     data = response.json()
     assert len(data) == 1
     assert data[0]["status"] == "todo"
+
+
+def test_list_tasks_paginates_with_cursor(client):
+    """Test keyset pagination walks every task exactly once"""
+    for i in range(7):
+        client.post("/api/tasks/", json={"title": f"Task {i}", "status": "todo"})
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/tasks/", params=params)
+        assert response.status_code == 200
+        seen.extend(task["title"] for task in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert seen == [f"Task {i}" for i in range(7)]
+
+
+def test_list_tasks_rejects_invalid_cursor(client):
+    """Test a malformed cursor is a client error"""
+    response = client.get("/api/tasks/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_list_tasks_field_projection(client):
+    """Test fields= returns only the requested task fields"""
+    client.post("/api/tasks/", json={"title": "Projected", "status": "todo"})
+
+    response = client.get("/api/tasks/", params={"fields": "id,title"})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert set(data[0]) == {"id", "title"}
+    assert data[0]["title"] == "Projected"
+
+    response = client.get("/api/tasks/", params={"fields": "title,assignee"})
+    assert response.status_code == 200
+    assert response.json() == [{"title": "Projected", "assignee": None}]
+
+    response = client.get("/api/tasks/", params={"fields": "title,secret"})
+    assert response.status_code == 400
+
+
+def test_list_tasks_query_count_is_bounded(client):
+    """Test assignees are eager-loaded instead of one query per task"""
+    from sqlalchemy import event, insert
+
+    from conftest import async_engine, engine
+    from core.models import User, generate_uuid
+
+    user_ids = [generate_uuid() for _ in range(5)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": user_id, "username": f"user{i}"} for i, user_id in enumerate(user_ids)
+        ])
+
+    for i in range(10):
+        task_id = client.post("/api/tasks/", json={"title": f"Task {i}"}).json()["id"]
+        client.post(f"/api/tasks/{task_id}/assign", params={"assignee_id": user_ids[i % 5]})
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.get("/api/tasks/")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    assert response.status_code == 200
+    assert all(task["assignee"] is not None for task in response.json())
+    # Conditional GET fingerprint, tasks, assignees
+    assert len(statements) == 3
+
+
+def test_search_tasks_prefix_and_rank(client):
+    """Test full-text search matches word prefixes and ranks title hits first"""
+    client.post("/api/tasks/", json={"title": "Fix login redirect", "description": "Users bounce"})
+    client.post("/api/tasks/", json={"title": "Dashboard polish", "description": "After login fix"})
+    client.post("/api/tasks/", json={"title": "Unrelated", "description": "Nothing here"})
+
+    response = client.get("/api/tasks/", params={"search": "log"})
+    assert response.status_code == 200
+    titles = [task["title"] for task in response.json()]
+    assert set(titles) == {"Fix login redirect", "Dashboard polish"}
+
+    response = client.get("/api/tasks/", params={"search": "login fix"})
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()][0] == "Fix login redirect"
+
+    response = client.get("/api/tasks/", params={"search": "dash", "fields": "title"})
+    assert response.json() == [{"title": "Dashboard polish"}]
+
+
+def test_search_index_follows_updates_and_deletes(client):
+    """Test the search index stays in sync with task writes"""
+    task_id = client.post("/api/tasks/", json={"title": "Original wording"}).json()["id"]
+    client.patch(f"/api/tasks/{task_id}", json={"title": "Rewritten"})
+
+    assert client.get("/api/tasks/", params={"search": "original"}).json() == []
+    assert len(client.get("/api/tasks/", params={"search": "rewrit"}).json()) == 1
+
+    client.delete(f"/api/tasks/{task_id}")
+    assert client.get("/api/tasks/", params={"search": "rewrit"}).json() == []
+
+
+def test_search_combined_with_status_filter(client):
+    """Test an older match is still found when newer matches are in other columns"""
+    from sqlalchemy import insert
+    from conftest import engine
+    from core.ids import PLACEHOLDER_USER_ID
+    from core.models import Task
+
+    client.post("/api/tasks/", json={"title": "Fix login bug", "status": "done"})
+    with engine.begin() as conn:
+        conn.execute(insert(Task), [
+            {"title": f"Fix widget {i}", "status": "todo", "created_by": PLACEHOLDER_USER_ID, "rank": "i"}
+            for i in range(1200)
+        ])
+
+    response = client.get("/api/tasks/", params={"search": "fix", "status": "done"})
+    assert [task["title"] for task in response.json()] == ["Fix login bug"]
+
+
+def test_search_index_rebuilt_when_rowids_change(client):
+    """Test startup verification repairs an index left stale by renumbered rowids"""
+    from sqlalchemy import text
+    from conftest import engine
+    from core.search import verify_search_index
+
+    client.post("/api/tasks/", json={"title": "Quarterly roadmap"})
+    with engine.begin() as conn:
+        # What VACUUM can do to a table without an INTEGER PRIMARY KEY
+        conn.execute(text("UPDATE tasks SET rowid = rowid + 1000"))
+    assert client.get("/api/tasks/", params={"search": "roadmap"}).json() == []
+
+    with engine.begin() as conn:
+        verify_search_index(conn)
+    assert len(client.get("/api/tasks/", params={"search": "roadmap"}).json()) == 1
+
+
+def _column_titles(client, task_status):
+    response = client.get("/api/tasks/", params={"status": task_status})
+    return [task["title"] for task in response.json()]
+
+
+def test_move_task_between_neighbours(client):
+    """Test a card moved between two neighbours lands between them"""
+    ids = {}
+    for title in ("A", "B", "C"):
+        ids[title] = client.post("/api/tasks/", json={"title": title, "status": "todo"}).json()["id"]
+    ids["X"] = client.post("/api/tasks/", json={"title": "X", "status": "backlog"}).json()["id"]
+
+    response = client.patch(
+        f"/api/tasks/{ids['X']}/move",
+        json={"status": "todo", "after_task_id": ids["A"], "before_task_id": ids["B"]}
+    )
+    assert response.status_code == 200
+    assert _column_titles(client, "todo") == ["A", "X", "B", "C"]
+
+    client.patch(f"/api/tasks/{ids['C']}/move", json={"status": "todo", "before_task_id": ids["A"]})
+    assert _column_titles(client, "todo") == ["C", "A", "X", "B"]
+
+    client.patch(f"/api/tasks/{ids['C']}/move", json={"status": "todo", "after_task_id": ids["X"]})
+    assert _column_titles(client, "todo") == ["A", "X", "C", "B"]
+
+    client.patch(f"/api/tasks/{ids['B']}/move", json={"status": "todo", "position": 0})
+    assert _column_titles(client, "todo") == ["B", "A", "X", "C"]
+
+
+def test_move_task_writes_only_the_moved_row(client):
+    """Test a move issues a single UPDATE and no column count"""
+    from sqlalchemy import event
+    from conftest import async_engine
+
+    ids = [
+        client.post("/api/tasks/", json={"title": f"Task {i}", "status": "todo"}).json()["id"]
+        for i in range(5)
+    ]
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = client.patch(
+            f"/api/tasks/{ids[4]}/move",
+            json={"status": "todo", "after_task_id": ids[1], "before_task_id": ids[2]}
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 1
+    assert not any("count(" in s.lower() for s in statements)
+
+
+def test_move_task_rebalances_tied_ranks(client):
+    """Test a move between cards with equal ranks respaces the column"""
+    from sqlalchemy import text
+    from conftest import engine
+
+    ids = [
+        client.post("/api/tasks/", json={"title": title, "status": "todo"}).json()["id"]
+        for title in ("A", "B", "C")
+    ]
+    # Two users dropping cards into the same slot can leave equal ranks
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET rank = 'k' WHERE status = 'todo'"))
+
+    first, second = sorted(ids[:2])
+    response = client.patch(
+        f"/api/tasks/{ids[2]}/move",
+        json={"status": "todo", "after_task_id": first, "before_task_id": second}
+    )
+    assert response.status_code == 200
+
+    tasks = client.get("/api/tasks/", params={"status": "todo"}).json()
+    assert [task["id"] for task in tasks] == [first, ids[2], second]
+    assert len({task["rank"] for task in tasks}) == 3
+
+
+def _tie_two_cards(client):
+    """Create A, B, C in todo with A and B sharing a rank; returns (first, second, c) in board order"""
+    from sqlalchemy import update
+    from conftest import engine
+    from core.models import Task
+
+    ids = [
+        client.post("/api/tasks/", json={"title": title, "status": "todo"}).json()["id"]
+        for title in ("A", "B", "C")
+    ]
+    with engine.begin() as conn:
+        conn.execute(update(Task).where(Task.id.in_(ids[:2])).values(rank="k"))
+
+    first, second = sorted(ids[:2])
+    return first, second, ids[2]
+
+
+def test_move_task_after_tie_at_end_of_column(client):
+    """Test moving after the last of two tied cards lands at the end once the column is respaced"""
+    first, second, moved = _tie_two_cards(client)
+
+    response = client.patch(
+        f"/api/tasks/{moved}/move", json={"status": "todo", "after_task_id": second}
+    )
+    assert response.status_code == 200
+
+    tasks = client.get("/api/tasks/", params={"status": "todo"}).json()
+    assert [task["id"] for task in tasks] == [first, second, moved]
+
+
+def test_move_task_before_tie_at_start_of_column(client):
+    """Test moving before the first of two tied cards lands at the start once the column is respaced"""
+    first, second, moved = _tie_two_cards(client)
+
+    response = client.patch(
+        f"/api/tasks/{moved}/move", json={"status": "todo", "before_task_id": first}
+    )
+    assert response.status_code == 200
+
+    tasks = client.get("/api/tasks/", params={"status": "todo"}).json()
+    assert [task["id"] for task in tasks] == [moved, first, second]
+
+
+def test_rebalance_skips_cards_moved_concurrently(client):
+    """Test a respace does not overwrite the rank of a card that moved after it was read"""
+    import asyncio
+    from sqlalchemy import select, update
+    from conftest import async_engine, engine
+    from core.models import Task
+    from core.routers.tasks import _rebalance_statement
+
+    ids = [
+        client.post("/api/tasks/", json={"title": f"Task {i}", "status": "todo"}).json()["id"]
+        for i in range(2)
+    ]
+    with engine.begin() as conn:
+        conn.execute(update(Task).where(Task.id == ids[0]).values(rank="c"))
+        # Moved concurrently from "m" to "z" after the respace read the column
+        conn.execute(update(Task).where(Task.id == ids[1]).values(rank="z"))
+
+    async def respace_with_stale_read():
+        async with async_engine.begin() as conn:
+            result = await conn.execute(
+                _rebalance_statement,
+                [
+                    {"task_id": ids[0], "task_status": "todo", "old_rank": "c", "new_rank": "a"},
+                    {"task_id": ids[1], "task_status": "todo", "old_rank": "m", "new_rank": "b"},
+                ]
+            )
+            return result.rowcount
+
+    assert asyncio.run(respace_with_stale_read()) == 1
+
+    with engine.connect() as conn:
+        ranks = dict(conn.execute(select(Task.id, Task.rank)).all())
+    assert ranks == {ids[0]: "a", ids[1]: "z"}
+
+
+def test_update_status_appends_to_new_column(client):
+    """Test changing status through PATCH gives the task a rank at the end of its new column"""
+    done_ids = [
+        client.post("/api/tasks/", json={"title": f"Done {i}", "status": "done"}).json()["id"]
+        for i in range(2)
+    ]
+    task_id = client.post("/api/tasks/", json={"title": "Task", "status": "todo"}).json()["id"]
+
+    response = client.patch(f"/api/tasks/{task_id}", json={"status": "done", "title": "Finished"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Finished"
+
+    tasks = client.get("/api/tasks/", params={"status": "done"}).json()
+    assert [task["id"] for task in tasks] == done_ids + [task_id]
+    assert len({task["rank"] for task in tasks}) == 3
+
+
+def test_move_task_rejects_neighbour_in_other_column(client):
+    """Test neighbours must be in the target column"""
+    task_id = client.post("/api/tasks/", json={"title": "Task", "status": "todo"}).json()["id"]
+    other_id = client.post("/api/tasks/", json={"title": "Other", "status": "done"}).json()["id"]
+
+    response = client.patch(
+        f"/api/tasks/{task_id}/move",
+        json={"status": "todo", "after_task_id": other_id}
+    )
+    assert response.status_code == 400
+
+
+def test_repeated_moves_into_one_gap_trigger_rebalance(client):
+    """Test ranks grown by repeated bisection are compacted after the response"""
+    from core.ranking import MAX_RANK_LENGTH
+
+    ids = [
+        client.post("/api/tasks/", json={"title": f"Task {i}", "status": "todo"}).json()["id"]
+        for i in range(3)
+    ]
+
+    # Keep dropping the last card directly after the first one; without
+    # rebalancing the ranks would outgrow MAX_RANK_LENGTH
+    for _ in range(150):
+        moved = ids.pop()
+        client.patch(f"/api/tasks/{moved}/move", json={"status": "todo", "after_task_id": ids[0]})
+        ids.insert(1, moved)
+
+    tasks = client.get("/api/tasks/", params={"status": "todo"}).json()
+    assert [task["id"] for task in tasks] == ids
+    assert max(len(task["rank"]) for task in tasks) <= MAX_RANK_LENGTH
+
+
+def test_batch_applies_operations_in_order(client):
+    """Test a batch mixes operations and reports a result per item"""
+    from sqlalchemy import insert
+    from conftest import engine
+    from core.models import User, generate_uuid
+
+    user_id = generate_uuid()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "username": "user1"}])
+
+    a_id = client.post("/api/tasks/", json={"title": "A", "status": "todo"}).json()["id"]
+    b_id = client.post("/api/tasks/", json={"title": "B", "status": "todo"}).json()["id"]
+    gone_id = client.post("/api/tasks/", json={"title": "Gone", "status": "todo"}).json()["id"]
+
+    response = client.post("/api/tasks/batch", json={"operations": [
+        {"op": "create", "data": {"title": "C", "status": "todo"}},
+        {"op": "update", "task_id": a_id, "data": {"title": "A2"}},
+        {"op": "move", "task_id": b_id, "data": {"status": "todo", "before_task_id": a_id}},
+        {"op": "assign", "task_id": a_id, "assignee_id": user_id},
+        {"op": "assign", "task_id": a_id, "assignee_id": "nobody"},
+        {"op": "delete", "task_id": gone_id},
+        {"op": "update", "task_id": gone_id, "data": {"title": "Late"}},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [r["status_code"] for r in results] == [201, 200, 200, 200, 404, 204, 404]
+    assert results[0]["task"]["title"] == "C"
+    assert results[3]["task"]["assignee"]["id"] == user_id
+    assert "nobody" in results[4]["detail"]
+    assert results[5]["task"] is None
+
+    assert _column_titles(client, "todo") == ["B", "A2", "C"]
+
+
+def test_batch_update_then_delete_same_task(client):
+    """Test earlier results for a task deleted later in the same batch carry no task"""
+    task_id = client.post("/api/tasks/", json={"title": "A", "status": "todo"}).json()["id"]
+
+    response = client.post("/api/tasks/batch", json={"operations": [
+        {"op": "update", "task_id": task_id, "data": {"title": "A2"}},
+        {"op": "move", "task_id": task_id, "data": {"status": "done"}},
+        {"op": "delete", "task_id": task_id},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [r["status_code"] for r in results] == [200, 200, 204]
+    assert [r["task"] for r in results] == [None, None, None]
+    assert client.get(f"/api/tasks/{task_id}").status_code == 404
+
+
+def test_batch_create_and_update_validate_assignee(client):
+    """Test create and update operations reject unknown assignees like assign does"""
+    from sqlalchemy import insert
+    from conftest import engine
+    from core.models import User, generate_uuid
+
+    user_id = generate_uuid()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "username": "user1"}])
+
+    task_id = client.post("/api/tasks/", json={"title": "A", "status": "todo"}).json()["id"]
+
+    response = client.post("/api/tasks/batch", json={"operations": [
+        {"op": "create", "data": {"title": "B", "assignee_id": "nobody"}},
+        {"op": "create", "data": {"title": "C", "assignee_id": user_id}},
+        {"op": "update", "task_id": task_id, "data": {"assignee_id": "ghost"}},
+        {"op": "update", "task_id": task_id, "data": {"assignee_id": user_id}},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [r["status_code"] for r in results] == [404, 201, 404, 200]
+    assert "nobody" in results[0]["detail"]
+    assert "ghost" in results[2]["detail"]
+    assert results[1]["task"]["assignee"]["id"] == user_id
+    assert results[3]["task"]["assignee"]["id"] == user_id
+    assert _column_titles(client, "backlog") == ["C"]
+
+
+def test_batch_reorder_uses_constant_statements(client):
+    """Test reordering a whole column does not issue queries per card"""
+    from sqlalchemy import event
+    from conftest import async_engine
+
+    ids = [
+        client.post("/api/tasks/", json={"title": f"Task {i}", "status": "todo"}).json()["id"]
+        for i in range(50)
+    ]
+
+    # Reverse the column by stacking cards, in their new order, on top of the first card
+    reversed_ids = ids[::-1]
+    operations = [
+        {"op": "move", "task_id": reversed_ids[0], "data": {"status": "todo", "before_task_id": ids[0]}}
+    ] + [
+        {"op": "move", "task_id": task_id, "data": {
+            "status": "todo", "after_task_id": previous_id, "before_task_id": ids[0]
+        }}
+        for previous_id, task_id in zip(reversed_ids, reversed_ids[1:-1])
+    ]
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = client.post("/api/tasks/batch", json={"operations": operations})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    assert all(r["status_code"] == 200 for r in response.json()["results"])
+    assert len(statements) <= 10
+
+    tasks = client.get("/api/tasks/", params={"status": "todo"}).json()
+    assert [task["id"] for task in tasks] == reversed_ids
+
+
+def test_status_changes_are_logged(client):
+    """Test creates, moves, status updates and batch writes append to the status history"""
+    from sqlalchemy import select
+    from conftest import engine
+    from core.models import TaskStatusEvent
+
+    task_id = client.post("/api/tasks/", json={"title": "Task", "status": "todo"}).json()["id"]
+    client.patch(f"/api/tasks/{task_id}/move", json={"status": "in_progress"})
+    client.patch(f"/api/tasks/{task_id}/move", json={"status": "in_progress", "position": 0})
+    client.patch(f"/api/tasks/{task_id}", json={"status": "in_review", "title": "Renamed"})
+    client.patch(f"/api/tasks/{task_id}", json={"title": "Renamed again"})
+    client.post("/api/tasks/batch", json={"operations": [
+        {"op": "move", "task_id": task_id, "data": {"status": "done"}},
+        {"op": "create", "data": {"title": "New", "status": "backlog"}},
+    ]})
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(TaskStatusEvent.task_id, TaskStatusEvent.from_status, TaskStatusEvent.to_status)
+            .order_by(TaskStatusEvent.id)
+        ).all()
+
+    history = {}
+    for row_task, from_status, to_status in rows:
+        history.setdefault(row_task, []).append((from_status, to_status))
+
+    assert history.pop(task_id) == [
+        (None, "todo"), ("todo", "in_progress"), ("in_progress", "in_review"), ("in_review", "done")
+    ]
+    assert list(history.values()) == [[(None, "backlog")]]
+
+
+def test_list_tasks_conditional_get(client):
+    """Test an unchanged list answers If-None-Match with 304 and any write changes the ETag"""
+    task_id = client.post("/api/tasks/", json={"title": "Task", "status": "todo"}).json()["id"]
+    client.post("/api/tasks/", json={"title": "Other", "status": "todo"})
+
+    response = client.get("/api/tasks/")
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"].endswith("GMT")
+
+    unchanged = client.get("/api/tasks/", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    # Each query gets its own ETag, projected pages included
+    projected = client.get("/api/tasks/", params={"fields": "id,title"})
+    assert projected.headers["ETag"] != etag
+    assert client.get(
+        "/api/tasks/", params={"fields": "id,title"}, headers={"If-None-Match": projected.headers["ETag"]}
+    ).status_code == 304
+
+    client.patch(f"/api/tasks/{task_id}", json={"title": "Renamed"})
+    updated = client.get("/api/tasks/", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.headers["ETag"] != etag
+
+    etag = updated.headers["ETag"]
+    client.delete(f"/api/tasks/{task_id}")
+    deleted = client.get("/api/tasks/", headers={"If-None-Match": etag})
+    assert deleted.status_code == 200
+    assert [task["title"] for task in deleted.json()] == ["Other"]
+
+
+def test_export_tasks_csv(client):
+    """Test tasks export as CSV with a header row, in board order, honouring filters"""
+    import csv
+
+    client.post("/api/tasks/", json={"title": "First", "status": "todo", "labels": ["bug", "ui"]})
+    client.post("/api/tasks/", json={"title": "Second, with comma", "status": "todo"})
+    client.post("/api/tasks/", json={"title": "Elsewhere", "status": "done"})
+
+    response = client.get("/api/tasks/export", params={"format": "csv", "status": "todo"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="tasks.csv"' in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(response.text.splitlines()))
+    assert [row["title"] for row in rows] == ["First", "Second, with comma"]
+    assert rows[0]["labels"] == "bug,ui"
+    assert rows[0]["status"] == "todo"
+
+    assert client.get("/api/tasks/export", params={"format": "xml"}).status_code == 422
+
+
+def test_import_tasks_ndjson(client):
+    """Test NDJSON import appends valid tasks in order and reports rejected lines"""
+    import json
+
+    client.post("/api/tasks/", json={"title": "Existing", "status": "todo"})
+    lines = [
+        json.dumps({"title": "Imported one", "status": "todo", "labels": ["legacy"]}),
+        json.dumps({"title": "Bad status", "status": "archived"}),
+        "",
+        "{not json",
+        json.dumps({"title": "Unknown assignee", "assignee_id": "nobody"}),
+        json.dumps({"title": "Imported two", "status": "todo"}),
+    ]
+    response = client.post(
+        "/api/tasks/import",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["rejected"]) == (2, 3)
+    assert [error["line"] for error in report["errors"]] == [2, 4, 5]
+    assert "status" in report["errors"][0]["detail"]
+    assert report["errors"][2]["detail"] == "User with ID nobody not found"
+    assert report["rows_per_second"] >= 0
+
+    titles = [task["title"] for task in client.get("/api/tasks/", params={"status": "todo"}).json()]
+    assert titles == ["Existing", "Imported one", "Imported two"]
+    # Imported tasks are searchable and have a status history like created ones
+    found = client.get("/api/tasks/", params={"search": "imported two"}).json()
+    assert [task["title"] for task in found] == ["Imported two"]
+    assert client.get("/api/analytics/summary").json()["total_tasks"] == 3
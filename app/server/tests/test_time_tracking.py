@@ -0,0 +1,337 @@
+"""
+Tests for time tracking router
+"""
+
+
+def _log(client, start_time, duration, task_id=None):
+    response = client.post(
+        "/api/time/entries",
+        json={"start_time": start_time, "duration": duration, "task_id": task_id}
+    )
+    assert response.status_code == 201
+
+
+def test_time_summary_groups_by_task_and_day(client):
+    """Test the summary totals time per task and per day without returning entries"""
+    task_id = client.post("/api/tasks/", json={"title": "Task"}).json()["id"]
+    _log(client, "2024-03-04T09:00:00", 600, task_id)
+    _log(client, "2024-03-04T23:30:00", 300)
+    _log(client, "2024-03-06T10:00:00", 900, task_id)
+    _log(client, "2024-04-01T10:00:00", 1000, task_id)  # Outside the range
+
+    response = client.get(
+        "/api/time/summary",
+        params={"start_date": "2024-03-01T00:00:00", "end_date": "2024-03-31T00:00:00"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["total_duration"] == 1800
+    assert data["entries"] is None
+    assert data["granularity"] == "day"
+    assert data["by_task"] == {task_id: 1500, "no_task": 300}
+    assert data["by_date"] == {"2024-03-04": 900, "2024-03-06": 900}
+
+
+def test_time_summary_week_and_month_granularity(client):
+    """Test weeks start on Monday and months on the first"""
+    _log(client, "2024-03-03T12:00:00", 100)  # Sunday
+    _log(client, "2024-03-04T12:00:00", 200)  # Monday
+    _log(client, "2024-03-10T12:00:00", 400)  # Sunday
+    _log(client, "2024-04-02T12:00:00", 800)
+
+    window = {"start_date": "2024-02-01T00:00:00", "end_date": "2024-05-01T00:00:00"}
+
+    weekly = client.get("/api/time/summary", params={**window, "granularity": "week"}).json()
+    assert weekly["by_date"] == {"2024-02-26": 100, "2024-03-04": 600, "2024-04-01": 800}
+
+    monthly = client.get("/api/time/summary", params={**window, "granularity": "month"}).json()
+    assert monthly["by_date"] == {"2024-03-01": 700, "2024-04-01": 800}
+
+    response = client.get("/api/time/summary", params={**window, "granularity": "year"})
+    assert response.status_code == 422
+
+
+def test_time_summary_includes_entries_on_request(client):
+    """Test entries are only embedded when asked for"""
+    _log(client, "2024-03-04T09:00:00", 600)
+    _log(client, "2024-03-05T09:00:00", 300)
+
+    response = client.get("/api/time/summary", params={
+        "start_date": "2024-03-01T00:00:00",
+        "end_date": "2024-03-31T00:00:00",
+        "include_entries": "true",
+    })
+    assert response.status_code == 200
+    assert [entry["duration"] for entry in response.json()["entries"]] == [300, 600]
+
+
+def test_time_rollups_follow_entry_writes(client):
+    """Test manual entries and stopped timers land in the rollups exactly as a rebuild computes them"""
+    from sqlalchemy import select
+    from conftest import engine
+    from core.models import TimeRollup
+    from core.rollups import NO_TASK, rebuild_time_rollups
+
+    task_id = client.post("/api/tasks/", json={"title": "Task"}).json()["id"]
+    _log(client, "2024-03-04T09:00:00", 600, task_id)
+    _log(client, "2024-03-04T11:00:00", 300, task_id)
+    _log(client, "2024-03-04T13:00:00", 120)
+
+    # Starting a second timer stops the first, then the second is stopped
+    client.post("/api/time/start", json={"task_id": task_id})
+    client.post("/api/time/start", json={})
+    assert client.post("/api/time/stop").status_code == 200
+
+    def rollups():
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(TimeRollup.day, TimeRollup.task_id, TimeRollup.duration, TimeRollup.entries)
+            )
+            return sorted((str(day), task, duration, entries) for day, task, duration, entries in rows)
+
+    incremental = rollups()
+    assert ("2024-03-04", task_id, 900, 2) in incremental
+    assert ("2024-03-04", NO_TASK, 120, 1) in incremental
+    assert sum(entries for *_, entries in incremental) == 5
+
+    with engine.begin() as conn:
+        assert rebuild_time_rollups(conn) == len(incremental)
+    assert rollups() == incremental
+
+
+def test_time_entries_conditional_get(client):
+    """Test the entry list answers 304 until a timer stops or the embedded task changes"""
+    task_id = client.post("/api/tasks/", json={"title": "Task"}).json()["id"]
+    client.post("/api/time/start", json={"task_id": task_id})
+
+    etag = client.get("/api/time/entries").headers["ETag"]
+    assert client.get("/api/time/entries", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/time/stop")
+    stopped = client.get("/api/time/entries", headers={"If-None-Match": etag})
+    assert stopped.status_code == 200
+    assert stopped.json()[0]["is_running"] is False
+
+    etag = stopped.headers["ETag"]
+    client.patch(f"/api/tasks/{task_id}", json={"title": "Renamed"})
+    renamed = client.get("/api/time/entries", headers={"If-None-Match": etag})
+    assert renamed.status_code == 200
+    assert renamed.json()[0]["task"]["title"] == "Renamed"
+
+
+def test_export_time_entries_ndjson(client):
+    """Test time entries export as one JSON object per line, oldest first, within the range"""
+    import json
+
+    task_id = client.post("/api/tasks/", json={"title": "Payroll"}).json()["id"]
+    _log(client, "2024-03-05T09:00:00", 600, task_id)
+    _log(client, "2024-03-04T09:00:00", 300)
+    _log(client, "2024-04-01T09:00:00", 900, task_id)
+
+    response = client.get(
+        "/api/time/export",
+        params={"start_date": "2024-03-01T00:00:00", "end_date": "2024-03-31T00:00:00"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["start_time"], row["duration"], row["task_title"]) for row in rows] == [
+        ("2024-03-04T09:00:00", 300, None),
+        ("2024-03-05T09:00:00", 600, "Payroll"),
+    ]
+
+
+def test_export_time_entries_streams_in_constant_memory(client):
+    """Test exporting many rows allocates about as much as exporting a few, well under the list's cost"""
+    import asyncio
+    import tracemalloc
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+    from conftest import engine
+    from core.ids import PLACEHOLDER_USER_ID
+    from core.models import TimeEntry
+
+    def seed(count, offset):
+        start = datetime(2024, 1, 1)
+        with engine.begin() as conn:
+            conn.execute(insert(TimeEntry), [
+                {
+                    "user_id": PLACEHOLDER_USER_ID,
+                    "start_time": start + timedelta(minutes=offset + i),
+                    "duration": 60,
+                    "is_running": False,
+                }
+                for i in range(count)
+            ])
+
+    async def export_peak():
+        """Run the export through the ASGI app, counting lines as they arrive without keeping them"""
+        from server import app
+
+        lines = 0
+        requested, done = False, asyncio.Event()
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal lines
+            if message["type"] == "http.response.body":
+                lines += message.get("body", b"").count(b"\n")
+                if not message.get("more_body", False):
+                    done.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/api/time/export", "raw_path": b"/api/time/export",
+            "query_string": b"format=csv", "root_path": "", "headers": [],
+            "server": ("test", 80), "client": ("test", 1234),
+        }
+        tracemalloc.start()
+        await app(scope, receive, send)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return lines, peak
+
+    seed(2_000, 0)
+    small_lines, small_peak = asyncio.run(export_peak())
+    seed(18_000, 2_000)
+    large_lines, large_peak = asyncio.run(export_peak())
+
+    assert (small_lines, large_lines) == (2_001, 20_001)  # Header plus one line per entry
+    # Ten times the rows may not cost much more than one batch's worth
+    assert large_peak < small_peak + 2 * 1024 * 1024
+    assert large_peak < 8 * 1024 * 1024
+
+
+def test_import_time_entries_ndjson(client, monkeypatch):
+    """Test NDJSON import inserts entries in chunks and keeps the daily rollups in step"""
+    import json
+
+    from core import bulk
+
+    task_id = client.post("/api/tasks/", json={"title": "Migrated"}).json()["id"]
+    lines = [
+        json.dumps({"start_time": f"2024-03-04T{hour:02d}:00:00", "duration": 60, "task_id": task_id})
+        for hour in range(5)
+    ] + [
+        json.dumps({"start_time": "2024-03-05T09:00:00", "end_time": "2024-03-05T09:30:00"}),
+        json.dumps({"duration": 60}),
+    ]
+
+    monkeypatch.setattr(bulk, "IMPORT_CHUNK_SIZE", 2)
+    response = client.post("/api/time/import", content="\n".join(lines) + "\n")
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["rejected"]) == (6, 1)
+    assert report["errors"][0]["line"] == 7
+    assert "start_time" in report["errors"][0]["detail"]
+
+    summary = client.get(
+        "/api/time/summary",
+        params={"start_date": "2024-03-01T00:00:00", "end_date": "2024-03-31T00:00:00"}
+    ).json()
+    assert summary["total_duration"] == 5 * 60 + 1800
+    assert len(client.get("/api/time/entries").json()) == 6
+
+
+def test_concurrent_timer_starts_and_stops_leave_one_running_timer(client):
+    """Test racing starts and stops never leave two running timers, and every stop is accounted for once"""
+    import asyncio
+    from datetime import datetime
+    import httpx
+    import pytest
+    from sqlalchemy import insert, select
+    from sqlalchemy.exc import IntegrityError
+    from conftest import engine
+    from core.ids import PLACEHOLDER_USER_ID
+    from core.models import TimeEntry, TimeRollup
+    from core.rollups import rebuild_time_rollups
+
+    async def race():
+        from server import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as racer:
+            requests = [
+                racer.post("/api/time/start", json={}) if i % 3 else racer.post("/api/time/stop")
+                for i in range(30)
+            ]
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(race())
+    assert all(response.status_code in (200, 201, 404) for response in responses)
+    assert any(response.status_code == 201 for response in responses)
+
+    with engine.connect() as conn:
+        entries = conn.execute(select(TimeEntry.is_running, TimeEntry.duration, TimeEntry.end_time)).all()
+        rollups = conn.execute(select(TimeRollup.day, TimeRollup.duration, TimeRollup.entries)).all()
+    assert sum(entry.is_running for entry in entries) <= 1
+    assert len(client.get("/api/time/running").json()) == sum(entry.is_running for entry in entries)
+    assert all(entry.duration is not None and entry.end_time for entry in entries if not entry.is_running)
+
+    # Each stopped timer was rolled up exactly once
+    with engine.begin() as conn:
+        rebuild_time_rollups(conn)
+        rebuilt = conn.execute(select(TimeRollup.day, TimeRollup.duration, TimeRollup.entries)).all()
+    assert sorted(rebuilt) == sorted(rollups)
+
+    client.post("/api/time/start", json={})
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(insert(TimeEntry).values(
+            user_id=PLACEHOLDER_USER_ID, start_time=datetime.utcnow(), is_running=True
+        ))
+
+
+def test_running_timers_follow_start_and_stop(client):
+    """Test /running lists the timer the last start left running, and nothing once it is stopped"""
+    from core.ids import PLACEHOLDER_USER_ID, generate_uuid
+
+    task_id = client.post("/api/tasks/", json={"title": "Task"}).json()["id"]
+    first = client.post("/api/time/start", json={"task_id": task_id}).json()
+    [running] = client.get("/api/time/running").json()
+    assert (running["id"], running["task_id"], running["user_id"]) == (first["id"], task_id, PLACEHOLDER_USER_ID)
+    assert running["elapsed"] >= 0
+
+    second = client.post("/api/time/start", json={}).json()
+    assert [timer["id"] for timer in client.get("/api/time/running").json()] == [second["id"]]
+    assert client.get("/api/time/running", params={"user_id": PLACEHOLDER_USER_ID}).json()[0]["task_id"] is None
+    assert client.get("/api/time/running", params={"user_id": generate_uuid()}).json() == []
+
+    client.post("/api/time/stop")
+    assert client.get("/api/time/running").json() == []
+
+
+def test_timer_registry_loads_from_database_and_ignores_stale_stops(client):
+    """Test the registry is rebuilt from running entries, and a stop racing a newer start keeps the new timer"""
+    import asyncio
+    from datetime import datetime
+    from conftest import async_engine
+    from core.ids import generate_uuid
+    from core.timers import MemoryTimerRegistry, RunningTimer, running_timers
+
+    entry = client.post("/api/time/start", json={}).json()
+
+    async def scenario():
+        registry = MemoryTimerRegistry()
+        async with async_engine.connect() as conn:
+            await registry.load(await running_timers(conn))
+        [timer] = await registry.all()
+        assert (timer.id, timer.user_id) == (entry["id"], entry["user_id"])
+
+        newer = RunningTimer(generate_uuid(), timer.user_id, None, datetime.utcnow())
+        await registry.started(newer)
+        await registry.stopped(timer.user_id, timer.id)
+        assert await registry.get(timer.user_id) == newer
+        await registry.stopped(timer.user_id, newer.id)
+        assert await registry.all() == []
+
+    asyncio.run(scenario())
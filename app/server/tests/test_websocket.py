@@ -0,0 +1,349 @@
+"""
+Tests for WebSocket fan-out
+"""
+
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from core.pubsub import InMemoryBroker, InMemoryHub
+from core.websocket import MAX_TOPICS_PER_CONNECTION, ConnectionManager
+
+
+class FakeWebSocket:
+    """Records sent frames; `gate` lets a test stall a client"""
+
+    def __init__(self, gate: asyncio.Event = None, fail: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self.gate = gate
+        self.fail = fail
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_websocket_ping_and_broadcast(client):
+    """Test pings are answered and events are broadcast back to clients"""
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json() == {"type": "pong"}
+
+        websocket.send_json({"type": "task:update", "task": {"id": "task-1", "title": "Renamed"}})
+        assert websocket.receive_json() == {
+            "type": "task:updated", "task": {"id": "task-1", "title": "Renamed"}
+        }
+
+
+def test_websocket_topics_from_query_and_messages(client):
+    """Test clients pick topics on connect and change them with subscribe/unsubscribe"""
+    with client.websocket_connect("/ws?topics=user:user-1") as websocket:
+        websocket.send_json({"type": "subscribe", "topics": ["task:task-1", "sprint:s1"]})
+        assert websocket.receive_json() == {
+            "type": "subscribed", "topics": ["sprint:s1", "task:task-1", "user:user-1"]
+        }
+
+        websocket.send_json({"type": "unsubscribe", "topics": ["sprint:s1", "task:unknown"]})
+        assert websocket.receive_json() == {
+            "type": "subscribed", "topics": ["task:task-1", "user:user-1"]
+        }
+
+        websocket.send_json({"type": "subscribe", "topics": ["everything"]})
+        response = websocket.receive_json()
+        assert response["type"] == "error"
+        assert "everything" in response["detail"]
+
+
+def test_websocket_rejects_invalid_initial_topics(client):
+    """Test a malformed topic in the query string closes the connection"""
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/ws?topics=board,nonsense") as websocket:
+            websocket.receive_json()
+
+    assert exc_info.value.code == 1008
+
+
+def test_websocket_events_reach_topic_subscribers(client):
+    """Test timer events reach the user's subscribers and task updates reach board viewers"""
+    from core.ids import PLACEHOLDER_USER_ID
+
+    with client.websocket_connect(f"/ws?topics=user:{PLACEHOLDER_USER_ID}") as watcher, \
+            client.websocket_connect("/ws") as board:
+        entry_id = client.post("/api/time/start", json={}).json()["id"]
+        assert board.receive_json()["entry_id"] == entry_id
+        assert watcher.receive_json()["entry_id"] == entry_id
+
+        board.send_json({"type": "task:update", "task": {"id": "task-1", "title": "Renamed"}})
+        assert board.receive_json()["type"] == "task:updated"
+
+        # The watcher is not on the board, so the next thing it sees is its pong
+        watcher.send_json({"type": "ping"})
+        assert watcher.receive_json() == {"type": "pong"}
+
+
+def test_websocket_timer_events_come_from_the_server(client):
+    """Test timer events are sent when the API starts and stops timers, and clients cannot forge them"""
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_json({"type": "timer:running"})
+        assert websocket.receive_json() == {"type": "timer:running", "timers": []}
+
+        entry = client.post("/api/time/start", json={}).json()
+        started = websocket.receive_json()
+        assert (started["type"], started["entry_id"], started["user_id"]) == ("timer:started", entry["id"], entry["user_id"])
+
+        websocket.send_json({"type": "timer:running"})
+        [timer] = websocket.receive_json()["timers"]
+        assert (timer["entry_id"], timer["task_id"]) == (entry["id"], None)
+
+        stopped = client.post("/api/time/stop").json()
+        assert websocket.receive_json() == {
+            "type": "timer:stopped", "entry_id": entry["id"], "user_id": entry["user_id"],
+            "task_id": None, "duration": stopped["duration"]
+        }
+
+        websocket.send_json({"type": "timer:stop", "user_id": entry["user_id"], "duration": 99999})
+        assert websocket.receive_json()["type"] == "error"
+
+
+def test_publish_routes_to_subscribers_only_once():
+    """Test publish reaches each subscriber of any listed topic once and nobody else"""
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=8, send_timeout=5)
+        board = FakeWebSocket()
+        watcher = FakeWebSocket()
+        other = FakeWebSocket()
+        manager.register(board)
+        manager.register(watcher, ["user:u1", "task:t1"])
+        manager.register(other, ["user:u2"])
+
+        await manager.publish(["user:u1", "task:t1"], {"type": "timer:started"})
+        await manager.publish(["board"], {"type": "task:updated"})
+        await asyncio.sleep(0.01)
+
+        assert [message["type"] for message in watcher.sent] == ["timer:started"]
+        assert [message["type"] for message in board.sent] == ["task:updated"]
+        assert other.sent == []
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_timer_ticks_are_one_frame_per_client_for_its_subscribed_timers():
+    """Test each tick sends a client one frame with the elapsed time of every timer it follows"""
+    from datetime import datetime, timedelta
+    from core.ticker import TimerTicker
+    from core.timers import MemoryTimerRegistry, RunningTimer
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=8, send_timeout=5)
+        boards = [FakeWebSocket() for _ in range(3)]
+        watcher = FakeWebSocket()
+        task_watcher = FakeWebSocket()
+        other = FakeWebSocket()
+        for board in boards:
+            manager.register(board)
+        manager.register(watcher, ["user:u1"])
+        manager.register(task_watcher, ["task:t2", "user:u1"])
+        manager.register(other, ["user:u9"])
+
+        now = datetime(2024, 3, 4, 12)
+        registry = MemoryTimerRegistry()
+        await registry.load([
+            RunningTimer("e1", "u1", None, now - timedelta(seconds=90)),
+            RunningTimer("e2", "u2", "t2", now - timedelta(seconds=30)),
+        ])
+        ticker = TimerTicker(manager, registry, interval=1)
+        before = manager.stats.messages
+        await ticker.tick(now)
+        await asyncio.sleep(0.01)
+
+        def ticked(websocket):
+            return [[(timer["entry_id"], timer["elapsed"]) for timer in frame["timers"]] for frame in websocket.sent]
+
+        assert all(ticked(board) == [[("e2", 30), ("e1", 90)]] for board in boards)
+        assert ticked(watcher) == [[("e1", 90)]]
+        assert ticked(task_watcher) == [[("e2", 30), ("e1", 90)]]
+        assert other.sent == []
+        assert boards[0].sent[0]["server_time"] == now.isoformat()
+        # The three board clients share a frame
+        assert manager.stats.messages - before == 3
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_subscription_index_is_cleaned_up():
+    """Test unsubscribing and disconnecting drop empty topics from the index"""
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=8, send_timeout=5)
+        first = FakeWebSocket()
+        second = FakeWebSocket()
+        manager.register(first, ["board", "task:t1"])
+        manager.register(second, ["board"])
+
+        assert manager.unsubscribe(first, ["task:t1", "task:never"]) == {"board"}
+        assert set(manager.subscribers) == {"board"}
+
+        manager.disconnect(first)
+        assert len(manager.subscribers["board"]) == 1
+        manager.disconnect(second)
+        assert manager.subscribers == {}
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_subscribe_validates_topics():
+    """Test malformed topics and too many topics are refused without partial subscription"""
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=8, send_timeout=5)
+        websocket = FakeWebSocket()
+        manager.register(websocket)
+
+        with pytest.raises(ValueError):
+            manager.subscribe(websocket, ["task:t1", "task:has spaces"])
+
+        with pytest.raises(ValueError):
+            manager.subscribe(websocket, [f"task:{i}" for i in range(MAX_TOPICS_PER_CONNECTION)])
+
+        assert manager.subscribe(websocket, []) == {"board"}
+        assert set(manager.subscribers) == {"board"}
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_is_evicted_without_delaying_others():
+    """Test a stalled client overflows its queue and is dropped while others keep receiving"""
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=2, send_timeout=5)
+        fast = FakeWebSocket()
+        slow = FakeWebSocket(gate=asyncio.Event())
+        manager.register(fast)
+        manager.register(slow)
+
+        # The slow client holds one message in flight and two queued; the fourth overflows
+        for i in range(4):
+            await manager.broadcast({"type": "task:updated", "n": i})
+            await asyncio.sleep(0.01)
+
+        assert [message["n"] for message in fast.sent] == [0, 1, 2, 3]
+        assert manager.active_connections == [fast]
+        assert slow.closed_with == 1013
+
+        stats = manager.stats.snapshot()
+        assert stats["evictions"] == 1
+        assert stats["deliveries"] == 4
+        assert stats["latency_ms"]["p50"] is not None
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_failed_send_evicts_client():
+    """Test a socket whose send raises is removed instead of failing every broadcast"""
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=8, send_timeout=5)
+        broken = FakeWebSocket(fail=True)
+        healthy = FakeWebSocket()
+        manager.register(broken)
+        manager.register(healthy)
+
+        await manager.broadcast({"type": "timer:stopped"})
+        await asyncio.sleep(0.01)
+        await manager.broadcast({"type": "timer:started"})
+        await asyncio.sleep(0.01)
+
+        assert manager.active_connections == [healthy]
+        assert [message["type"] for message in healthy.sent] == ["timer:stopped", "timer:started"]
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_stalled_send_times_out():
+    """Test a client stuck in one send is evicted once the send timeout passes"""
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=8, send_timeout=0.05)
+        stalled = FakeWebSocket(gate=asyncio.Event())
+        manager.register(stalled)
+
+        await manager.broadcast({"type": "task:updated"})
+        await asyncio.sleep(0.2)
+
+        assert manager.active_connections == []
+        assert stalled.closed_with == 1013
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_events_reach_clients_on_other_processes():
+    """Test publish and broadcast reach clients of every manager sharing a broker hub, once each"""
+
+    async def scenario():
+        hub = InMemoryHub()
+        workers = [
+            ConnectionManager(queue_size=8, send_timeout=5, broker=InMemoryBroker(hub))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            await worker.start()
+
+        local = FakeWebSocket()
+        remote = FakeWebSocket()
+        bystander = FakeWebSocket()
+        workers[0].register(local, ["user:u1"])
+        workers[1].register(remote, ["user:u1"])
+        workers[1].register(bystander, ["user:u2"])
+
+        await workers[0].publish(["user:u1"], {"type": "timer:started"})
+        await workers[1].broadcast({"type": "task:updated"})
+        await asyncio.sleep(0.01)
+
+        assert [message["type"] for message in local.sent] == ["timer:started", "task:updated"]
+        assert [message["type"] for message in remote.sent] == ["timer:started", "task:updated"]
+        assert [message["type"] for message in bystander.sent] == ["task:updated"]
+
+        for worker in workers:
+            await worker.shutdown()
+        assert hub.brokers == set()
+
+    asyncio.run(scenario())
+
+
+def test_broker_failure_still_delivers_locally():
+    """Test a broker that cannot publish does not stop delivery to local clients"""
+
+    class BrokenBroker(InMemoryBroker):
+        async def publish(self, topics, text):
+            raise ConnectionError("broker unavailable")
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=8, send_timeout=5, broker=BrokenBroker())
+        await manager.start()
+        websocket = FakeWebSocket()
+        manager.register(websocket)
+
+        await manager.publish(["board"], {"type": "task:updated"})
+        await asyncio.sleep(0.01)
+
+        assert [message["type"] for message in websocket.sent] == ["task:updated"]
+        await manager.shutdown()
+
+    asyncio.run(scenario())